@@ -14,79 +14,137 @@ License: MIT (for research use)
 
 Dependencies:
     numpy >= 1.21.0
-    matplotlib >= 3.4.0
-    scipy >= 1.7.0
+    matplotlib >= 3.4.0 (plotting modes only, imported on first use)
 
 Usage:
     python pwt_visualization.py --mode wave --k 3
     python pwt_visualization.py --mode spectrum --k 5
     python pwt_visualization.py --mode verify --k 7
+    python pwt_visualization.py --mode batch --k-values 3-8 --formats pdf,png
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import factorial
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
 import argparse
+import json
+import os
+import sys
+import time
+
+from pwt_arith import (DEFAULT_TABLE_BOUND, arithmetic_tables,
+                       mobius_squarefree, phi_squarefree)
+from pwt_besov import (DEFAULT_H_VALUES, besov_seminorms, default_n_samples,
+                       modulus_of_continuity)
+from pwt_coprime import count_coprime, P_k_integers
+from pwt_export import (export_spectrum, export_wave, open_writer,
+                        spectrum_chunks, wave_chunks, write_records,
+                        write_tables)
+from pwt_prime_index import nth_prime as _nth_prime, prime_pi as _prime_pi
+from pwt_primes import PRIME_CACHE, sieve_primes
+from pwt_profile import PROFILER, profiled
+from pwt_render import (draw_stems, integer_markers, spectrum_envelope,
+                        wave_trace)
+from pwt_spectrum import SpectrumView, spectrum
+from pwt_verify import (DEFAULT_STORE, VerificationStore, ratio_bound,
+                        run_verification, verify_noninteger)
+from pwt_wave import psi_p, P_k_values, stream_P_k, parallel_P_k
 
 
 # ============================================================================
 # SECTION D.1: Core Functions
 # ============================================================================
 
-def sieve_of_eratosthenes(limit: int) -> List[int]:
+def sieve_of_eratosthenes(limit: int) -> np.ndarray:
     """
     Generate primes up to limit using Sieve of Eratosthenes.
 
+    Delegates to the segmented, odd-only NumPy sieve in pwt_primes, so
+    memory stays bounded by one segment while the sieve runs.
+
     Args:
         limit: Upper bound for prime search
 
     Returns:
-        List of primes <= limit
+        Array (uint32, or uint64 beyond 2^32) of primes <= limit
     """
-    is_prime = [True] * (limit + 1)
-    is_prime[0] = is_prime[1] = False
-
-    for i in range(2, int(limit ** 0.5) + 1):
-        if is_prime[i]:
-            for j in range(i * i, limit + 1, i):
-                is_prime[j] = False
+    return sieve_primes(limit)
 
-    return [i for i in range(limit + 1) if is_prime[i]]
 
-
-def get_first_k_primes(k: int) -> List[int]:
+def get_first_k_primes(k: int) -> np.ndarray:
     """
     Get the first k prime numbers.
 
+    Served from the process-wide prime cache, which grows only when a
+    larger k than ever before is requested, decoding from the prime index
+    file when one exists and sieving otherwise.
+
     Args:
         k: Number of primes to return
 
     Returns:
-        List of first k primes [2, 3, 5, 7, ...]
+        Read-only array of first k primes [2, 3, 5, 7, ...]
     """
-    # Upper bound estimate: k * (log(k) + log(log(k))) for k >= 6
-    if k < 6:
-        limit = 15
-    else:
-        limit = int(k * (np.log(k) + np.log(np.log(k))) * 1.3)
+    return PRIME_CACHE.primes(k)
+
+
+def nth_prime(n: int) -> int:
+    """
+    The n-th prime, with nth_prime(1) = 2.
 
-    primes = sieve_of_eratosthenes(limit)
-    return primes[:k]
+    Read from the memory-mapped prime index (pwt_prime_index) when one has
+    been built and covers n; otherwise π(x) is counted in sublinear time and
+    only a short window below p_n is sieved (pwt_primecount).
+
+    Args:
+        n: Index of the prime (1-based)
+
+    Returns:
+        p_n
+    """
+    return _nth_prime(n)
+
+
+def prime_pi(x: int) -> int:
+    """
+    Prime-counting function π(x), from the prime index when it covers x and
+    by the Lucy_Hedgehog recursion in O(x^{3/4}) time otherwise.
+
+    Args:
+        x: Upper bound
+
+    Returns:
+        Number of primes <= x
+    """
+    return _prime_pi(x)
 
 
 def primorial(k: int) -> int:
     """
     Compute N_k = product of first k primes.
 
+    Exact for any k: the product is taken over Python ints with a balanced
+    product tree, and prefix products are memoized so N_{k+1} reuses N_k.
+
     Args:
         k: Number of primes
 
     Returns:
-        Product of first k primes
+        Product of first k primes (arbitrary-precision int)
     """
-    primes = get_first_k_primes(k)
-    return int(np.prod(primes))
+    return PRIME_CACHE.primorial(k)
+
+
+def phi_primorial(k: int) -> int:
+    """
+    Compute φ(N_k) = ∏(p - 1), memoized alongside N_k in the prime cache.
+
+    Args:
+        k: Number of primes
+
+    Returns:
+        Number of integers in [1, N_k] coprime to N_k
+    """
+    return PRIME_CACHE.phi_primorial(k)
 
 
 # ============================================================================
@@ -114,6 +172,9 @@ def Psi_p_vectorized(x: np.ndarray, p: int) -> np.ndarray:
     """
     Vectorized version of Psi_p for array input.
 
+    Uses the closed form of the Dirichlet kernel (see pwt_wave), so the
+    cost is O(1) per point instead of p cosines.
+
     Args:
         x: Array of real numbers
         p: Prime number
@@ -121,15 +182,7 @@ def Psi_p_vectorized(x: np.ndarray, p: int) -> np.ndarray:
     Returns:
         Array of Ψ_p(x) values
     """
-    # Create j array [0, 1, ..., p-1]
-    j = np.arange(p).reshape(-1, 1)  # Shape (p, 1)
-    x_reshaped = x.reshape(1, -1)  # Shape (1, len(x))
-
-    # Broadcast: (p, len(x)) array of cos(2πjx/p)
-    cos_terms = np.cos(2 * np.pi * j * x_reshaped / p)
-    cos_sum = np.sum(cos_terms, axis=0)  # Sum over j
-
-    return 1 - cos_sum / p
+    return psi_p(x, p)
 
 
 def P_k(x: float, k: int) -> float:
@@ -156,6 +209,9 @@ def P_k_vectorized(x: np.ndarray, k: int) -> np.ndarray:
     """
     Vectorized version of P_k for array input.
 
+    Each Ψ_p is evaluated in closed form and the product over primes is
+    accumulated in log domain.
+
     Args:
         x: Array of real numbers
         k: Number of primes
@@ -164,10 +220,49 @@ def P_k_vectorized(x: np.ndarray, k: int) -> np.ndarray:
         Array of P_k(x) values
     """
     primes = get_first_k_primes(k)
-    result = np.ones_like(x)
-    for p in primes:
-        result *= Psi_p_vectorized(x, p)
-    return result
+    return P_k_values(x, primes)
+
+
+def P_k_stream(k: int, x_source, out=None, dtype=np.float64,
+               chunk_size: int = 1 << 20):
+    """
+    Streaming version of P_k_vectorized with a fixed memory ceiling.
+
+    Args:
+        k: Number of primes
+        x_source: (start, stop, num) for a linspace grid, or an iterable
+            of x blocks
+        out: Caller-supplied output buffer (or list of buffers) reused for
+            every chunk
+        dtype: np.float64 or np.float32 output when out is None
+        chunk_size: Points per chunk for (start, stop, num) sources
+
+    Yields:
+        (offset, values) pairs; values is overwritten on later iterations
+    """
+    primes = get_first_k_primes(k)
+    return stream_P_k(x_source, primes, out=out, dtype=dtype,
+                      chunk_size=chunk_size)
+
+
+def P_k_parallel(x, k: int, workers: int = None, chunk_size: int = 1 << 20,
+                 dtype=np.float64) -> Tuple[np.ndarray, dict]:
+    """
+    Multi-core version of P_k_vectorized over shared-memory arrays.
+
+    Args:
+        x: Array of real numbers, or (start, stop, num) for a linspace grid
+        k: Number of primes
+        workers: Number of processes (default: all cores)
+        chunk_size: Points per task handed to a worker
+        dtype: np.float64 or np.float32 output
+
+    Returns:
+        Tuple (values, stats) with timing and scaling efficiency
+    """
+    primes = get_first_k_primes(k)
+    return parallel_P_k(x, primes, workers=workers, chunk_size=chunk_size,
+                        dtype=dtype)
 
 
 # ============================================================================
@@ -178,12 +273,18 @@ def euler_phi(n: int) -> int:
     """
     Euler's totient function φ(n).
 
+    Looked up in the shared arithmetic tables (pwt_arith) when n is within
+    their bound; larger n fall back to trial division.
+
     Args:
         n: Positive integer
 
     Returns:
         Number of integers in [1, n] coprime to n
     """
+    if 1 <= n <= DEFAULT_TABLE_BOUND:
+        return int(arithmetic_tables().phi(n))
+
     result = n
     p = 2
     while p * p <= n:
@@ -206,8 +307,8 @@ def mobius(n: int) -> int:
         -1 if n is squarefree with odd number of prime factors
         0 if n is not squarefree
     """
-    if n == 1:
-        return 1
+    if 1 <= n <= DEFAULT_TABLE_BOUND:
+        return int(arithmetic_tables().mobius(n))
 
     # Factor n
     factors = []
@@ -233,6 +334,7 @@ def gcd(a: int, b: int) -> int:
     """
     Greatest common divisor using Euclidean algorithm.
     """
+    PROFILER.count('gcd_calls')
     while b:
         a, b = b, a % b
     return a
@@ -252,19 +354,27 @@ def compute_fourier_coefficient(m: int, k: int) -> float:
         Fourier coefficient c_m^{(k)}
     """
     N_k = primorial(k)
-    d = gcd(m, N_k)
-    q = N_k // d
+    PROFILER.count('fourier_coefficients')
 
-    phi_q = euler_phi(q)
-    mu_q = mobius(q)
+    # q = N_k / gcd(m, N_k) is the product of the primes not dividing m,
+    # so φ(q) and μ(q) follow from the prime list without factoring q
+    m = int(m)
+    q_primes = [p for p in get_first_k_primes(k).tolist() if m % p]
+    phi_q = phi_squarefree(q_primes)
+    mu_q = mobius_squarefree(q_primes)
 
     return phi_q * mu_q / N_k
 
 
+@profiled('compute_all_fourier_coeffs')
 def compute_all_fourier_coeffs(k: int) -> Tuple[np.ndarray, np.ndarray]:
     """
     Compute all Fourier coefficients for P_k.
 
+    c_m depends only on which of the k primes divide m, so the at most 2^k
+    distinct values are tabulated once and modes are assigned to their
+    divisor class by residue marking (see pwt_spectrum).
+
     Args:
         k: Number of primes
 
@@ -272,77 +382,154 @@ def compute_all_fourier_coeffs(k: int) -> Tuple[np.ndarray, np.ndarray]:
         Tuple (modes, coefficients) where modes = [0, 1, ..., N_k-1]
     """
     N_k = primorial(k)
-    modes = np.arange(N_k)
-    coeffs = np.array([compute_fourier_coefficient(m, k) for m in modes])
-    return modes, coeffs
+    return spectrum(get_first_k_primes(k), 0, N_k)
+
+
+def fourier_spectrum_view(k: int) -> SpectrumView:
+    """
+    Lazy, compressed spectrum of P_k for any k.
+
+    Stores only the 2^k divisor-class table (exact numerators φ·μ over
+    N_k), so memory is independent of N_k. Supports view[m], slicing,
+    block iteration and per-class count / L1 / L2 aggregates.
+
+    Args:
+        k: Number of primes
+
+    Returns:
+        SpectrumView over modes [0, N_k)
+    """
+    return PRIME_CACHE.memo(
+        'spectrum_view', k, lambda: SpectrumView(get_first_k_primes(k)))
 
 
 # ============================================================================
 # SECTION D.4: Verification Functions
 # ============================================================================
 
-def verify_zero_set(k: int, n_test: int = 100) -> dict:
+@profiled('verify_zero_set')
+def verify_zero_set(k: int, n_test: int = 100, cross_check: int = 100000,
+                    dense_offsets: int = 0, dense_stop: int = None) -> dict:
     """
     Numerical verification of Theorem 4.7 (No Anomalous Zeros).
 
     Tests that P_k(x) = 0 iff x ∈ Z and gcd(x, N_k) > 1.
 
+    On integers P_k is the exact coprimality indicator, produced block by
+    block from a wheel-marked bitmap (pwt_coprime) and checked against
+    φ(N_k). The floating-point P_k is compared with it on up to
+    `cross_check` evenly spaced integers. Non-integer test points are
+    built as whole arrays and reduced to statistics (pwt_verify).
+
     Args:
         k: Number of primes
         n_test: Number of test points between integers
+        cross_check: Integers on which the float path is cross-checked
+        dense_offsets: If > 0, also test n + j/(dense_offsets + 1) for every
+            j = 1..dense_offsets and every integer n in [0, dense_stop)
+        dense_stop: End of the dense integer range (default N_k)
 
     Returns:
         Dictionary with verification results
     """
     N_k = primorial(k)
+    primes = get_first_k_primes(k)
     results = {
         'k': k,
         'N_k': N_k,
         'integer_zeros_correct': 0,
         'integer_nonzeros_correct': 0,
+        'integer_count_matches_phi': False,
+        'integer_float_checked': 0,
+        'integer_float_mismatches': 0,
         'noninteger_all_positive': 0,
         'max_ratio_noninteger': 0.0
     }
 
     # Test integers
-    for n in range(N_k):
-        P_n = P_k(float(n), k)
-        should_be_zero = (gcd(n, N_k) > 1)
+    n_coprime = count_coprime(0, N_k, primes)
+    results['integer_zeros_correct'] = N_k - n_coprime
+    results['integer_nonzeros_correct'] = n_coprime
+    results['integer_count_matches_phi'] = (n_coprime == phi_primorial(k))
 
-        if should_be_zero:
-            if abs(P_n) < 1e-10:
-                results['integer_zeros_correct'] += 1
-        else:
-            if abs(P_n - 1.0) < 1e-10:
-                results['integer_nonzeros_correct'] += 1
-
-    # Test non-integers (should all be positive)
-    primes = get_first_k_primes(k)
-    for p in primes[:min(3, k)]:  # Test first 3 primes
-        for n in range(min(p, 10)):
-            for delta in np.linspace(0.1, 0.9, n_test):
-                x = n + delta
-                P_x = P_k(x, k)
-
-                if P_x > 1e-10:
-                    results['noninteger_all_positive'] += 1
-
-                # Compute sin(πθ)/sin(πθ/p) ratio (should be < p)
-                theta = delta
-                numerator = abs(np.sin(np.pi * theta))
-                denominator = abs(np.sin(np.pi * theta / p))
-                if denominator > 1e-10:
-                    ratio = numerator / denominator
-                    results['max_ratio_noninteger'] = max(
-                        results['max_ratio_noninteger'],
-                        ratio
-                    )
+    if N_k <= cross_check:
+        n = np.arange(N_k, dtype=np.int64)
+    else:
+        n = np.unique(np.linspace(0, N_k - 1, cross_check).astype(np.int64))
+    P_n = P_k_vectorized(n.astype(np.float64), k)
+    mismatches = np.abs(P_n - P_k_integers(n, primes)) >= 1e-10
+    results['integer_float_checked'] = len(n)
+    results['integer_float_mismatches'] = int(np.count_nonzero(mismatches))
+
+    # Test non-integers (should all be positive): n + δ for n < min(p, 10)
+    # and each of the first 3 primes, evaluated as one vectorized batch
+    deltas = np.linspace(0.1, 0.9, n_test)
+    test_primes = primes[:min(3, k)]
+    bases = np.concatenate([np.arange(min(int(p), 10)) for p in test_primes])
+    stats = verify_noninteger(primes, bases, deltas, ratio_primes=test_primes)
+    results['noninteger_all_positive'] = stats['positive']
+    results['max_ratio_noninteger'] = stats['max_ratio']
+
+    # Optional dense grid: every integer in [0, dense_stop) times
+    # dense_offsets interior offsets, reduced to statistics on the fly
+    if dense_offsets > 0:
+        stop = N_k if dense_stop is None else min(dense_stop, N_k)
+        offsets = np.arange(1, dense_offsets + 1) / (dense_offsets + 1)
+        dense = verify_noninteger(primes, range(stop), offsets)
+        for key in ('points', 'positive', 'min_value', 'min_x',
+                    'max_ratio', 'bound_holds'):
+            results[f'dense_{key}'] = dense[key]
 
     return results
 
 
+@profiled('besov_analysis')
+def besov_analysis(k: int, s_values, p_values, orders=(1,),
+                   n_samples: int = None, h_values=None,
+                   method: str = 'auto', workers: int = 1) -> dict:
+    """
+    Besov seminorm proxies for a whole (order, s, p) grid in one pass.
+
+    P_k is sampled once over a period; every shift h, difference order r
+    and exponent p is served from those samples (see pwt_besov).
+
+    Args:
+        k: Number of primes
+        s_values: Regularity parameters s
+        p_values: Lebesgue exponents p
+        orders: Difference orders r of Δ_h^r
+        n_samples: Grid points per period (default: 4x the Nyquist rate,
+            capped at pwt_besov.DEFAULT_MAX_SAMPLES)
+        h_values: Shifts h (default logspace(-3, -0.5, 20))
+        method: 'spectral', 'grid', 'crt', 'direct' or 'auto'
+        workers: Processes used to evaluate P_k (1 = in-process)
+
+    Returns:
+        Dictionary with 'seminorms' of shape (orders, s, p), the moduli
+        'norms' of shape (orders, h, p) and the axes used
+    """
+    primes = get_first_k_primes(k)
+    if n_samples is None:
+        n_samples = default_n_samples(primes)
+    if h_values is None:
+        h_values = DEFAULT_H_VALUES
+
+    result = modulus_of_continuity(primes, n_samples, h_values, orders,
+                                   p_values, method=method, workers=workers)
+    result.update({
+        'k': k,
+        'n_samples': n_samples,
+        'orders': list(orders),
+        's_values': np.asarray(s_values, dtype=np.float64),
+        'p_values': np.asarray(p_values, dtype=np.float64),
+        'seminorms': besov_seminorms(result['norms'], result['h_values'],
+                                     s_values),
+    })
+    return result
+
+
 def compute_besov_proxy(k: int, s: float, p: float,
-                        n_samples: int = 1000) -> float:
+                        n_samples: int = 1000, workers: int = 1) -> float:
     """
     Compute proxy for Besov seminorm (supporting Conjecture 6.1).
 
@@ -354,84 +541,97 @@ def compute_besov_proxy(k: int, s: float, p: float,
         s: Regularity parameter
         p: Lebesgue exponent
         n_samples: Number of sample points
+        workers: Processes used to evaluate P_k (1 = in-process)
 
     Returns:
         Approximate Besov seminorm (finite => membership)
     """
-    N_k = primorial(k)
-    x = np.linspace(0, N_k, n_samples)
-    P_vals = P_k_vectorized(x, k)
+    result = besov_analysis(k, [s], [p], n_samples=n_samples,
+                            workers=workers)
+    return float(result['seminorms'][0, 0, 0])
 
-    # Compute first-order modulus of continuity
-    h_values = np.logspace(-3, -0.5, 20)  # [0.001, 0.316...]
-    seminorm = 0.0
 
-    for h in h_values:
-        # Shift by h
-        x_shifted = x + h
-        x_shifted = x_shifted % N_k  # Periodic
-        P_shifted = P_k_vectorized(x_shifted, k)
+# ============================================================================
+# SECTION D.5: Visualization Functions
+# ============================================================================
 
-        # ||P(x+h) - P(x)||_Lp
-        diff = P_shifted - P_vals
-        Lp_norm = np.mean(np.abs(diff) ** p) ** (1 / p)
+def _pyplot(backend: str = None):
+    """
+    Import matplotlib.pyplot on first use.
 
-        # Weight by h^{-s}
-        weighted = Lp_norm / (h ** s)
-        seminorm = max(seminorm, weighted)
+    The compute functions above need only numpy, so library imports and
+    --mode verify never pay for matplotlib.
 
-    return seminorm
+    Args:
+        backend: Backend to select before pyplot loads (e.g. 'Agg')
 
+    Returns:
+        The matplotlib.pyplot module
+    """
+    with PROFILER.stage('import_matplotlib'):
+        if backend is not None:
+            import matplotlib
+            matplotlib.use(backend)
+        import matplotlib.pyplot as plt
+    return plt
+
+
+def _save_figure(fig, filename):
+    """Save fig once per filename; the format follows each extension."""
+    if not filename:
+        return
+    for name in ([filename] if isinstance(filename, str) else filename):
+        with PROFILER.stage('savefig'):
+            fig.savefig(name, dpi=300, bbox_inches='tight')
+        print(f"Saved: {name}")
 
-# ============================================================================
-# SECTION D.5: Visualization Functions
-# ============================================================================
 
+@profiled('plot_wave')
 def plot_wave(k: int, filename: str = None, show: bool = True):
     """
     Generate Figure 4.1: Prime Wave P_k(x) visualization.
 
     Args:
         k: Number of primes
-        filename: Output filename (e.g., 'P3_wave_plot.pdf')
+        filename: Output filename (e.g., 'P3_wave_plot.pdf'), or a list
+            of filenames to save the same figure in several formats
         show: Whether to display plot
     """
     N_k = primorial(k)
     primes = get_first_k_primes(k)
 
-    # Generate x values (fine resolution)
-    x = np.linspace(0, N_k, 5000)
-    y = P_k_vectorized(x, k)
+    # Continuous wave, decimated to pixel resolution
+    x, y = PRIME_CACHE.memo('wave_trace', k,
+                            lambda: wave_trace(primes, N_k))
 
-    # Integer values
-    x_int = np.arange(N_k)
-    y_int = np.array([P_k(float(n), k) for n in x_int])
+    # Integer markers (one per integer, or per pixel column for large N_k)
+    coprime_x, composite_x = PRIME_CACHE.memo(
+        'integer_markers', k, lambda: integer_markers(primes, N_k))
 
     # Plot
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(12, 5))
 
     # Continuous wave
     ax.plot(x, y, 'b-', linewidth=0.8, label=f'$P_{k}(x)$', alpha=0.7)
 
     # Integer points (zeros in red, ones in green)
-    zeros = x_int[y_int < 0.5]
-    ones = x_int[y_int > 0.5]
-    ax.plot(zeros, y_int[y_int < 0.5], 'ro', markersize=4,
+    ax.plot(composite_x, np.zeros(len(composite_x)), 'ro', markersize=4,
             label='Composite (mod $N_k$)')
-    ax.plot(ones, y_int[y_int > 0.5], 'go', markersize=5,
+    ax.plot(coprime_x, np.ones(len(coprime_x)), 'go', markersize=5,
             label='Coprime to $N_k$')
 
     ax.set_xlabel('$x$', fontsize=12)
     ax.set_ylabel(f'$P_{k}(x)$', fontsize=12)
-    ax.set_title(f'Prime Wave for $k={k}$ (First {k} primes: {primes})',
+    ax.set_title(f'Prime Wave for $k={k}$ (First {k} primes: {primes.tolist()})',
                  fontsize=13)
     ax.grid(True, alpha=0.3)
     ax.legend(fontsize=10)
-    ax.set_xlim([0, N_k])
+    ax.set_xlim([0, float(N_k)])
     ax.set_ylim([-0.05, 1.1])
 
     # Add text annotation
-    phi_Nk = euler_phi(N_k)
+    phi_Nk = phi_primorial(k)
     ax.text(0.02, 0.95,
             f'$N_{k} = {N_k}$\n$\\varphi(N_{k}) = {phi_Nk}$\n' +
             f'Average: {phi_Nk / N_k:.4f}',
@@ -441,10 +641,7 @@ def plot_wave(k: int, filename: str = None, show: bool = True):
             bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
     plt.tight_layout()
-
-    if filename:
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        print(f"Saved: {filename}")
+    _save_figure(fig, filename)
 
     if show:
         plt.show()
@@ -452,23 +649,26 @@ def plot_wave(k: int, filename: str = None, show: bool = True):
         plt.close()
 
 
+@profiled('plot_spectrum')
 def plot_spectrum(k: int, filename: str = None, show: bool = True):
     """
     Generate Figure 4.2: Fourier spectrum of P_k.
 
     Args:
         k: Number of primes
-        filename: Output filename (e.g., 'P3_fourier_spectrum.pdf')
+        filename: Output filename (e.g., 'P3_fourier_spectrum.pdf'), or a
+            list of filenames to save the same figure in several formats
         show: Whether to display plot
     """
-    modes, coeffs = compute_all_fourier_coeffs(k)
-    N_k = primorial(k)
+    view = fourier_spectrum_view(k)
+    N_k = view.N_k
 
+    plt = _pyplot()
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(12, 8))
 
-    # Top panel: Full spectrum
-    ax1.stem(modes, np.abs(coeffs), linefmt='b-', markerfmt='bo',
-             basefmt='k-', label='$|c_m^{(k)}|$')
+    # Top panel: Full spectrum, largest |c_m| per pixel column
+    modes, _, heights = spectrum_envelope(view)
+    draw_stems(ax1, modes, heights, color='b', label='$|c_m^{(k)}|$')
     ax1.set_xlabel('Mode $m$', fontsize=11)
     ax1.set_ylabel('$|c_m^{(k)}|$', fontsize=11)
     ax1.set_title(f'Fourier Spectrum of $P_{k}$ for $k={k}$ ($N_{k}={N_k}$)',
@@ -477,16 +677,17 @@ def plot_spectrum(k: int, filename: str = None, show: bool = True):
     ax1.legend(fontsize=10)
 
     # Highlight DC component
-    ax1.plot(0, abs(coeffs[0]), 'ro', markersize=10,
-             label=f'$c_0 = {coeffs[0]:.4f}$')
-
-    # Bottom panel: Log-log plot (decay analysis)
-    nonzero_mask = np.abs(coeffs) > 1e-10
-    modes_nz = modes[nonzero_mask]
-    coeffs_nz = np.abs(coeffs[nonzero_mask])
-
-    ax2.loglog(modes_nz[1:], coeffs_nz[1:], 'bo', markersize=4,
-               label='Non-zero coefficients')
+    ax1.plot(0, abs(view[0]), 'ro', markersize=10,
+             label=f'$c_0 = {view[0]:.4f}$')
+
+    # Bottom panel: Log-log plot (decay analysis), extremes per log column
+    if N_k > 1:
+        modes_nz, low, high = spectrum_envelope(view, log_scale=True, start=1)
+        keep = high > 1e-10
+        modes_nz, low, high = modes_nz[keep], low[keep], high[keep]
+        ax2.loglog(np.concatenate([modes_nz, modes_nz]),
+                   np.concatenate([low, high]), 'bo', markersize=4,
+                   label='Non-zero coefficients')
 
     # Theoretical decay: e^{-γ}/log(k)
     gamma = 0.5772
@@ -501,10 +702,7 @@ def plot_spectrum(k: int, filename: str = None, show: bool = True):
     ax2.legend(fontsize=10)
 
     plt.tight_layout()
-
-    if filename:
-        plt.savefig(filename, dpi=300, bbox_inches='tight')
-        print(f"Saved: {filename}")
+    _save_figure(fig, filename)
 
     if show:
         plt.show()
@@ -512,31 +710,76 @@ def plot_spectrum(k: int, filename: str = None, show: bool = True):
         plt.close()
 
 
-def generate_verification_table(k_values: List[int]) -> str:
+@profiled('run_verification_job')
+def run_verification_job(k: int, n_test: int = 50,
+                         store_path: str = DEFAULT_STORE,
+                         unit_size: int = None, max_units: int = None) -> dict:
+    """
+    Resumable full-period verification of Theorem 4.7 for one k.
+
+    Every integer in [0, N_k) and n_test offsets around each one are
+    checked in work units recorded in a SQLite store keyed by (k, n_test,
+    code version). Re-running continues from the last finished unit.
+
+    Args:
+        k: Number of primes
+        n_test: Number of test points between integers
+        store_path: Result store file
+        unit_size: Residues per work unit (new jobs only)
+        max_units: Stop after this many new units (None = finish the job)
+
+    Returns:
+        Aggregated results, with 'complete' telling whether all units ran
+    """
+    with VerificationStore(store_path) as store:
+        return run_verification(get_first_k_primes(k), n_test, store,
+                                unit_size=unit_size, max_units=max_units)
+
+
+@profiled('verification_table')
+def generate_verification_table(k_values: List[int], store_path: str = None,
+                                fmt: str = 'latex') -> str:
     """
     Generate LaTeX table for Appendix B (numerical verification).
 
     Args:
         k_values: List of k values to test (e.g., [3, 5, 7])
+        store_path: If given, take the counts from the resumable result
+            store, running only units that are not stored yet
+        fmt: 'latex' or 'json'
 
     Returns:
-        LaTeX table code
+        LaTeX table code (or a JSON list of rows)
     """
     results = []
     for k in k_values:
-        verify = verify_zero_set(k, n_test=50)
         N_k = primorial(k)
-        phi_Nk = euler_phi(N_k)
+        phi_Nk = phi_primorial(k)
+
+        if store_path is None:
+            verify = verify_zero_set(k, n_test=50)
+            zeros = verify['integer_zeros_correct']
+            ones = verify['integer_nonzeros_correct']
+            max_ratio = verify['max_ratio_noninteger']
+        else:
+            stored = run_verification_job(k, n_test=50, store_path=store_path)
+            zeros = stored['integer_zeros']
+            ones = stored['integer_coprime']
+            max_ratio = ratio_bound(np.linspace(0.1, 0.9, 50),
+                                    get_first_k_primes(min(3, k)))['max_ratio']
 
         results.append({
             'k': k,
             'N_k': N_k,
             'mu_k': phi_Nk / N_k,
-            'zeros_correct': verify['integer_zeros_correct'],
-            'ones_correct': verify['integer_nonzeros_correct'],
-            'max_ratio': verify['max_ratio_noninteger']
+            'zeros_correct': zeros,
+            'ones_correct': ones,
+            'max_ratio': max_ratio
         })
 
+    if fmt == 'json':
+        return json.dumps(results, indent=2)
+
     latex = "\\begin{table}[h]\n\\centering\n"
     latex += "\\begin{tabular}{ccccccc}\n"
     latex += "\\toprule\n"
@@ -557,7 +800,244 @@ def generate_verification_table(k_values: List[int]) -> str:
 
 
 # ============================================================================
-# SECTION D.6: Main Execution
+# SECTION D.6: Result Export
+# ============================================================================
+
+def export_wave_samples(k: int, filename: str, num: int = 1_000_000,
+                        dtype=np.float64, fmt: str = None) -> int:
+    """
+    Write P_k sampled on np.linspace(0, N_k, num) to a file.
+
+    The format follows the extension (.npy, .npz, .parquet, .arrow,
+    .jsonl; see pwt_export). Samples stream chunk by chunk, so num may
+    exceed memory for every format except .npz.
+
+    Args:
+        k: Number of primes
+        filename: Output file
+        num: Number of samples
+        dtype: np.float64 or np.float32 for the P_k column
+        fmt: Format overriding the extension
+
+    Returns:
+        Number of samples written
+    """
+    return export_wave(filename, get_first_k_primes(k), 0.0,
+                       float(primorial(k)), num, dtype=dtype, fmt=fmt)
+
+
+def export_fourier_spectrum(k: int, filename: str, stop: int = None,
+                            dtype=np.float64, fmt: str = None) -> int:
+    """
+    Write the Fourier coefficients c_m, 0 <= m < stop, to a file.
+
+    Modes stream from the divisor-class table; a .npy file holds c_m at
+    index m and can be reopened with np.load(filename, mmap_mode='r').
+
+    Args:
+        k: Number of primes
+        filename: Output file
+        stop: End mode, exclusive (default N_k)
+        dtype: np.float64 or np.float32 for the c_m column
+        fmt: Format overriding the extension
+
+    Returns:
+        Number of modes written
+    """
+    return export_spectrum(filename, fourier_spectrum_view(k), stop=stop,
+                           dtype=dtype, fmt=fmt)
+
+
+def export_verification(k_values: List[int], filename: str,
+                        n_test: int = 100, fmt: str = None) -> int:
+    """
+    Write verify_zero_set results, one row per k.
+
+    Args:
+        k_values: k values to verify
+        filename: Output file (.jsonl, .npz, .parquet or .arrow)
+        n_test: Number of test points between integers
+        fmt: Format overriding the extension
+
+    Returns:
+        Number of rows written
+    """
+    records = [verify_zero_set(k, n_test=n_test) for k in k_values]
+    return write_records(filename, records, fmt=fmt)
+
+
+def export_results(k: int, out_dir: str, formats: Sequence[str],
+                   num: int = 1_000_000, n_test: int = 100) -> List[str]:
+    """
+    Write wave samples, spectrum and verification of P_k in several formats.
+
+    The wave samples and the spectrum are each streamed once, chunk by
+    chunk, and every chunk is handed to the writers of all formats, so
+    memory stays at one chunk per open file (except .npz, which joins its
+    arrays in memory). Verification rows mix types, so .npy falls back to
+    .npz for them, and each verification file is written only once.
+
+    Args:
+        k: Number of primes
+        out_dir: Output directory
+        formats: Formats from pwt_export.FORMATS
+        num: Wave samples over one period
+        n_test: Number of test points between integers
+
+    Returns:
+        Files written
+    """
+    primes = get_first_k_primes(k)
+    N_k = primorial(k)
+    stem = os.path.join(out_dir, f'P{k}')
+
+    wave = [f'{stem}_wave_samples.{fmt}' for fmt in formats]
+    write_tables(wave_chunks(primes, 0.0, float(N_k), num),
+                 [(open_writer(f, num), None) for f in wave])
+
+    # In .npy from mode 0 the index is the mode, so only c_m is stored
+    spectrum_files = [f'{stem}_spectrum.{fmt}' for fmt in formats]
+    write_tables(spectrum_chunks(fourier_spectrum_view(k)),
+                 [(open_writer(f, N_k), ['c_m'] if f.endswith('.npy')
+                   else None) for f in spectrum_files])
+
+    records = [verify_zero_set(k, n_test=n_test)]
+    verification = []
+    for fmt in formats:
+        filename = f"{stem}_verification.{'npz' if fmt == 'npy' else fmt}"
+        if filename not in verification:
+            write_records(filename, records)
+            verification.append(filename)
+
+    return [f for group in zip(wave, spectrum_files) for f in group] \
+        + verification
+
+
+# ============================================================================
+# SECTION D.7: Batch Figure Generation
+# ============================================================================
+
+BATCH_STAGES = ('wave', 'spectrum', 'verify')
+
+
+def parse_k_values(spec: str) -> List[int]:
+    """
+    Parse a k list such as '3,5,7', a range '3-8' or a mix '3-5,8'.
+
+    Returns:
+        Sorted, de-duplicated k values
+    """
+    k_values = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            lo, hi = (int(v) for v in part.split('-', 1))
+            k_values.update(range(lo, hi + 1))
+        else:
+            k_values.add(int(part))
+    if not k_values or min(k_values) < 1:
+        raise ValueError(f"Invalid k specification '{spec}'")
+    return sorted(k_values)
+
+
+def figure_job(k: int, formats: Sequence[str] = ('pdf',),
+               out_dir: str = '.', stages: Sequence[str] = BATCH_STAGES,
+               n_test: int = 100) -> dict:
+    """
+    Produce every figure and the verification record for one k, headless.
+
+    Runs on the Agg backend. The stages share one process, so the primes,
+    N_k, the spectrum view and the decimated wave samples are computed once
+    (memoized in the prime cache) and reused by wave, spectrum and verify.
+    Each figure is drawn once and saved in every requested format.
+
+    Args:
+        k: Number of primes
+        formats: File extensions, e.g. ('pdf', 'png')
+        out_dir: Directory receiving the files
+        stages: Subset of BATCH_STAGES to run
+        n_test: Number of test points between integers for verify
+
+    Returns:
+        Dictionary with the files written, per-stage seconds and, when
+        verify ran, its results
+    """
+    _pyplot('Agg')
+    os.makedirs(out_dir, exist_ok=True)
+    result = {'k': k, 'files': [], 'timings': {}}
+
+    def paths(stem):
+        return [os.path.join(out_dir, f'{stem}.{fmt}') for fmt in formats]
+
+    for stage in stages:
+        t0 = time.perf_counter()
+        if stage == 'wave':
+            files = paths(f'P{k}_wave_plot')
+            plot_wave(k, files, show=False)
+            result['files'] += files
+        elif stage == 'spectrum':
+            files = paths(f'P{k}_fourier_spectrum')
+            plot_spectrum(k, files, show=False)
+            result['files'] += files
+        elif stage == 'verify':
+            verify = verify_zero_set(k, n_test=n_test)
+            verify['besov_proxy'] = compute_besov_proxy(k, s=1.3, p=2.0,
+                                                        n_samples=500)
+            filename = os.path.join(out_dir, f'P{k}_verification.json')
+            with open(filename, 'w') as f:
+                json.dump(verify, f, indent=2)
+            result['verify'] = verify
+            result['files'].append(filename)
+        else:
+            raise ValueError(f"Unknown batch stage '{stage}'")
+        result['timings'][stage] = time.perf_counter() - t0
+
+    result['timings']['total'] = sum(result['timings'].values())
+    return result
+
+
+def run_batch(k_values: Sequence[int], formats: Sequence[str] = ('pdf',),
+              out_dir: str = '.', stages: Sequence[str] = BATCH_STAGES,
+              workers: int = None, n_test: int = 100) -> List[dict]:
+    """
+    Run figure_job for many k across a process pool.
+
+    One job per k, submitted largest k first so the slowest job starts
+    immediately; with at least as many workers as k values the wall time
+    is that of the slowest single k rather than the sum.
+
+    Args:
+        k_values: k values to render
+        formats: File extensions, e.g. ('pdf', 'png')
+        out_dir: Directory receiving the files
+        stages: Subset of BATCH_STAGES to run in every job
+        workers: Number of processes (default: min(len(k_values), cores))
+        n_test: Number of test points between integers for verify
+
+    Returns:
+        figure_job results ordered by k
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    k_values = sorted(set(k_values), reverse=True)
+    workers = workers or min(len(k_values), os.cpu_count() or 1)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        jobs = [pool.submit(figure_job, k, tuple(formats), out_dir,
+                            tuple(stages), n_test) for k in k_values]
+        for job in as_completed(jobs):
+            result = job.result()
+            print(f"k={result['k']}: {len(result['files'])} files in "
+                  f"{result['timings']['total']:.2f} s")
+            results.append(result)
+    return sorted(results, key=lambda r: r['k'])
+
+
+# ============================================================================
+# SECTION D.8: Main Execution
 # ============================================================================
 
 def main():
@@ -568,7 +1048,8 @@ def main():
         description='Prime Wave Theory Visualization and Verification'
     )
     parser.add_argument('--mode', type=str, required=True,
-                        choices=['wave', 'spectrum', 'verify', 'all'],
+                        choices=['wave', 'spectrum', 'verify', 'all',
+                                 'batch', 'export'],
                         help='Operation mode')
     parser.add_argument('--k', type=int, default=3,
                         help='Number of primes (default: 3)')
@@ -576,9 +1057,73 @@ def main():
                         help='Output filename for plots')
     parser.add_argument('--no-show', action='store_true',
                         help='Do not display plots (save only)')
+    parser.add_argument('--store', type=str, default=None,
+                        help='SQLite result store for resumable verification')
+    parser.add_argument('--k-values', type=str, default=None,
+                        help="Batch mode: k list or range, e.g. '3-8' or "
+                             "'3,5,7' (default: --k)")
+    parser.add_argument('--formats', type=str, default=None,
+                        help="Batch/export mode: comma-separated output "
+                             "formats (default: pdf for batch, npy for "
+                             "export)")
+    parser.add_argument('--out-dir', type=str, default='.',
+                        help='Batch/export mode: output directory')
+    parser.add_argument('--samples', type=int, default=1_000_000,
+                        help='Export mode: wave samples over one period')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Batch mode: number of processes '
+                             '(default: one per k, up to the core count)')
+    parser.add_argument('--profile', type=str, nargs='?', default=None,
+                        const='pwt_profile.json',
+                        help='Write a JSON trace of stage timings and '
+                             'counters (default file: pwt_profile.json) '
+                             'plus a .folded flame-graph stack dump')
 
     args = parser.parse_args()
 
+    if args.profile:
+        PROFILER.enable()
+    try:
+        with PROFILER.stage(args.mode):
+            run_mode(args)
+    finally:
+        if args.profile:
+            PROFILER.disable()
+            PROFILER.write(args.profile, extra={
+                'argv': sys.argv[1:],
+                'prime_cache': PRIME_CACHE.stats(),
+            })
+            print(f"Saved: {args.profile}")
+
+
+def _split_formats(spec: str) -> List[str]:
+    """'pdf, .png' -> ['pdf', 'png']."""
+    return [fmt.strip().lstrip('.') for fmt in spec.split(',') if fmt.strip()]
+
+
+def run_mode(args: argparse.Namespace):
+    """
+    Run the operation selected on the command line.
+    """
+    if args.mode == 'batch':
+        k_values = parse_k_values(args.k_values or str(args.k))
+        formats = _split_formats(args.formats or 'pdf')
+        t0 = time.perf_counter()
+        results = run_batch(k_values, formats, args.out_dir,
+                            workers=args.workers)
+        slowest = max(r['timings']['total'] for r in results)
+        print(f"Batch of {len(results)} jobs: wall "
+              f"{time.perf_counter() - t0:.2f} s, slowest job {slowest:.2f} s")
+        return
+
+    if args.mode == 'export':
+        os.makedirs(args.out_dir, exist_ok=True)
+        for filename in export_results(args.k, args.out_dir,
+                                       _split_formats(args.formats or 'npy'),
+                                       num=args.samples):
+            print(f"Saved: {filename}")
+        return
+
     if args.mode == 'wave' or args.mode == 'all':
         filename = args.output or f'P{args.k}_wave_plot.pdf'
         plot_wave(args.k, filename, not args.no_show)
@@ -589,7 +1134,11 @@ def main():
 
     if args.mode == 'verify' or args.mode == 'all':
         print(f"\n=== Verification for k={args.k} ===")
-        verify_results = verify_zero_set(args.k)
+        if args.store:
+            verify_results = run_verification_job(args.k, n_test=100,
+                                                  store_path=args.store)
+        else:
+            verify_results = verify_zero_set(args.k)
         for key, value in verify_results.items():
             print(f"{key}: {value}")
 
@@ -599,13 +1148,12 @@ def main():
 
         if args.mode == 'all':
             print("\n=== LaTeX Verification Table ===")
-            print(generate_verification_table([3, 5, 7]))
+            print(generate_verification_table([3, 5, 7],
+                                              store_path=args.store))
 
 
 if __name__ == '__main__':
     # If run without arguments, generate standard figures
-    import sys
-
     if len(sys.argv) == 1:
         print("Generating standard figures for k=3...")
         plot_wave(3, 'P3_wave_plot.pdf', show=True)
@@ -1,10 +1,12 @@
+import sys
 from Bio import Entrez, SeqIO
 from Bio.Seq import Seq
-from collections import Counter
-import sympy as sp
 import math
 import random
 
+from pwt_codons import count_codons, count_sequence, translate_head
+from pwt_factor import factor_batch, factorint, isprime
+
 # Set email for Entrez (required for NCBI access; use a placeholder or your own)
 Entrez.email = "tusk@pwt.life"  # Replace with a real email to avoid NCBI blocks
 
@@ -17,31 +19,38 @@ def fetch_gene_sequence(accession, start=1, end=None):
 
 # Expanded PWT-inspired DNA prime analyzer
 def analyze_dna_primes(dna_seq):
-    # Translate to protein for context
-    protein = dna_seq.translate()
-    print(f"Protein sequence (first 50 aa): {str(protein)[:50]}...")
-
-    # Extract codons (handle if not multiple of 3)
-    codons = [str(dna_seq[i:i+3]) for i in range(0, len(dna_seq), 3) if len(dna_seq[i:i+3]) == 3]
+    # Translate only the residues that are printed
+    protein = translate_head(dna_seq, 50)
+    print(f"Protein sequence (first 50 aa): {protein}...")
 
-    # Count codons
-    codon_count = Counter(codons)
+    # Count reading-frame-0 codons with the 2-bit / bincount kernel
+    return analyze_codon_counts(count_sequence(dna_seq))
 
+# Prime signatures of codon counts (from count_sequence or count_codons)
+def analyze_codon_counts(codon_counts, frame=0):
     # Analyze counts for prime signatures
     prime_data = []
-    for codon, count in codon_count.items():
-        factors = sp.factorint(count)
-        is_prime_count = sp.isprime(count)
+    codon_count = codon_counts.codons(frame)
+    counts = list(codon_count.values())
+    for (codon, count), factors in zip(codon_count.items(), factor_batch(counts)):
+        is_prime_count = isprime(count)
         prime_data.append((codon, count, is_prime_count, factors))
 
-    # Totals
-    total_codons = len(codons)
-    total_length = len(dna_seq)
-    total_factors = sp.factorint(total_codons)
-    length_factors = sp.factorint(total_length)
+    # Totals (complete codons, including those with ambiguous bases)
+    total_codons = codon_counts.total(frame)
+    total_length = codon_counts.length
+    total_factors = factorint(total_codons)
+    length_factors = factorint(total_length)
 
     return prime_data, total_codons, total_factors, total_length, length_factors
 
+# Genome-scale analysis of a local FASTA/FASTQ file (plain or gzip), streamed in constant memory
+def analyze_dna_file(path):
+    results = []
+    for codon_counts in count_codons(path):
+        results.append((codon_counts.name, analyze_codon_counts(codon_counts)))
+    return results
+
 # Simulate evolutionary drifts (simple SNP mutations over generations)
 def simulate_evo_drifts(dna_seq, generations=5, mutation_rate=0.01):
     results = []
@@ -66,6 +75,14 @@ def simulate_evo_drifts(dna_seq, generations=5, mutation_rate=0.01):
 
 # Main execution
 if __name__ == "__main__":
+    # Local FASTA/FASTQ file: python PWT_DNA_Prime_Analyzer.py genome.fa[.gz]
+    if len(sys.argv) > 1:
+        for name, (prime_data, total_codons, total_factors, total_length, length_factors) in analyze_dna_file(sys.argv[1]):
+            print(f"\n{name}: DNA Length: {total_length}, Factors: {length_factors}")
+            print(f"Total Codons: {total_codons}, Factors: {total_factors}")
+            print(f"Prime codon counts: {sum(1 for _, _, is_prime, _ in prime_data if is_prime)} of {len(prime_data)}")
+        sys.exit(0)
+
     # Fetch full HBB gene segment (NG_028289.1, positions 5001-7000 for ~2kb)
     print("Fetching HBB gene segment from NCBI...")
     hbb_seq = fetch_gene_sequence("NG_028289.1", start=5001, end=7000)
@@ -0,0 +1,350 @@
+"""
+Hot-Path Benchmark Suite for Prime Wave Theory (PWT)
+
+Sweeps the PWT-V15 hot paths over k and sample sizes and records, for every
+case:
+
+    * wall time: the first (cold) call, which also fills the prime cache,
+      and the minimum and median of the warm repeats;
+    * peak RSS: growth of the resident-set high-water mark during the case;
+    * allocations: tracemalloc peak bytes and the number of memory blocks
+      still held afterwards, from one extra traced call.
+
+Every case runs in a freshly spawned interpreter, so caches and the RSS
+high-water mark of one case never leak into the next. Results are written
+as JSON and can be compared with a saved baseline; a case regresses when a
+metric exceeds the baseline by more than its threshold, and the run then
+exits with status 1.
+
+Usage:
+    python benchmarks/bench_hot_paths.py --output baseline.json
+    python benchmarks/bench_hot_paths.py --baseline baseline.json \\
+        --time-threshold 0.2 --output current.json
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0 (imported by the benchmarked code, in the workers only)
+    Linux or another Unix (resource.getrusage)
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional, Sequence
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_K_VALUES = tuple(range(3, 11))
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+# Functions that materialize or scan a whole period are skipped once N_k
+# exceeds this
+DEFAULT_MAX_PERIOD = 10_000_000
+
+DEFAULT_THRESHOLDS = {
+    'time_min': 0.25,
+    'peak_rss_bytes': 0.25,
+    'alloc_peak_bytes': 0.25,
+}
+
+# Absolute growth below which a metric never counts as regressed, so
+# sub-millisecond and sub-MiB cases do not flap on timer or allocator noise
+NOISE_FLOORS = {
+    'time_min': 1e-3,
+    'peak_rss_bytes': 1 << 20,
+    'alloc_peak_bytes': 1 << 20,
+}
+
+# CLI flag for each threshold
+_THRESHOLD_FLAGS = {
+    'time_min': '--time-threshold',
+    'peak_rss_bytes': '--rss-threshold',
+    'alloc_peak_bytes': '--alloc-threshold',
+}
+
+# ru_maxrss is in KiB on Linux and in bytes on macOS
+_RSS_UNIT = 1 if sys.platform == 'darwin' else 1024
+
+
+# ============================================================================
+# Cases
+# ============================================================================
+
+def _load_pwt_v15():
+    """Import PWT-V15.py as a module (its file name is not importable)."""
+    import importlib.util
+
+    if REPO not in sys.path:
+        sys.path.insert(0, REPO)
+    spec = importlib.util.spec_from_file_location(
+        'pwt_v15', os.path.join(REPO, 'PWT-V15.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _primorial(k: int) -> int:
+    """N_k for the first few k, without importing the benchmarked code."""
+    primes = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+    N_k = 1
+    for p in primes[:k]:
+        N_k *= p
+    return N_k
+
+
+def build_cases(k_values: Sequence[int] = DEFAULT_K_VALUES,
+                sizes: Sequence[int] = DEFAULT_SIZES,
+                max_period: int = DEFAULT_MAX_PERIOD,
+                functions: Sequence[str] = None) -> List[Dict]:
+    """
+    The benchmark grid as a list of {'function', 'k', 'size'} cases.
+
+    sieve_of_eratosthenes is swept over limits (size * 10, k unused);
+    P_k_vectorized over points on [0, N_k]; compute_besov_proxy over
+    n_samples; compute_all_fourier_coeffs and verify_zero_set over k only,
+    up to N_k <= max_period.
+    """
+    cases = []
+    for size in sizes:
+        cases.append({'function': 'sieve_of_eratosthenes', 'k': None,
+                      'size': 10 * size})
+    for k in k_values:
+        for size in sizes:
+            cases.append({'function': 'P_k_vectorized', 'k': k, 'size': size})
+        if _primorial(k) <= max_period:
+            cases.append({'function': 'compute_all_fourier_coeffs', 'k': k,
+                          'size': None})
+            cases.append({'function': 'verify_zero_set', 'k': k,
+                          'size': None})
+        for size in sizes:
+            cases.append({'function': 'compute_besov_proxy', 'k': k,
+                          'size': size})
+    if functions:
+        cases = [c for c in cases if c['function'] in functions]
+    return cases
+
+
+def _case_call(pwt, case: Dict):
+    """Zero-argument callable running one case against the loaded module."""
+    import numpy as np
+
+    name, k, size = case['function'], case['k'], case['size']
+    if name == 'sieve_of_eratosthenes':
+        return lambda: pwt.sieve_of_eratosthenes(size)
+    if name == 'P_k_vectorized':
+        x = np.linspace(0, float(pwt.primorial(k)), size)
+        return lambda: pwt.P_k_vectorized(x, k)
+    if name == 'compute_all_fourier_coeffs':
+        return lambda: pwt.compute_all_fourier_coeffs(k)
+    if name == 'verify_zero_set':
+        return lambda: pwt.verify_zero_set(k)
+    if name == 'compute_besov_proxy':
+        return lambda: pwt.compute_besov_proxy(k, s=1.3, p=2.0,
+                                               n_samples=size)
+    raise ValueError(f"Unknown benchmark function '{name}'")
+
+
+def _max_rss() -> int:
+    """Resident-set high-water mark of this process in bytes."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+def _run_case(case: Dict, repeat: int) -> Dict:
+    """Measure one case; runs inside a fresh worker process."""
+    pwt = _load_pwt_v15()
+    call = _case_call(pwt, case)
+    rss_before = _max_rss()
+
+    t0 = time.perf_counter()
+    call()
+    cold = time.perf_counter() - t0
+
+    warm = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        call()
+        warm.append(time.perf_counter() - t0)
+    peak_rss = _max_rss() - rss_before
+
+    tracemalloc.start()
+    result = call()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    del result
+    alloc_blocks = sum(stat.count for stat in
+                       tracemalloc.take_snapshot().statistics('filename'))
+    tracemalloc.stop()
+
+    return dict(case, **{
+        'time_cold': cold,
+        'time_min': min(warm) if warm else cold,
+        'time_median': statistics.median(warm) if warm else cold,
+        'repeat': repeat,
+        'peak_rss_bytes': peak_rss,
+        'alloc_peak_bytes': alloc_peak,
+        'alloc_blocks': alloc_blocks,
+    })
+
+
+# ============================================================================
+# Running and Comparing
+# ============================================================================
+
+def run_suite(cases: Sequence[Dict], repeat: int = 3,
+              verbose: bool = True) -> Dict:
+    """
+    Run every case in its own spawned process.
+
+    Args:
+        cases: Output of build_cases
+        repeat: Warm repetitions per case
+        verbose: Print one line per case
+
+    Returns:
+        Dictionary with environment metadata and the per-case 'results'
+    """
+    ctx = multiprocessing.get_context('spawn')
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for case in cases:
+            r = pool.apply(_run_case, (case, repeat))
+            results.append(r)
+            if verbose:
+                print(f"{_label(r):40s} {r['time_min'] * 1e3:10.2f} ms  "
+                      f"rss +{r['peak_rss_bytes'] / 2 ** 20:7.1f} MiB  "
+                      f"alloc {r['alloc_peak_bytes'] / 2 ** 20:7.1f} MiB")
+
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results,
+    }
+
+
+def _label(case: Dict) -> str:
+    label = case['function']
+    if case['k'] is not None:
+        label += f" k={case['k']}"
+    if case['size'] is not None:
+        label += f" n={case['size']}"
+    return label
+
+
+def _key(case: Dict) -> tuple:
+    return case['function'], case['k'], case['size']
+
+
+def compare(current: Dict, baseline: Dict,
+            thresholds: Dict[str, float] = None) -> List[Dict]:
+    """
+    Regressions of current against baseline.
+
+    A metric regresses when current > baseline * (1 + threshold) and the
+    growth also exceeds its NOISE_FLOORS entry. Cases missing from either
+    report are ignored.
+
+    Args:
+        current: Report from run_suite
+        baseline: Earlier report from run_suite
+        thresholds: Metric -> allowed relative growth (DEFAULT_THRESHOLDS)
+
+    Returns:
+        One entry per regressed (case, metric) with both values and ratio
+    """
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    previous = {_key(r): r for r in baseline['results']}
+    regressions = []
+    for r in current['results']:
+        base = previous.get(_key(r))
+        if base is None:
+            continue
+        for metric, threshold in thresholds.items():
+            old, new = base.get(metric), r.get(metric)
+            if old is None or new is None or old <= 0:
+                continue
+            if (new > old * (1 + threshold)
+                    and new - old > NOISE_FLOORS.get(metric, 0)):
+                regressions.append({
+                    'case': _label(r),
+                    'metric': metric,
+                    'baseline': old,
+                    'current': new,
+                    'ratio': new / old,
+                })
+    return regressions
+
+
+def _parse_k_values(spec: str) -> List[int]:
+    """'3-10' or '3,5,7'."""
+    if '-' in spec:
+        lo, hi = (int(v) for v in spec.split('-', 1))
+        return list(range(lo, hi + 1))
+    return [int(v) for v in spec.split(',') if v.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line interface; returns 1 if any regression was found."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark the PWT-V15 hot paths')
+    parser.add_argument('--k', type=str, default='3-10',
+                        help="k values, e.g. '3-10' or '3,5,7'")
+    parser.add_argument('--sizes', type=str,
+                        default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Comma-separated sample sizes')
+    parser.add_argument('--functions', type=str, default=None,
+                        help='Comma-separated subset of functions to run')
+    parser.add_argument('--max-period', type=int, default=DEFAULT_MAX_PERIOD,
+                        help='Largest N_k for whole-period functions')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Warm repetitions per case')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Compare against this earlier JSON report')
+    for metric, default in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(_THRESHOLD_FLAGS[metric], dest=metric, type=float,
+                            default=default,
+                            help=f'Allowed relative growth of {metric} '
+                                 f'(default: {default})')
+    args = parser.parse_args(argv)
+
+    cases = build_cases(
+        _parse_k_values(args.k),
+        [int(v) for v in args.sizes.split(',') if v.strip()],
+        args.max_period,
+        args.functions.split(',') if args.functions else None)
+    report = run_suite(cases, repeat=args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        thresholds = {m: getattr(args, m) for m in DEFAULT_THRESHOLDS}
+        regressions = compare(report, baseline, thresholds)
+        for r in regressions:
+            print(f"REGRESSION {r['case']}: {r['metric']} "
+                  f"{r['baseline']:.4g} -> {r['current']:.4g} "
+                  f"(x{r['ratio']:.2f})")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
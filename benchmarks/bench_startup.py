@@ -0,0 +1,176 @@
+"""
+Startup-Time Benchmark for Prime Wave Theory (PWT) Entry Points
+
+Measures the cold import cost of every entry point: each measurement runs
+in a fresh interpreter, and the interpreter's own start-up (python -c pass)
+is subtracted. `python -X importtime` attributes the remainder to modules,
+so a regression can be traced to the import that caused it.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --output startup.json
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    Python standard library only
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _load_script(filename: str) -> str:
+    """Code executing a top-level script file as a module."""
+    return (
+        "import importlib.util as u; "
+        "s = u.spec_from_file_location('script', {path!r}); "
+        "m = u.module_from_spec(s); s.loader.exec_module(m)"
+    ).format(path=os.path.join(REPO, filename))
+
+
+_LOAD_V15 = _load_script('PWT-V15.py')
+
+# Entry point name -> code run in a fresh interpreter. The
+# PWT_Model_Implementation script runs its examples on import, so its entry
+# measures the whole script
+ENTRY_POINTS = {
+    'PWT-V15': _LOAD_V15,
+    'PWT-V15 + plotting': _LOAD_V15 + "; m._pyplot('Agg')",
+    'PWT_DNA_Prime_Analyzer': _load_script('PWT_DNA_Prime_Analyzer.py'),
+    'PWT_Model_Implementation': _load_script('PWT_Model_Implementation.py'),
+    'pwt_primes': 'import pwt_primes',
+    'pwt_wave': 'import pwt_wave',
+    'pwt_coprime': 'import pwt_coprime',
+    'pwt_spectrum': 'import pwt_spectrum',
+    'pwt_arith': 'import pwt_arith',
+    'pwt_factor': 'import pwt_factor',
+    'pwt_verify': 'import pwt_verify',
+    'pwt_besov': 'import pwt_besov',
+    'pwt_render': 'import pwt_render',
+    'pwt_profile': 'import pwt_profile',
+    'pwt_export': 'import pwt_export',
+    'pwt_prime_index': 'import pwt_prime_index',
+    'pwt_primecount': 'import pwt_primecount',
+    'pwt_model': 'import pwt_model',
+    'pwt_codons': 'import pwt_codons',
+}
+
+
+def _run(code: str, importtime: bool = False) -> Dict:
+    """Run code in a fresh interpreter; wall seconds and -X importtime log."""
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ['-X', 'importtime']
+    cmd += ['-c', code]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=REPO, capture_output=True, text=True)
+    wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"{code!r} failed:\n{proc.stderr}")
+    return {'wall': wall, 'stderr': proc.stderr}
+
+
+def _top_level_imports(log: str) -> List[tuple]:
+    """(module, cumulative seconds) of each top-level import in the log."""
+    modules = []
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "self [us] | cumulative | <indent>name"; nested imports are
+        # indented and already counted in their parent's cumulative time
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        modules.append((name.strip(), int(cumulative_us) * 1e-6))
+    return modules
+
+
+def _parse_importtime(log: str, top: int, skip: set) -> Dict:
+    """Total and heaviest top-level imports, ignoring modules in skip."""
+    modules = [m for m in _top_level_imports(log) if m[0] not in skip]
+    modules.sort(key=lambda m: m[1], reverse=True)
+    return {
+        'import_seconds': sum(seconds for _, seconds in modules),
+        'heaviest': [{'module': name, 'seconds': seconds}
+                     for name, seconds in modules[:top]],
+    }
+
+
+def measure(entry_points: Dict[str, str] = None, repeat: int = 10,
+            top: int = 5) -> Dict:
+    """
+    Cold import cost of each entry point.
+
+    Args:
+        entry_points: Name -> code mapping (default: ENTRY_POINTS)
+        repeat: Fresh interpreters started per entry point
+        top: Heaviest top-level imports reported per entry point
+
+    Returns:
+        Dictionary with the interpreter baseline and, per entry point, the
+        median and minimum wall time above it plus the importtime breakdown
+    """
+    entry_points = entry_points or ENTRY_POINTS
+    baseline = statistics.median(_run('pass')['wall'] for _ in range(repeat))
+    # Modules the bare interpreter imports anyway (site, encodings, ...)
+    startup = {name for name, _ in
+               _top_level_imports(_run('pass', importtime=True)['stderr'])}
+
+    results = {}
+    for name, code in entry_points.items():
+        walls = [_run(code)['wall'] - baseline for _ in range(repeat)]
+        results[name] = {
+            'median_seconds': statistics.median(walls),
+            'min_seconds': min(walls),
+            **_parse_importtime(_run(code, importtime=True)['stderr'], top,
+                                startup),
+        }
+
+    return {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'repeat': repeat,
+        'interpreter_seconds': baseline,
+        'entry_points': results,
+    }
+
+
+def main(argv: List[str] = None):
+    """Command-line interface: print the table, optionally save JSON."""
+    parser = argparse.ArgumentParser(
+        description='Cold import cost of the PWT entry points')
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Fresh interpreters per entry point')
+    parser.add_argument('--top', type=int, default=5,
+                        help='Heaviest imports listed per entry point')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write the results as JSON to this file')
+    args = parser.parse_args(argv)
+
+    report = measure(repeat=args.repeat, top=args.top)
+    print(f"Interpreter start-up: {report['interpreter_seconds'] * 1e3:.1f} ms")
+    for name, r in report['entry_points'].items():
+        heaviest = ', '.join(f"{m['module']} {m['seconds'] * 1e3:.0f}"
+                             for m in r['heaviest'][:3])
+        print(f"{name:20s} {r['median_seconds'] * 1e3:8.1f} ms  "
+              f"(min {r['min_seconds'] * 1e3:.1f})  [{heaviest}]")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+"""
+Arithmetic Function Tables for Prime Wave Theory (PWT)
+
+Precomputed smallest-prime-factor, Euler totient φ, Möbius μ and ω
+(number of distinct prime factors) tables up to a configurable bound,
+stored as compact NumPy arrays with vectorized lookups.
+
+The smallest prime factor is sieved with strided assignment over the
+primes up to sqrt(bound). φ, μ and ω are then derived for every n at once
+by peeling off smallest prime factors: each round divides all unfinished
+entries by their spf, and at most log2(bound) rounds are needed, so every
+step is a whole-array NumPy operation.
+
+For squarefree products of known primes, such as N_k and its divisors,
+phi_squarefree / mobius_squarefree work directly from the prime list and
+never trial-divide.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import threading
+
+import numpy as np
+from typing import Dict, Optional, Sequence
+
+from pwt_primes import sieve_primes
+
+
+# Bound used when a table is first requested without one
+DEFAULT_TABLE_BOUND = 1 << 20
+
+
+# ============================================================================
+# Table Construction
+# ============================================================================
+
+class ArithmeticTables:
+    """
+    spf, φ, μ and ω for every 0 <= n <= bound.
+
+    Entries for n = 0 are 0 throughout; n = 1 has spf 1, φ 1, μ 1, ω 0.
+
+    Args:
+        bound: Largest n covered
+    """
+
+    def __init__(self, bound: int):
+        self.bound = bound
+        n_dtype = np.uint32 if bound < 2 ** 32 else np.uint64
+
+        spf = np.zeros(bound + 1, dtype=n_dtype)
+        for p in sieve_primes(int(bound ** 0.5) + 1).tolist():
+            multiples = spf[p::p]
+            multiples[multiples == 0] = p
+        n = np.arange(bound + 1, dtype=n_dtype)
+        unset = spf == 0
+        spf[unset] = n[unset]  # primes, plus 0 and 1
+        self.spf = spf
+
+        phi = np.ones(bound + 1, dtype=n_dtype)
+        mu = np.ones(bound + 1, dtype=np.int8)
+        omega = np.zeros(bound + 1, dtype=np.uint8)
+
+        # Peel the smallest prime factor off every n > 1 each round
+        idx = np.arange(2, bound + 1, dtype=np.int64)
+        rest = idx.astype(n_dtype)
+        last = np.zeros(len(idx), dtype=n_dtype)
+        while len(idx):
+            p = spf[rest]
+            new = p != last
+            phi[idx] *= np.where(new, p - 1, p).astype(n_dtype)
+            mu[idx] = np.where(new, -mu[idx], 0)
+            omega[idx] += new
+            rest //= p
+            last = p
+            alive = rest > 1
+            idx, rest, last = idx[alive], rest[alive], last[alive]
+
+        phi[0] = 0
+        mu[0] = 0
+        self.phi_table = phi
+        self.mu_table = mu
+        self.omega_table = omega
+
+    def _index(self, n):
+        n = np.asarray(n)
+        if n.size and (n.min() < 0 or n.max() > self.bound):
+            raise ValueError(f"n outside table range [0, {self.bound}]")
+        return n
+
+    def smallest_prime_factor(self, n):
+        """Smallest prime factor of n (scalar or array)."""
+        return self.spf[self._index(n)]
+
+    def phi(self, n):
+        """Euler's totient φ(n) (scalar or array)."""
+        return self.phi_table[self._index(n)]
+
+    def mobius(self, n):
+        """Möbius μ(n) (scalar or array)."""
+        return self.mu_table[self._index(n)]
+
+    def omega(self, n):
+        """Number of distinct prime factors ω(n) (scalar or array)."""
+        return self.omega_table[self._index(n)]
+
+    def factorize(self, n: int) -> Dict[int, int]:
+        """
+        Prime factorization of n <= bound by walking the spf chain.
+
+        Returns:
+            {prime: exponent}, empty for n = 1
+        """
+        n = int(self._index(n))
+        factors = {}
+        while n > 1:
+            p = int(self.spf[n])
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+        return factors
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the four tables."""
+        return (self.spf.nbytes + self.phi_table.nbytes
+                + self.mu_table.nbytes + self.omega_table.nbytes)
+
+
+_TABLES: Optional[ArithmeticTables] = None
+_TABLES_LOCK = threading.Lock()
+
+
+def arithmetic_tables(bound: int = DEFAULT_TABLE_BOUND) -> ArithmeticTables:
+    """
+    Process-wide tables covering at least `bound`.
+
+    The shared table is rebuilt, at least doubling, only when a larger
+    bound than ever before is requested.
+
+    Args:
+        bound: Largest n that must be covered
+
+    Returns:
+        ArithmeticTables with .bound >= bound
+    """
+    global _TABLES
+    with _TABLES_LOCK:
+        if _TABLES is None or _TABLES.bound < bound:
+            current = _TABLES.bound if _TABLES is not None else 0
+            _TABLES = ArithmeticTables(max(bound, 2 * current))
+        return _TABLES
+
+
+# ============================================================================
+# Squarefree Products of Known Primes
+# ============================================================================
+
+def factor_over(n: int, primes: Sequence[int]) -> Optional[Dict[int, int]]:
+    """
+    Factor n using only the given primes.
+
+    Args:
+        n: Positive integer
+        primes: Candidate prime factors (e.g. the first k primes)
+
+    Returns:
+        {prime: exponent}, or None if n has a prime factor not in primes
+    """
+    n = int(n)
+    if n < 1:
+        raise ValueError(f"n must be positive, got {n}")
+    factors = {}
+    for p in primes:
+        p = int(p)
+        while n % p == 0:
+            n //= p
+            factors[p] = factors.get(p, 0) + 1
+        if n == 1:
+            return factors
+    return factors if n == 1 else None
+
+
+def phi_squarefree(primes: Sequence[int]) -> int:
+    """φ(∏primes) = ∏(p - 1) for distinct primes."""
+    result = 1
+    for p in primes:
+        result *= int(p) - 1
+    return result
+
+
+def mobius_squarefree(primes: Sequence[int]) -> int:
+    """μ(∏primes) = (-1)^len(primes) for distinct primes."""
+    return -1 if len(primes) % 2 else 1
@@ -0,0 +1,276 @@
+"""
+Besov Regularity Engine for Prime Wave Theory (PWT)
+
+Moduli of continuity ω_r(P_k, h)_p = ||Δ_h^r P_k||_{L^p} and the Besov
+seminorm proxy sup_h h^{-s} ω_r(P_k, h)_p (Conjecture 6.1). P_k is sampled
+once on a periodic grid over [0, N_k). The shifted differences for every h,
+every order r and every exponent p then come from those samples:
+
+    'spectral'  Δ_h^r has Fourier multiplier (e^{iωh} - 1)^r, applied to
+                one real FFT of the samples. P_k is a trigonometric
+                polynomial with frequencies below B = Σ (p - 1)/p cycles
+                per unit, so the shift is exact once the grid samples more
+                than 2B points per unit length.
+    'grid'      h is rounded to a whole number of grid steps and the
+                samples are rolled; no new evaluations at all.
+    'crt'       Exact for even integer p on any grid, with no grid at all.
+                Ψ_p has period p, so writing x = n + u and splitting n by
+                the Chinese remainder theorem turns the mean of
+                (Δ_h^r P_k)^p over a period into a u-integral of a product
+                over primes of means over a ∈ Z/p (see _crt_norms). The
+                integrand is a trig polynomial of degree < k·p in u, so
+                k·p + 1 points in u are exact and the cost is O(Σ p_i)
+                per point, independent of N_k.
+    'direct'    P_k is re-evaluated at x + jh, one h at a time; exact at
+                every grid point, for exponents 'crt' cannot take on grids
+                too coarse for 'spectral'.
+
+All (r, h, p) norms come back as one array, and seminorms for a whole grid
+of s values are read off it without further evaluation.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import math
+
+import numpy as np
+from typing import Sequence
+
+from pwt_profile import profiled
+from pwt_wave import P_k_values, parallel_P_k, psi_p
+
+
+# Shifts used by the original proxy: [0.001, ..., 0.316]
+DEFAULT_H_VALUES = np.logspace(-3, -0.5, 20)
+
+# Cap on the default grid; 4x Nyquist over a whole period grows like
+# N_k Σ(p-1)/p (about 2·10^7 points at k = 7, 5·10^8 at k = 8)
+DEFAULT_MAX_SAMPLES = 1 << 16
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+def max_frequency(primes: Sequence[int]) -> float:
+    """Bandwidth B = Σ (p - 1)/p of P_k, in cycles per unit x."""
+    return sum((int(p) - 1) / int(p) for p in primes)
+
+
+def default_n_samples(primes: Sequence[int],
+                      max_samples: int = DEFAULT_MAX_SAMPLES) -> int:
+    """
+    Grid size for a period of P_k: 4x the Nyquist rate, capped.
+
+    Below the cap 'auto' uses the exact spectral shift. Above it the grid
+    is coarser than Nyquist and 'auto' switches to 'crt', which is exact
+    for even integer p and never touches the grid; other exponents fall
+    back to 'direct', whose L^p norms are Riemann sums over max_samples
+    points.
+    """
+    period = math.prod(int(p) for p in primes)
+    return min(int(math.ceil(8 * max_frequency(primes) * period)),
+               max_samples)
+
+
+def _evaluate(x: np.ndarray, primes: Sequence[int],
+              workers: int) -> np.ndarray:
+    """P_k at x, in-process or across worker processes."""
+    if workers > 1:
+        values, _ = parallel_P_k(x, primes, workers=workers)
+        return values
+    return P_k_values(x, primes)
+
+
+def sample_period(primes: Sequence[int], n_samples: int,
+                  workers: int = 1) -> np.ndarray:
+    """
+    P_k on the periodic grid x_i = i N_k / n_samples, i < n_samples.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        n_samples: Number of grid points over one period
+        workers: Processes used to evaluate P_k (1 = in-process)
+
+    Returns:
+        float64 array of samples
+    """
+    period = math.prod(int(p) for p in primes)
+    x = np.arange(n_samples, dtype=np.float64) * (period / n_samples)
+    return _evaluate(x, primes, workers)
+
+
+# ============================================================================
+# Moduli of Continuity
+# ============================================================================
+
+def _lp_norms(diff: np.ndarray, p_values: np.ndarray) -> np.ndarray:
+    """Normalized L^p norms (mean(|d|^p))^(1/p) for every p."""
+    mag = np.abs(diff)
+    return np.array([np.mean(mag ** p) ** (1 / p) for p in p_values])
+
+
+def _even_exponents(p_values: np.ndarray) -> bool:
+    """True when every p is an even integer, the exponents 'crt' handles."""
+    return bool(np.all((p_values > 0) & (p_values % 2 == 0)))
+
+
+def _crt_norms(primes: Sequence[int], h: float, orders: Sequence[int],
+               p_values: np.ndarray) -> np.ndarray:
+    """
+    Exact (mean |Δ_h^r P_k|^p)^(1/p) over a period for even integer p.
+
+    By the Leibniz rule Δ^m(F f)(x) = Σ_s C(m, s) Δ^s F(x) Δ^{m-s} f(x + sh),
+    the vector (Δ^m P_k(x))_{m ≤ r} is e_0 M_1 ... M_k with upper-triangular
+    M_i[s, m] = C(m, s) Δ^{m-s} Ψ_{p_i}(x + sh). With x = n + u and
+    a_i = n mod p_i, M_i depends on n only through a_i, and by CRT the a_i
+    are independent over a period, so the mean of the q-fold tensor power
+    of that product is the product of per-prime means over a_i. Only
+    per-prime differences are formed, so small h loses no precision.
+
+    Returns:
+        Array of shape (len(orders), len(p_values))
+    """
+    size = max(orders) + 1
+    shifts = np.arange(size) * h
+    letters = 'ijklmnopqrst'
+    norms = np.empty((len(orders), len(p_values)))
+    for e, p_exp in enumerate(p_values):
+        q = int(p_exp)
+        if q > len(letters):
+            raise ValueError(f"method 'crt' supports p <= {len(letters)}")
+        n_u = len(primes) * q + 1
+        u = np.arange(n_u) / n_u
+        # Row vector e_0^{⊗q} for every u, axes (u, m_1, ..., m_q)
+        state = np.zeros((n_u,) + (size,) * q)
+        state[(slice(None),) + (0,) * q] = 1.0
+        for prime in primes:
+            prime = int(prime)
+            a = np.arange(prime, dtype=np.float64)
+            psi = psi_p(a[None, :, None] + u + shifts[:, None, None], prime)
+            matrix = np.zeros((prime, n_u, size, size))
+            for s in range(size):
+                for m in range(s, size):
+                    d = m - s
+                    diff = sum((-1) ** (d - t) * math.comb(d, t) * psi[s + t]
+                               for t in range(d + 1))
+                    matrix[:, :, s, m] = math.comb(m, s) * diff
+            # state ⊗ M^{⊗q}, one tensor axis at a time, then mean over a
+            axes = letters[:q]
+            work = np.broadcast_to(state, (prime,) + state.shape)
+            for j in range(q):
+                out = axes[:j] + 'z' + axes[j + 1:]
+                work = np.einsum(f'au{axes},au{axes[j]}z->au{out}',
+                                 work, matrix)
+            state = work.mean(axis=0)
+        for i, r in enumerate(orders):
+            moment = state[(slice(None),) + (r,) * q].mean()
+            norms[i, e] = max(moment, 0.0) ** (1 / p_exp)
+    return norms
+
+
+@profiled('besov')
+def modulus_of_continuity(primes: Sequence[int], n_samples: int,
+                          h_values: Sequence[float] = DEFAULT_H_VALUES,
+                          orders: Sequence[int] = (1,),
+                          p_values: Sequence[float] = (2.0,),
+                          method: str = 'auto', workers: int = 1) -> dict:
+    """
+    ||Δ_h^r P_k||_{L^p} for every order r, shift h and exponent p.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        n_samples: Grid points over one period N_k
+        h_values: Shifts h
+        orders: Difference orders r
+        p_values: Lebesgue exponents p
+        method: 'spectral', 'grid', 'crt', 'direct', or 'auto' (spectral
+            when the grid is above the Nyquist rate of P_k, else crt when
+            every p is an even integer, else direct)
+        workers: Processes used to evaluate P_k (1 = in-process)
+
+    Returns:
+        Dictionary with 'norms' of shape (len(orders), len(h), len(p)),
+        the effective 'h_values' (rounded to grid steps for 'grid') and
+        the method used
+    """
+    period = math.prod(int(p) for p in primes)
+    spacing = period / n_samples
+    h_values = np.asarray(h_values, dtype=np.float64)
+    p_values = np.asarray(p_values, dtype=np.float64)
+    orders = [int(r) for r in orders]
+    if method == 'auto':
+        nyquist = 1.0 / spacing > 2 * max_frequency(primes)
+        if nyquist:
+            method = 'spectral'
+        else:
+            method = 'crt' if _even_exponents(p_values) else 'direct'
+
+    norms = np.empty((len(orders), len(h_values), len(p_values)))
+    if method == 'crt':
+        if not _even_exponents(p_values):
+            raise ValueError("method 'crt' needs even integer p")
+        for j, h in enumerate(h_values):
+            norms[:, j] = _crt_norms(primes, h, orders, p_values)
+        return {'norms': norms, 'h_values': h_values, 'method': method}
+
+    samples = sample_period(primes, n_samples, workers)
+    if method == 'spectral':
+        spectrum = np.fft.rfft(samples)
+        omega = 2 * np.pi * np.fft.rfftfreq(n_samples, d=spacing)
+        for j, h in enumerate(h_values):
+            step = np.exp(1j * omega * h) - 1
+            for i, r in enumerate(orders):
+                diff = np.fft.irfft(spectrum * step ** r, n=n_samples)
+                norms[i, j] = _lp_norms(diff, p_values)
+
+    elif method == 'grid':
+        steps = np.maximum(np.rint(h_values / spacing), 1).astype(np.int64)
+        h_values = steps * spacing
+        for j, step in enumerate(steps.tolist()):
+            for i, r in enumerate(orders):
+                diff = np.zeros(n_samples)
+                for t in range(r + 1):
+                    coef = (-1) ** (r - t) * math.comb(r, t)
+                    diff += coef * np.roll(samples, -t * step)
+                norms[i, j] = _lp_norms(diff, p_values)
+
+    elif method == 'direct':
+        x = np.arange(n_samples, dtype=np.float64) * spacing
+        for j, h in enumerate(h_values):
+            # f(x + t h) for t = 1..max order, reused by every order
+            values = [samples]
+            for t in range(1, max(orders) + 1):
+                values.append(_evaluate((x + t * h) % period, primes, workers))
+            for i, r in enumerate(orders):
+                diff = np.zeros(n_samples)
+                for t in range(r + 1):
+                    diff += (-1) ** (r - t) * math.comb(r, t) * values[t]
+                norms[i, j] = _lp_norms(diff, p_values)
+
+    else:
+        raise ValueError(f"Unknown method '{method}'")
+
+    return {'norms': norms, 'h_values': h_values, 'method': method}
+
+
+def besov_seminorms(norms: np.ndarray, h_values: np.ndarray,
+                    s_values: Sequence[float]) -> np.ndarray:
+    """
+    Seminorm proxy sup_h h^{-s} ω_r(h)_p for a grid of s values.
+
+    Args:
+        norms: Array (orders, h, p) from modulus_of_continuity
+        h_values: The shifts matching axis 1 of norms
+        s_values: Regularity parameters s
+
+    Returns:
+        Array of shape (orders, len(s_values), p)
+    """
+    s_values = np.asarray(s_values, dtype=np.float64)
+    weights = np.asarray(h_values)[None, :] ** -s_values[:, None]  # (s, h)
+    return np.max(weights[None, :, :, None] * norms[:, None, :, :], axis=2)
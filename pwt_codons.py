@@ -0,0 +1,482 @@
+"""
+Streaming Codon Counting for the PWT DNA Prime Analyzer
+
+Genome-scale codon statistics without Python strings. Bases are encoded
+to 2-bit codes (A=0, C=1, G=2, T/U=3) through a 256-entry lookup table,
+the codon starting at every position becomes the integer
+16·b0 + 4·b1 + b2, and codons are counted with np.bincount in all three
+reading frames at once.
+
+Files are read in fixed-size chunks, memory-mapped unless gzip-compressed.
+The last two bases of every chunk are carried into the next, so codons
+spanning a chunk boundary are counted once and in the right frame, and
+memory stays bounded by the chunk size however long the chromosome is.
+
+    * FASTA: counts per record, frame f holding the codons that start at
+      positions p ≡ f (mod 3) of the record;
+    * FASTQ (four-line records): counts pooled over all reads, frames
+      relative to the start of each read.
+
+Codons containing any symbol other than ACGTU (N, IUPAC ambiguity codes)
+go to a separate AMBIGUOUS bin. Translation is lazy: iter_protein and
+translate_head only translate the part of a sequence that is consumed.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import gzip
+import mmap
+import os
+from itertools import product
+
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pwt_profile import PROFILER, profiled
+
+
+# Bytes of file per chunk; bincount's intp copy makes the peak ~8x this
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+BASES = 'ACGT'
+N_CODONS = 64
+
+# Codon index of every codon with a non-ACGT base
+AMBIGUOUS = N_CODONS
+
+# CODONS[i] is the codon with index i
+CODONS = tuple(''.join(c) for c in product(BASES, repeat=3))
+
+# Base codes outside 0..3: other symbols, and whitespace dropped on encoding
+_INVALID = 4
+_SKIP = 255
+
+# Standard genetic code, codons in TCAG order
+_STANDARD_CODE = ('FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRR'
+                  'IIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG')
+
+
+def _tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Base encoding table (256,) and amino-acid table (65,) as uint8."""
+    encode = np.full(256, _INVALID, dtype=np.uint8)
+    for code, symbols in enumerate(('Aa', 'Cc', 'Gg', 'TtUu')):
+        for s in symbols:
+            encode[ord(s)] = code
+    for s in b' \t\r\n':
+        encode[s] = _SKIP
+
+    amino = np.full(N_CODONS + 1, ord('X'), dtype=np.uint8)
+    for aa, codon in zip(_STANDARD_CODE, product('TCAG', repeat=3)):
+        amino[CODONS.index(''.join(codon))] = ord(aa)
+    return encode, amino
+
+
+_ENCODE, _AMINO = _tables()
+
+
+# ============================================================================
+# Encoding and Translation
+# ============================================================================
+
+def encode(data) -> np.ndarray:
+    """
+    2-bit base codes of raw sequence text.
+
+    Args:
+        data: str, bytes, memoryview or uint8 array; whitespace and line
+            breaks are dropped, symbols other than ACGTU become code 4
+
+    Returns:
+        uint8 array of codes 0..4
+    """
+    if isinstance(data, str):
+        data = data.encode('ascii', 'replace')
+    raw = data if isinstance(data, np.ndarray) else \
+        np.frombuffer(data, dtype=np.uint8)
+    codes = _ENCODE[raw]
+    if codes.size and codes.max() == _SKIP:
+        codes = codes[codes != _SKIP]
+    return codes
+
+
+def codon_indices(codes: np.ndarray) -> np.ndarray:
+    """
+    Index of the codon starting at every position 0..len(codes) - 3.
+
+    Returns:
+        uint8 array of length max(len(codes) - 2, 0); AMBIGUOUS where a base
+        is not ACGT
+    """
+    if len(codes) < 3:
+        return np.empty(0, dtype=np.uint8)
+    first, second, third = codes[:-2], codes[1:-1], codes[2:]
+    idx = (first << 4) | (second << 2) | third
+    # Valid codes are <= 3, so any invalid base sets bit 2 of the OR
+    idx[(first | second | third) >= _INVALID] = AMBIGUOUS
+    return idx
+
+
+def _text(seq):
+    """Raw text of a str, bytes or Bio.Seq-like sequence."""
+    return seq if isinstance(seq, (str, bytes, bytearray)) else str(seq)
+
+
+def translate(codes: np.ndarray) -> str:
+    """
+    Protein of base codes read from position 0 (standard code, '*' for
+    stops, 'X' for ambiguous codons); trailing partial codons are ignored.
+    """
+    return _AMINO[codon_indices(codes)[::3]].tobytes().decode('ascii')
+
+
+def translate_head(seq, n_residues: int, frame: int = 0) -> str:
+    """
+    The first n_residues amino acids of an in-memory sequence (str,
+    Bio.Seq or bytes), translating only the bases they need.
+    """
+    return translate(encode(_text(seq[frame:frame + 3 * n_residues])))
+
+
+# ============================================================================
+# Counting
+# ============================================================================
+
+class CodonCounts:
+    """
+    Codon counts in all three reading frames, built chunk by chunk.
+
+    Args:
+        name: Record name
+
+    Attributes:
+        counts: int64 array (3, 65); counts[f, i] is the number of codons
+            CODONS[i] in frame f, counts[f, AMBIGUOUS] those with a non-ACGT
+            base
+        length: Number of bases seen
+        records: Number of records (sequences or reads) seen
+    """
+
+    def __init__(self, name: str = ''):
+        self.name = name
+        self.counts = np.zeros((3, N_CODONS + 1), dtype=np.int64)
+        self.length = 0
+        self.records = 0
+        self._pos = 0
+        self._tail = np.empty(0, dtype=np.uint8)
+
+    def __repr__(self) -> str:
+        return (f"CodonCounts({self.name!r}, length={self.length}, "
+                f"records={self.records})")
+
+    def new_record(self):
+        """Start a new sequence: frames restart at its first base."""
+        self.records += 1
+        self._pos = 0
+        self._tail = self._tail[:0]
+
+    def update(self, codes: np.ndarray):
+        """
+        Count the codons completed by the next chunk of base codes.
+
+        Args:
+            codes: uint8 codes from encode, continuing the current record
+        """
+        if not len(codes):
+            return
+        if not self.records:
+            self.records = 1
+        buf = np.concatenate((self._tail, codes)) if len(self._tail) \
+            else codes
+        start = self._pos - len(self._tail)
+        idx = codon_indices(buf)
+        for f in range(3):
+            self.counts[f] += np.bincount(idx[(f - start) % 3::3],
+                                          minlength=N_CODONS + 1)
+        self._pos += len(codes)
+        self.length += len(codes)
+        self._tail = buf[-2:].copy()
+        PROFILER.count('bases_counted', len(codes))
+
+    def update_reads(self, codes: np.ndarray, lengths: np.ndarray):
+        """
+        Count many short, complete reads at once.
+
+        Args:
+            codes: Base codes of the reads, concatenated
+            lengths: Length of every read (summing to len(codes))
+        """
+        lengths = np.asarray(lengths, dtype=np.int64)
+        if not len(lengths):
+            return
+        ends = np.cumsum(lengths)
+        starts = ends - lengths
+        n = len(codes)
+
+        # Frame of each position relative to its read: (j - start) mod 3
+        phase = np.resize(np.arange(3, dtype=np.uint8), n)
+        phase += np.repeat((3 - starts % 3).astype(np.uint8), lengths)
+        phase %= 3
+
+        # Codon starts within two bases of a read end cross into the next
+        keys = codon_indices(codes)
+        keys += phase[:len(keys)] * np.uint8(N_CODONS + 1)
+        crossing = np.concatenate((ends - 1, ends - 2))
+        crossing = crossing[(crossing >= np.concatenate((starts, starts))) &
+                            (crossing < len(keys))]
+        valid = np.ones(len(keys), dtype=bool)
+        valid[crossing] = False
+
+        self.counts += np.bincount(keys[valid], minlength=3 * (N_CODONS + 1)
+                                   ).reshape(3, N_CODONS + 1)
+        self.length += n
+        self.records += len(lengths)
+        PROFILER.count('bases_counted', n)
+
+    def merge(self, other: 'CodonCounts') -> 'CodonCounts':
+        """Add the counts of other (e.g. to pool several records)."""
+        self.counts += other.counts
+        self.length += other.length
+        self.records += other.records
+        return self
+
+    def total(self, frame: int = 0) -> int:
+        """Number of complete codons in frame, ambiguous ones included."""
+        return int(self.counts[frame].sum())
+
+    def codons(self, frame: int = 0) -> Dict[str, int]:
+        """{codon: count} for the ACGT codons seen in frame."""
+        row = self.counts[frame, :N_CODONS]
+        return {CODONS[i]: int(row[i]) for i in np.flatnonzero(row)}
+
+    def amino_acids(self, frame: int = 0) -> Dict[str, int]:
+        """{amino acid: count} in frame, from the codon counts alone."""
+        totals = np.bincount(_AMINO, weights=self.counts[frame],
+                             minlength=256)
+        return {chr(a): int(totals[a]) for a in np.flatnonzero(totals)}
+
+
+def count_sequence(seq, name: str = '') -> CodonCounts:
+    """Codon counts of an in-memory sequence (str, Bio.Seq or bytes)."""
+    counts = CodonCounts(name)
+    counts.new_record()
+    counts.update(encode(_text(seq)))
+    return counts
+
+
+# ============================================================================
+# File Reading
+# ============================================================================
+
+def _is_gzip(path: str) -> bool:
+    with open(path, 'rb') as f:
+        return f.read(2) == b'\x1f\x8b'
+
+
+def iter_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+                ) -> Iterator[bytes]:
+    """
+    Raw file contents in chunk_size pieces.
+
+    Plain files are memory-mapped and read sequentially through the page
+    cache; gzip files are decompressed chunk by chunk.
+    """
+    if _is_gzip(path):
+        with gzip.open(path, 'rb') as f:
+            while True:
+                block = f.read(chunk_size)
+                if not block:
+                    return
+                yield block
+
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, 'madvise'):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            released = 0
+            for start in range(0, size, chunk_size):
+                yield mm[start:start + chunk_size]
+                # Unmap the whole pages consumed so far, so the mapping stays
+                # one chunk deep; madvise needs page-aligned ranges
+                done = min(start + chunk_size, size)
+                done -= done % mmap.PAGESIZE
+                if hasattr(mm, 'madvise') and done > released:
+                    mm.madvise(mmap.MADV_DONTNEED, released, done - released)
+                    released = done
+
+
+def sequence_format(path: str) -> str:
+    """'fasta' or 'fastq', from the first non-blank byte of the file."""
+    for block in iter_chunks(path, 1 << 12):
+        text = block.lstrip()
+        if text:
+            if text[:1] == b'>':
+                return 'fasta'
+            if text[:1] == b'@':
+                return 'fastq'
+            break
+    raise ValueError(f"{path} is neither FASTA nor FASTQ")
+
+
+def iter_fasta(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+               ) -> Iterator[Tuple[Optional[str], np.ndarray]]:
+    """
+    Base codes of every FASTA record, chunk by chunk.
+
+    Yields:
+        (name, codes): name is the record's first header word on the first
+        chunk of each record (with empty codes) and None on the sequence
+        chunks that follow
+    """
+    header = None
+    started = False
+    for block in iter_chunks(path, chunk_size):
+        view = memoryview(block)
+        pos, n = 0, len(block)
+        while pos < n:
+            if header is not None:
+                nl = block.find(b'\n', pos)
+                header += block[pos:n if nl < 0 else nl]
+                if nl < 0:
+                    break
+                words = header.decode('ascii', 'replace').split()
+                yield (words[0] if words else ''), encode(b'')
+                header, pos, started = None, nl + 1, True
+            else:
+                gt = block.find(b'>', pos)
+                end = n if gt < 0 else gt
+                codes = encode(view[pos:end])
+                if len(codes):
+                    if not started:
+                        raise ValueError(f"{path}: sequence before the first "
+                                         f"FASTA header")
+                    yield None, codes
+                if gt < 0:
+                    break
+                header, pos = b'', gt + 1
+
+
+def _fastq_reads(buf: bytes) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Sequence codes and read lengths of the complete records in buf.
+
+    Returns:
+        (codes, lengths, consumed bytes)
+    """
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    newlines = np.flatnonzero(raw == ord('\n'))
+    n_reads = len(newlines) // 4
+    if not n_reads:
+        return np.empty(0, dtype=np.uint8), np.empty(0, dtype=np.int64), 0
+    lines = newlines[:4 * n_reads].reshape(n_reads, 4)
+    heads = np.concatenate(([0], lines[:-1, 3] + 1))
+    if (raw[heads] != ord('@')).any() or (raw[lines[:, 1] + 1] != ord('+')
+                                          ).any():
+        raise ValueError("Malformed FASTQ: expected four-line records")
+
+    starts = lines[:, 0] + 1
+    ends = lines[:, 1] - (raw[lines[:, 1] - 1] == ord('\r'))
+    ends = np.maximum(ends, starts)
+    lengths = ends - starts
+
+    # Mark the sequence lines and gather them in one pass
+    marks = np.zeros(len(raw) + 1, dtype=np.int8)
+    marks[starts] += 1
+    marks[ends] -= 1
+    inside = np.cumsum(marks[:-1], dtype=np.int8).view(bool)
+    codes = _ENCODE[raw[inside]]
+    codes[codes == _SKIP] = _INVALID
+    return codes, lengths, int(lines[-1, 3]) + 1
+
+
+def iter_fastq(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE
+               ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Reads of a four-line FASTQ file, a chunk of complete records at a time.
+
+    Yields:
+        (codes, lengths): the reads' base codes concatenated, and their
+        lengths
+    """
+    carry = b''
+    for block in iter_chunks(path, chunk_size):
+        buf = carry + block if carry else block
+        codes, lengths, used = _fastq_reads(buf)
+        carry = buf[used:]
+        if len(lengths):
+            yield codes, lengths
+    if carry.strip():
+        codes, lengths, used = _fastq_reads(carry.rstrip(b'\r\n') + b'\n')
+        if not len(lengths):
+            raise ValueError(f"{path}: truncated FASTQ record at the end")
+        yield codes, lengths
+
+
+@profiled('codon_count')
+def count_codons(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 per_record: bool = True) -> List[CodonCounts]:
+    """
+    Codon counts of a FASTA or FASTQ file (plain or gzip) in constant
+    memory.
+
+    Args:
+        path: Sequence file
+        chunk_size: Bytes read per chunk
+        per_record: FASTA only: one CodonCounts per record; otherwise all
+            records are pooled (frames still restart at every record)
+
+    Returns:
+        List of CodonCounts; a single pooled entry for FASTQ or when
+        per_record is False
+    """
+    if sequence_format(path) == 'fastq':
+        counts = CodonCounts(os.path.basename(path))
+        for codes, lengths in iter_fastq(path, chunk_size):
+            counts.update_reads(codes, lengths)
+        return [counts]
+
+    results = []
+    pooled = CodonCounts(os.path.basename(path))
+    current = pooled
+    for name, codes in iter_fasta(path, chunk_size):
+        if name is not None:
+            if per_record:
+                current = CodonCounts(name)
+                results.append(current)
+            current.new_record()
+        current.update(codes)
+    return results if per_record else [pooled]
+
+
+def iter_protein(path: str, frame: int = 0,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE
+                 ) -> Iterator[Tuple[str, str]]:
+    """
+    Lazy translation of every FASTA record in one frame.
+
+    Only as much of the file is read as the consumer takes, e.g.
+    itertools.islice for the first residues of a chromosome.
+
+    Yields:
+        (record name, protein fragment)
+    """
+    name = None
+    rest = np.empty(0, dtype=np.uint8)
+    skip = 0
+    for header, codes in iter_fasta(path, chunk_size):
+        if header is not None:
+            name, rest, skip = header, rest[:0], frame
+            continue
+        if skip:
+            codes, skip = codes[skip:], max(skip - len(codes), 0)
+        buf = np.concatenate((rest, codes)) if len(rest) else codes
+        whole = len(buf) - len(buf) % 3
+        if whole:
+            yield name, translate(buf[:whole])
+        rest = buf[whole:].copy()
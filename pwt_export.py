@@ -0,0 +1,460 @@
+"""
+Result Export Layer for Prime Wave Theory (PWT)
+
+Writes wave samples, Fourier spectra and verification statistics to files
+that downstream analysis can open without recomputing anything:
+
+    * .npy     - one array (a record array when there are several columns),
+                 written through np.lib.format.open_memmap chunk by chunk
+                 and reopened with np.load(..., mmap_mode='r');
+    * .npz     - a bundle of small arrays (not memory-mappable);
+    * .parquet - Apache Parquet, one row group per chunk (needs pyarrow);
+    * .arrow   - Arrow IPC file, one record batch per chunk, reopened
+                 zero-copy through a memory map (needs pyarrow);
+    * .jsonl   - JSON lines, one record per line.
+
+Tables are passed around as iterables of chunks, each a dict of equally
+long 1-D column arrays, so a spectrum with far more modes than fit in RAM
+streams from the divisor-class table (pwt_spectrum.SpectrumView) to disk
+with memory bounded by one chunk. write_tables tees one pass over a chunk
+source into several files, so writing more formats costs no extra
+evaluation.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+    pyarrow >= 7.0 (only for .parquet and .arrow)
+"""
+
+import json
+import os
+from contextlib import ExitStack
+
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from pwt_spectrum import SpectrumView
+from pwt_wave import DEFAULT_CHUNK_SIZE, P_k_values, linspace_blocks
+
+
+FORMATS = ('npy', 'npz', 'parquet', 'arrow', 'jsonl')
+
+
+def _format_of(filename: str, fmt: str = None) -> str:
+    """Explicit fmt, or the one implied by the file extension."""
+    fmt = (fmt or os.path.splitext(filename)[1].lstrip('.')).lower()
+    fmt = {'feather': 'arrow', 'ipc': 'arrow', 'ndjson': 'jsonl'}.get(fmt,
+                                                                     fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}' (expected one of "
+                         f"{', '.join(FORMATS)})")
+    return fmt
+
+
+def _pyarrow():
+    """Import pyarrow, which only the Parquet and Arrow writers need."""
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as exc:
+        raise ImportError("Parquet and Arrow export require pyarrow "
+                          "(pip install pyarrow)") from exc
+    return pyarrow
+
+
+def _json_default(value):
+    """JSON encoding of NumPy scalars and arrays."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# ============================================================================
+# Chunk Sources
+# ============================================================================
+
+def wave_chunks(primes: Sequence[int], start: float, stop: float, num: int,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                dtype=np.float64) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    P_k on np.linspace(start, stop, num) as {'x', 'P_k'} chunks.
+
+    The 'P_k' array is a reused buffer, valid until the next chunk.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        start, stop: Interval end points
+        num: Total number of samples
+        chunk_size: Samples per chunk
+        dtype: float64 or float32 for the P_k column
+    """
+    buf = np.empty(min(chunk_size, max(num, 1)), dtype=dtype)
+    for x in linspace_blocks(start, stop, num, chunk_size):
+        yield {'x': x, 'P_k': P_k_values(x, primes, out=buf[:len(x)])}
+
+
+def spectrum_chunks(view: SpectrumView, start: int = 0, stop: int = None,
+                    block_size: int = 1 << 20, include_modes: bool = True,
+                    dtype=np.float64) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Fourier coefficients c_m for start <= m < stop as {'m', 'c_m'} chunks.
+
+    Args:
+        view: SpectrumView of P_k
+        start: First mode
+        stop: End mode, exclusive (default N_k)
+        block_size: Modes per chunk
+        include_modes: Emit the 'm' column (redundant for start = 0 arrays,
+            where the index is the mode)
+        dtype: float64 or float32 for the c_m column
+    """
+    for modes, coeffs in view.iter_blocks(start, stop, block_size):
+        chunk = {'m': modes} if include_modes else {}
+        chunk['c_m'] = coeffs.astype(dtype, copy=False)
+        yield chunk
+
+
+# ============================================================================
+# Writers
+# ============================================================================
+
+class TableWriter:
+    """
+    Incremental writer for one chunked table: write() each chunk, then
+    close() to finish the file.
+
+    Writers take chunks pushed from outside, so one pass over a chunk
+    source can feed several files at once (see write_tables). Used as a
+    context manager, an unfinished file is released on error.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.rows = 0
+
+    def write(self, chunk: Dict[str, np.ndarray]):
+        raise NotImplementedError
+
+    def close(self) -> int:
+        """Finish the file and return the number of rows written."""
+        self._release()
+        return self.rows
+
+    def _release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._release()
+
+
+class _NpyWriter(TableWriter):
+    """Fill an open_memmap'd .npy file chunk by chunk."""
+
+    def __init__(self, filename: str, total: int):
+        super().__init__(filename)
+        self.total = total
+        self.out = None
+
+    def write(self, chunk):
+        if self.out is None:
+            self.names = list(chunk)
+            if len(self.names) == 1:
+                dtype = np.asarray(chunk[self.names[0]]).dtype
+            else:
+                dtype = np.dtype([(n, np.asarray(chunk[n]).dtype)
+                                  for n in self.names])
+            self.out = np.lib.format.open_memmap(
+                self.filename, mode='w+', dtype=dtype, shape=(self.total,))
+        rows = self.rows
+        n = len(next(iter(chunk.values())))
+        if rows + n > self.total:
+            raise ValueError(f"More than total={self.total} rows supplied")
+        if len(self.names) == 1:
+            self.out[rows:rows + n] = chunk[self.names[0]]
+        else:
+            for name in self.names:
+                self.out[name][rows:rows + n] = chunk[name]
+        self.rows += n
+
+    def close(self) -> int:
+        if self.out is None:
+            raise ValueError("No chunks to write")
+        if self.rows != self.total:
+            raise ValueError(f"Expected {self.total} rows, got {self.rows}")
+        self.out.flush()
+        return super().close()
+
+    def _release(self):
+        self.out = None
+
+
+class _ArrowWriter(TableWriter):
+    """Stream chunks into a Parquet file or an Arrow IPC file."""
+
+    def __init__(self, filename: str, fmt: str):
+        super().__init__(filename)
+        self.pa = _pyarrow()
+        self.fmt = fmt
+        self.writer = None
+
+    def write(self, chunk):
+        pa = self.pa
+        batch = pa.record_batch([pa.array(np.asarray(v)) for v in
+                                 chunk.values()], names=list(chunk))
+        if self.writer is None:
+            if self.fmt == 'parquet':
+                self.writer = pa.parquet.ParquetWriter(self.filename,
+                                                       batch.schema)
+            else:
+                self.writer = pa.ipc.new_file(self.filename, batch.schema)
+        if self.fmt == 'parquet':
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+        self.rows += batch.num_rows
+
+    def _release(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+class _JsonlWriter(TableWriter):
+    """One JSON object per row."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self.f = open(filename, 'w')
+
+    def write(self, chunk):
+        names = list(chunk)
+        for row in zip(*(np.asarray(chunk[n]).tolist() for n in names)):
+            self.f.write(json.dumps(dict(zip(names, row))) + '\n')
+            self.rows += 1
+
+    def _release(self):
+        self.f.close()
+
+
+class _NpzWriter(TableWriter):
+    """npz holds whole arrays, so the chunks are joined in memory."""
+
+    def __init__(self, filename: str):
+        super().__init__(filename)
+        self.columns = {}
+
+    def write(self, chunk):
+        for name, values in chunk.items():
+            self.columns.setdefault(name, []).append(np.array(values))
+
+    def close(self) -> int:
+        arrays = {name: np.concatenate(parts)
+                  for name, parts in self.columns.items()}
+        np.savez(self.filename, **arrays)
+        self.rows = len(next(iter(arrays.values()))) if arrays else 0
+        return super().close()
+
+    def _release(self):
+        self.columns = {}
+
+
+def open_writer(filename: str, total: int = None,
+                fmt: str = None) -> TableWriter:
+    """
+    Incremental writer for the format given by fmt or the extension.
+
+    Args:
+        filename: Output file
+        total: Total number of rows; required for .npy, whose header and
+            file size are fixed before the first chunk is written
+        fmt: One of FORMATS (default: from the extension)
+
+    Returns:
+        TableWriter accepting {column: 1-D array} chunks
+    """
+    fmt = _format_of(filename, fmt)
+    if fmt == 'npy':
+        if total is None:
+            raise ValueError(".npy export needs the total row count")
+        return _NpyWriter(filename, total)
+    if fmt in ('parquet', 'arrow'):
+        return _ArrowWriter(filename, fmt)
+    if fmt == 'jsonl':
+        return _JsonlWriter(filename)
+    return _NpzWriter(filename)
+
+
+def write_table(filename: str, chunks: Iterable[Dict[str, np.ndarray]],
+                total: int = None, fmt: str = None) -> int:
+    """
+    Write a chunked table in the format given by fmt or the extension.
+
+    Args:
+        filename: Output file
+        chunks: Iterable of {column: 1-D array} dicts with equal lengths
+        total: Total number of rows; required for .npy, whose header and
+            file size are fixed before the first chunk is written
+        fmt: One of FORMATS (default: from the extension)
+
+    Returns:
+        Number of rows written
+    """
+    with open_writer(filename, total, fmt) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        return writer.close()
+
+
+def write_tables(chunks: Iterable[Dict[str, np.ndarray]],
+                 writers: Sequence[Tuple[TableWriter, Sequence[str]]]
+                 ) -> List[int]:
+    """
+    Feed one pass over chunks to several writers.
+
+    Each chunk is handed to every writer before the next one is produced,
+    so sources that reuse their buffers (wave_chunks) are safe and the
+    source is evaluated once however many files are written.
+
+    Args:
+        chunks: Iterable of {column: 1-D array} dicts
+        writers: (writer, columns) pairs; columns selects the chunk
+            columns that writer receives (None for all)
+
+    Returns:
+        Rows written by each writer
+    """
+    with ExitStack() as stack:
+        for writer, _ in writers:
+            stack.enter_context(writer)
+        for chunk in chunks:
+            for writer, names in writers:
+                writer.write(chunk if names is None
+                             else {n: chunk[n] for n in names})
+        return [writer.close() for writer, _ in writers]
+
+
+def write_records(filename: str, records: Sequence[dict], fmt: str = None,
+                  append: bool = False) -> int:
+    """
+    Write result dictionaries (e.g. verify_zero_set output), one row each.
+
+    Values that do not fit a fixed-width column (such as N_k beyond 2^63)
+    are stored as strings in .npz, Parquet and Arrow; JSON lines keep them
+    exact.
+
+    Args:
+        filename: Output file
+        records: Dictionaries sharing the same keys
+        fmt: One of FORMATS except npy (default: from the extension)
+        append: Append to an existing JSON lines file
+
+    Returns:
+        Number of records written
+    """
+    fmt = _format_of(filename, fmt)
+    if fmt == 'jsonl':
+        with open(filename, 'a' if append else 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, default=_json_default) + '\n')
+        return len(records)
+    if fmt == 'npy':
+        raise ValueError("Records have mixed types; use npz, parquet, arrow "
+                         "or jsonl")
+
+    names = list(records[0]) if records else []
+    columns = {}
+    for name in names:
+        values = [r.get(name) for r in records]
+        try:
+            column = np.array(values)
+        except OverflowError:
+            column = None
+        if column is None or column.dtype == object:
+            column = np.array([str(v) for v in values])
+        columns[name] = column
+    return write_table(filename, [columns], total=len(records), fmt=fmt)
+
+
+# ============================================================================
+# High-Level Export and Reopening
+# ============================================================================
+
+def export_wave(filename: str, primes: Sequence[int], start: float,
+                stop: float, num: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                dtype=np.float64, fmt: str = None) -> int:
+    """
+    Stream P_k samples on np.linspace(start, stop, num) to a file.
+
+    Columns are 'x' and 'P_k'; memory stays at one chunk for every format
+    except npz.
+
+    Returns:
+        Number of samples written
+    """
+    return write_table(filename, wave_chunks(primes, start, stop, num,
+                                             chunk_size, dtype),
+                       total=num, fmt=fmt)
+
+
+def export_spectrum(filename: str, view: SpectrumView, start: int = 0,
+                    stop: int = None, block_size: int = 1 << 20,
+                    include_modes: bool = None, dtype=np.float64,
+                    fmt: str = None) -> int:
+    """
+    Stream the Fourier coefficients c_m, start <= m < stop, to a file.
+
+    For .npy starting at mode 0 only c_m is stored by default, so the array
+    index is the mode and np.load(filename, mmap_mode='r')[m] is c_m.
+
+    Args:
+        filename: Output file
+        view: SpectrumView of P_k
+        start: First mode
+        stop: End mode, exclusive (default N_k)
+        block_size: Modes per chunk
+        include_modes: Store the 'm' column (default: all but .npy from 0)
+        dtype: float64 or float32 for the c_m column
+        fmt: One of FORMATS (default: from the extension)
+
+    Returns:
+        Number of modes written
+    """
+    fmt = _format_of(filename, fmt)
+    stop = view.N_k if stop is None else min(stop, view.N_k)
+    if include_modes is None:
+        include_modes = not (fmt == 'npy' and start == 0)
+    chunks = spectrum_chunks(view, start, stop, block_size, include_modes,
+                             dtype)
+    return write_table(filename, chunks, total=max(stop - start, 0), fmt=fmt)
+
+
+def open_table(filename: str, fmt: str = None):
+    """
+    Reopen an exported table without reading it into memory where the
+    format allows.
+
+    Returns:
+        .npy: read-only np.memmap-backed array; .npz: NpzFile (lazy per
+        array); .arrow: pyarrow.Table over a memory map; .parquet:
+        pyarrow.Table read with memory_map=True; .jsonl: list of dicts
+    """
+    fmt = _format_of(filename, fmt)
+    if fmt == 'npy':
+        return np.load(filename, mmap_mode='r')
+    if fmt == 'npz':
+        return np.load(filename)
+    if fmt == 'arrow':
+        pa = _pyarrow()
+        return pa.ipc.open_file(pa.memory_map(filename, 'r')).read_all()
+    if fmt == 'parquet':
+        return _pyarrow().parquet.read_table(filename, memory_map=True)
+    with open(filename) as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,292 @@
+"""
+Shared Factorization Service for Prime Wave Theory (PWT)
+
+One integer factorization path for every script in the repository, used in
+place of sympy.factorint:
+
+    * n within the smallest-prime-factor table (pwt_arith) is factored by
+      walking the spf chain, with no division search at all;
+    * larger n get trial division by small primes, then Miller-Rabin and
+      Brent's Pollard-rho on the cofactors, under an optional per-call time
+      budget;
+    * complete results for large n are kept in a bounded LRU cache;
+    * factor_batch factors a whole array, peeling smallest prime factors off
+      every small entry at once.
+
+Results use sympy's {prime: exponent} format. When the time budget runs
+out, the unfactored composite cofactor is returned as a key, as sympy does
+with its `limit` argument.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import math
+import operator
+import random
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+from pwt_arith import arithmetic_tables
+from pwt_profile import PROFILER
+
+
+# Largest n factored through the smallest-prime-factor table
+SPF_BOUND = 1 << 20
+
+# Trial-division primes tried before Pollard-rho
+_SMALL_PRIMES = [p for p in range(2, 1000)
+                 if all(p % q for q in range(2, int(p ** 0.5) + 1))]
+
+# Miller-Rabin witnesses, deterministic for n < 3.3 * 10^24
+_MR_BASES = _SMALL_PRIMES[:13]
+
+
+# ============================================================================
+# Primality
+# ============================================================================
+
+def isprime(n: int) -> bool:
+    """
+    Primality test: spf table for small n, Miller-Rabin beyond.
+
+    Deterministic for n < 3.3 * 10^24; a strong probable-prime test above.
+    """
+    n = int(n)
+    if n < 2:
+        return False
+    if n <= SPF_BOUND:
+        return int(arithmetic_tables(SPF_BOUND).smallest_prime_factor(n)) == n
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# ============================================================================
+# Pollard-Rho
+# ============================================================================
+
+def _pollard_brent(n: int, deadline: Optional[float]) -> Optional[int]:
+    """
+    A nontrivial factor of composite n by Brent's variant of Pollard-rho.
+
+    Returns:
+        Factor of n, or None if the deadline passed first
+    """
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(n)
+    while True:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g = r = q = 1
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+            r *= 2
+            if deadline is not None and time.monotonic() > deadline:
+                return None
+        if g == n:
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+
+
+def _factor_large(n: int, time_budget: Optional[float]) -> Dict[int, int]:
+    """Trial division by small primes, then Pollard-rho on what remains."""
+    factors: Dict[int, int] = {}
+    for p in _SMALL_PRIMES:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors[p] = factors.get(p, 0) + 1
+            n //= p
+    if n == 1:
+        return factors
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    stack = [n]
+    while stack:
+        m = stack.pop()
+        if m <= SPF_BOUND:
+            for p, e in arithmetic_tables(SPF_BOUND).factorize(m).items():
+                factors[p] = factors.get(p, 0) + e
+            continue
+        if isprime(m):
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        d = _pollard_brent(m, deadline)
+        if d is None:
+            # Out of time: keep the composite, as sympy's limit= does
+            factors[m] = factors.get(m, 0) + 1
+            continue
+        stack.extend((d, m // d))
+    return factors
+
+
+# ============================================================================
+# Public Interface
+# ============================================================================
+
+class FactorCache:
+    """
+    Bounded LRU cache of complete factorizations of large integers.
+
+    Args:
+        max_entries: Number of factorizations kept before the least
+            recently used one is evicted
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, n: int) -> Optional[Dict[int, int]]:
+        with self._lock:
+            if n in self._entries:
+                self.hits += 1
+                PROFILER.count('factor_cache_hits')
+                self._entries.move_to_end(n)
+                return dict(self._entries[n])
+            self.misses += 1
+            PROFILER.count('factor_cache_misses')
+            return None
+
+    def put(self, n: int, factors: Dict[int, int]):
+        with self._lock:
+            self._entries[n] = dict(factors)
+            self._entries.move_to_end(n)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+# Shared by every caller in the process
+FACTOR_CACHE = FactorCache()
+
+
+def _as_int(n) -> int:
+    """n as an int; non-integers (including floats) raise, as in sympy."""
+    try:
+        return operator.index(n)
+    except TypeError:
+        raise ValueError(f"{n!r} is not an integer") from None
+
+
+def factorint(n: int, time_budget: Optional[float] = None) -> Dict[int, int]:
+    """
+    Prime factorization of n, in sympy.factorint's format.
+
+    Args:
+        n: Integer to factor (0 and ±1 follow sympy: {0: 1}, {}, {-1: 1})
+        time_budget: Seconds allowed for Pollard-rho (None = unbounded);
+            any composite left when it runs out is returned as a key
+
+    Returns:
+        {prime: exponent}
+
+    Raises:
+        ValueError: If n is not an integer
+    """
+    n = _as_int(n)
+    if n < 0:
+        factors = factorint(-n, time_budget)
+        factors[-1] = 1
+        return factors
+    if n == 0:
+        return {0: 1}
+    if n <= SPF_BOUND:
+        return arithmetic_tables(SPF_BOUND).factorize(n)
+
+    cached = FACTOR_CACHE.get(n)
+    if cached is not None:
+        return cached
+    # Sorted before caching so hits and misses return the same key order
+    factors = dict(sorted(_factor_large(n, time_budget).items()))
+    if all(isprime(p) for p in factors):
+        FACTOR_CACHE.put(n, factors)
+    return factors
+
+
+def factor_batch(values: Sequence[int],
+                 time_budget: Optional[float] = None) -> List[Dict[int, int]]:
+    """
+    Factor many integers in one call.
+
+    Entries within the spf table are factored together: every round
+    divides all unfinished entries by their smallest prime factor in one
+    NumPy operation. The rest go through factorint.
+
+    Args:
+        values: Integers to factor
+        time_budget: Per-value Pollard-rho budget in seconds
+
+    Returns:
+        List of {prime: exponent}, aligned with values
+    """
+    values = [_as_int(v) for v in values]
+    results: List[Optional[Dict[int, int]]] = [None] * len(values)
+
+    small = np.array([i for i, v in enumerate(values) if 1 <= v <= SPF_BOUND],
+                     dtype=np.int64)
+    if len(small):
+        spf = arithmetic_tables(SPF_BOUND).spf
+        for i in small.tolist():
+            results[i] = {}
+        idx = small
+        rest = np.array([values[i] for i in small.tolist()], dtype=np.int64)
+        alive = rest > 1
+        idx, rest = idx[alive], rest[alive]
+        while len(idx):
+            p = spf[rest].astype(np.int64)
+            for i, q in zip(idx.tolist(), p.tolist()):
+                results[i][q] = results[i].get(q, 0) + 1
+            rest //= p
+            alive = rest > 1
+            idx, rest = idx[alive], rest[alive]
+
+    for i, v in enumerate(values):
+        if results[i] is None:
+            results[i] = factorint(v, time_budget)
+    return results
@@ -0,0 +1,208 @@
+"""
+Numeric Kernel for the PWT Damped Model
+
+Vectorized evaluation of the refined damped model of
+PWT_Model_Implementation.py,
+
+    r(n) = a / p(n) + b · log N_m / D + c · log N_m / (p(n) · D),
+
+with m = n + m_shift, N_m the primorial of m and D = 137 (or 1). p(n) and
+log N_m = Σ_{i<=m} log p_i come from cached tables, so a whole array of n
+is evaluated with two gathers and no big-integer arithmetic. The model is
+linear in (a, b, c) with design matrix [1/p(n), log N_m / D,
+log N_m / (p(n) D)], which is also its analytic Jacobian (damped_jacobian,
+for curve_fit and other nonlinear optimizers). batch_fit solves thousands
+of datasets against a whole grid of (m_shift, use_137) variants in closed
+form, as stacked linear least-squares problems in one vectorized pass.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import warnings
+
+import numpy as np
+from typing import Tuple
+
+from pwt_primes import PRIME_CACHE
+
+
+FINE_STRUCTURE_DENOM = 137
+
+
+def _table_size(n: int) -> int:
+    """Tables are built in power-of-two sizes so growth is geometric."""
+    return max(64, 1 << (int(n) - 1).bit_length())
+
+
+def model_tables(n_max: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cached tables covering 1 <= n <= n_max.
+
+    Returns:
+        (primes, log_primorials) as float64, where primes[n - 1] = p(n)
+        and log_primorials[m] = log N_m (log_primorials[0] = 0)
+    """
+    size = _table_size(n_max)
+
+    def build():
+        primes = PRIME_CACHE.primes(size).astype(np.float64)
+        log_primorials = np.zeros(size + 1)
+        np.cumsum(np.log(primes), out=log_primorials[1:])
+        primes.flags.writeable = False
+        log_primorials.flags.writeable = False
+        return primes, log_primorials
+
+    return PRIME_CACHE.memo('model_tables', size, build)
+
+
+def design_matrix(n, m_shift: int = 1, use_137: bool = True) -> np.ndarray:
+    """
+    Columns multiplying (a, b, c) in the damped model.
+
+    Args:
+        n: Integer or array of integers >= 1
+        m_shift: m = n + m_shift
+        use_137: Divide the primorial terms by 137
+
+    Returns:
+        float64 array of shape n.shape + (3,)
+    """
+    n = np.asarray(n, dtype=np.int64)
+    m = n + m_shift
+    if n.size and (n.min() < 1 or m.min() < 0):
+        raise ValueError("n must be >= 1 and n + m_shift >= 0")
+    primes, log_primorials = model_tables(max(int(n.max(initial=1)),
+                                              int(m.max(initial=0)), 1))
+    p_n = primes[n - 1]
+    log_prim = log_primorials[m] / (FINE_STRUCTURE_DENOM if use_137 else 1)
+
+    X = np.empty(n.shape + (3,))
+    X[..., 0] = 1.0 / p_n
+    X[..., 1] = log_prim
+    X[..., 2] = log_prim / p_n
+    return X
+
+
+def damped_model(n, a: float, b: float, c: float, m_shift: int = 1,
+                 use_137: bool = True) -> np.ndarray:
+    """
+    r(n) for an integer or array of n in one vectorized call.
+    """
+    return design_matrix(n, m_shift, use_137) @ np.array([a, b, c],
+                                                         dtype=np.float64)
+
+
+def damped_jacobian(n, a: float = 0.0, b: float = 0.0, c: float = 0.0,
+                    m_shift: int = 1, use_137: bool = True) -> np.ndarray:
+    """
+    ∂r/∂(a, b, c), in the jac(x, *params) form curve_fit expects.
+
+    The model is linear, so this is the design matrix and the parameter
+    values are ignored.
+    """
+    return design_matrix(n, m_shift, use_137)
+
+
+# ============================================================================
+# Batched Linear Least Squares
+# ============================================================================
+
+def _as_matrix(datasets) -> np.ndarray:
+    """Datasets (ragged sequences or a 2-D array) as a NaN-padded matrix."""
+    if isinstance(datasets, np.ndarray) and datasets.ndim == 2:
+        return datasets.astype(np.float64)
+    rows = [np.asarray(d, dtype=np.float64).reshape(-1) for d in datasets]
+    Y = np.full((len(rows), max((len(r) for r in rows), default=0)), np.nan)
+    for i, r in enumerate(rows):
+        Y[i, :len(r)] = r
+    return Y
+
+
+def batch_fit(datasets, variants=None, n_start: int = 1) -> dict:
+    """
+    Least-squares fits of (a, b, c) for every dataset and model variant.
+
+    The damped model is linear in (a, b, c), so each fit is the linear
+    least-squares problem X_v w = y with X_v the design matrix of variant
+    v = (m_shift, use_137). Datasets sharing the same observed positions
+    share X_v, so each such group is solved for all variants and all its
+    datasets at once with one stacked pseudo-inverse (SVD; minimum-norm
+    when fewer than three points or degenerate columns).
+
+    Args:
+        datasets: Sequence of 1-D data sequences (ragged allowed) or a 2-D
+            array; NaN marks a missing value. Element j is r(n_start + j).
+        variants: Sequence of (m_shift, use_137) pairs (default: m_shift
+            0..3 with and without 137)
+        n_start: n of the first data element
+
+    Returns:
+        Dictionary of arrays, with V variants, D datasets and L columns:
+        'variants' (V, 2), 'params' (V, D, 3), 'predictions' and
+        'residuals' (V, D, L) (NaN where no data), 'rss', 'rmse',
+        'r_squared', 'rank' (V, D), 'n_obs' (D,) and 'best_variant' (D,),
+        the variant with the smallest residual sum of squares. Datasets
+        without observations get NaN statistics and best_variant -1
+    """
+    if variants is None:
+        variants = [(s, u) for s in range(4) for u in (True, False)]
+    variants = [(int(s), bool(u)) for s, u in variants]
+    Y = _as_matrix(datasets)
+    D, L = Y.shape
+    V = len(variants)
+    n = np.arange(n_start, n_start + L)
+    X = np.stack([design_matrix(n, s, u) for s, u in variants])  # (V, L, 3)
+
+    observed = ~np.isnan(Y)
+    params = np.zeros((V, D, 3))
+    rank = np.zeros((V, D), dtype=np.int64)
+
+    # Group datasets by their pattern of observed positions
+    patterns, groups = np.unique(observed, axis=0, return_inverse=True)
+    for g, pattern in enumerate(patterns):
+        members = np.flatnonzero(groups.reshape(-1) == g)
+        if not pattern.any():
+            continue
+        Xg = X[:, pattern, :]                              # (V, Lg, 3)
+        Yg = Y[np.ix_(members, np.flatnonzero(pattern))]   # (Dg, Lg)
+        params[:, members, :] = np.einsum('vkl,dl->vdk',
+                                          np.linalg.pinv(Xg), Yg)
+        rank[:, members] = np.linalg.matrix_rank(Xg)[:, None]
+
+    predictions = np.einsum('vlk,vdk->vdl', X, params)
+    predictions[:, ~observed] = np.nan
+    residuals = Y[None] - predictions
+    n_obs = observed.sum(axis=1)
+
+    # Datasets with no observations have no fit: NaN statistics
+    empty = n_obs == 0
+    rss = np.nansum(residuals ** 2, axis=2)
+    rss[:, empty] = np.nan
+    with warnings.catch_warnings(), \
+            np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(Y, axis=1)
+        tss = np.nansum((Y - mean[:, None]) ** 2, axis=1)
+        r_squared = 1.0 - rss / tss[None, :]
+        rmse = np.sqrt(rss / n_obs[None, :])
+
+    # nanargmin semantics; -1 where no variant could be fitted
+    best = np.argmin(np.where(np.isnan(rss), np.inf, rss), axis=0)
+    best[empty] = -1
+
+    return {
+        'variants': np.array(variants, dtype=np.int64),
+        'params': params,
+        'predictions': predictions,
+        'residuals': residuals,
+        'rss': rss,
+        'rmse': rmse,
+        'r_squared': r_squared,
+        'rank': rank,
+        'n_obs': n_obs,
+        'best_variant': best,
+    }
@@ -0,0 +1,321 @@
+"""
+Persistent Prime Index for Prime Wave Theory (PWT)
+
+A versioned binary file holding every prime up to a limit, built once and
+opened with np.memmap by every process that needs primes. Pages come from
+the shared OS page cache, so thousands of short worker processes start
+without sieving.
+
+File layout (little-endian):
+
+    header       64 bytes: magic, format version, checkpoint interval,
+                 prime count, limit, section offsets
+    deltas       uint8 per prime: (q_i - q_{i-1}) / 2, where q_0 = 1 stands
+                 in for 2 so that every gap is even
+    checkpoints  uint64 q_{j·interval}, for random access into the deltas
+
+The n-th prime is its checkpoint plus twice the sum of at most `interval`
+deltas, and π(x) is a binary search over the checkpoints followed by one
+block decode. No prime gap exceeds 510 below about 3·10^11, far beyond
+the indexes this format targets; build_prime_index checks every gap
+anyway.
+
+Usage:
+    python pwt_prime_index.py --build --limit 1000000000
+    python pwt_prime_index.py --info
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import argparse
+import os
+import threading
+
+import numpy as np
+from typing import Optional, Union
+
+import pwt_primecount
+from pwt_primes import _prime_dtype, iter_prime_segments
+
+
+FORMAT_VERSION = 1
+MAGIC = b'PWTPIDX\x00'
+HEADER_SIZE = 64
+
+# Primes per checkpoint; one random access decodes at most this many deltas
+DEFAULT_INTERVAL = 1024
+
+# Index file used when no path is given: $PWT_PRIME_INDEX, else next to
+# this module, so the same index is found from any working directory
+DEFAULT_INDEX = os.environ.get(
+    'PWT_PRIME_INDEX',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pwt_primes.idx'))
+
+_HEADER = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('interval', '<u4'),
+    ('count', '<u8'),
+    ('limit', '<u8'),
+    ('deltas_offset', '<u8'),
+    ('checkpoints_offset', '<u8'),
+    ('n_checkpoints', '<u8'),
+])
+
+
+# ============================================================================
+# Building
+# ============================================================================
+
+def build_prime_index(path: str = DEFAULT_INDEX, limit: int = 10 ** 8,
+                      interval: int = DEFAULT_INTERVAL) -> str:
+    """
+    Sieve every prime <= limit into an index file.
+
+    The sieve streams segment by segment and deltas are appended as they
+    come, so memory is one segment plus the checkpoint table. The file is
+    written under a temporary name and renamed into place, so readers never
+    see a partial index.
+
+    Args:
+        path: Index file to create (replaced if it exists)
+        limit: Largest integer covered
+        interval: Primes per checkpoint
+
+    Returns:
+        path
+    """
+    tmp = f'{path}.tmp{os.getpid()}'
+    checkpoints = []
+    count = 0
+    prev = 1  # q_0 = 1 stands in for the prime 2
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(b'\x00' * HEADER_SIZE)
+            for chunk in iter_prime_segments(limit):
+                q = chunk.astype(np.int64)
+                if count == 0:
+                    q[0] = 1
+                gaps = np.diff(q, prepend=prev)
+                half = gaps >> 1
+                if half.size and int(half.max()) > 255:
+                    raise OverflowError("Prime gap above 510; the uint8 "
+                                        "delta encoding cannot hold it")
+                # Indices count..count+len-1; checkpoint every interval-th
+                first = (-count) % interval
+                checkpoints.extend(q[first::interval].tolist())
+                half.astype(np.uint8).tofile(f)
+                count += len(q)
+                prev = int(q[-1])
+
+            pad = (-(HEADER_SIZE + count)) % 8
+            f.write(b'\x00' * pad)
+            checkpoints_offset = HEADER_SIZE + count + pad
+            np.asarray(checkpoints, dtype='<u8').tofile(f)
+
+            header = np.zeros(1, dtype=_HEADER)
+            header['magic'] = MAGIC
+            header['version'] = FORMAT_VERSION
+            header['interval'] = interval
+            header['count'] = count
+            header['limit'] = limit
+            header['deltas_offset'] = HEADER_SIZE
+            header['checkpoints_offset'] = checkpoints_offset
+            header['n_checkpoints'] = len(checkpoints)
+            f.seek(0)
+            f.write(header.tobytes())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return path
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+class PrimeIndex:
+    """
+    Read-only, memory-mapped view of a prime index file.
+
+    Primes are numbered from 1 as in sympy.prime: nth(1) = 2.
+
+    Args:
+        path: Index file written by build_prime_index
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX):
+        self.path = path
+        self._map = np.memmap(path, dtype=np.uint8, mode='r')
+        header = np.frombuffer(self._map[:_HEADER.itemsize], dtype=_HEADER)[0]
+        if bytes(header['magic']) != MAGIC.rstrip(b'\x00'):
+            raise ValueError(f"{path} is not a PWT prime index")
+        if int(header['version']) != FORMAT_VERSION:
+            raise ValueError(f"{path} has index format version "
+                             f"{int(header['version'])}, expected "
+                             f"{FORMAT_VERSION}; rebuild it")
+        self.interval = int(header['interval'])
+        self.count = int(header['count'])
+        self.limit = int(header['limit'])
+        start = int(header['deltas_offset'])
+        self.deltas = self._map[start:start + self.count]
+        start = int(header['checkpoints_offset'])
+        self.checkpoints = self._map[
+            start:start + 8 * int(header['n_checkpoints'])].view('<u8')
+        self._dtype = _prime_dtype(self.limit)
+
+    def __repr__(self) -> str:
+        return (f"PrimeIndex({self.path!r}, count={self.count}, "
+                f"limit={self.limit})")
+
+    def _decode(self, lo: int, hi: int) -> np.ndarray:
+        """q_lo..q_{hi-1} as int64, lo a multiple of the interval."""
+        if hi <= lo:
+            return np.empty(0, dtype=np.int64)
+        values = np.cumsum(self.deltas[lo:hi], dtype=np.int64)
+        values -= values[0]
+        values *= 2
+        values += int(self.checkpoints[lo // self.interval])
+        if lo == 0:
+            values[0] = 2
+        return values
+
+    def first(self, k: int) -> np.ndarray:
+        """
+        The first k primes.
+
+        Returns:
+            uint32 (or uint64) array [2, 3, 5, ...] of length k
+        """
+        if k > self.count:
+            raise IndexError(f"Index holds {self.count} primes, {k} requested")
+        return self._decode(0, k).astype(self._dtype)
+
+    def nth(self, n: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        The n-th prime (1-based) for an int or an integer array.
+        """
+        if np.ndim(n) == 0:
+            i = int(n) - 1
+            if not 0 <= i < self.count:
+                raise IndexError(f"Prime number {int(n)} outside the index "
+                                 f"(1..{self.count})")
+            lo = i - i % self.interval
+            return int(self._decode(lo, i + 1)[-1])
+
+        i = np.asarray(n, dtype=np.int64) - 1
+        if i.size and (i.min() < 0 or i.max() >= self.count):
+            raise IndexError(f"Prime numbers outside the index "
+                             f"(1..{self.count})")
+        out = np.empty(i.shape, dtype=self._dtype)
+        blocks = i // self.interval
+        for block in np.unique(blocks).tolist():
+            sel = blocks == block
+            lo = block * self.interval
+            values = self._decode(lo, min(lo + self.interval, self.count))
+            out[sel] = values[i[sel] - lo]
+        return out
+
+    def pi(self, x: int) -> int:
+        """
+        Number of primes <= x, for x <= limit.
+        """
+        x = int(x)
+        if x > self.limit:
+            raise ValueError(f"x={x} beyond the index limit {self.limit}")
+        if x < 2:
+            return 0
+        block = int(np.searchsorted(self.checkpoints, x, side='right')) - 1
+        lo = block * self.interval
+        values = self._decode(lo, min(lo + self.interval, self.count))
+        return lo + int(np.searchsorted(values, x, side='right'))
+
+    def primes_between(self, lo: int, hi: int) -> np.ndarray:
+        """Primes p with lo <= p < hi (hi - 1 <= limit)."""
+        first, last = self.pi(lo - 1), self.pi(hi - 1)
+        start = first - first % self.interval
+        return self._decode(start, last)[first - start:].astype(self._dtype)
+
+    def close(self):
+        """Release the memory map."""
+        self._map._mmap.close()
+        self.deltas = self.checkpoints = self._map = None
+
+
+_INDEXES = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def open_prime_index(path: str = DEFAULT_INDEX) -> Optional[PrimeIndex]:
+    """
+    Process-wide PrimeIndex for path, or None if the file does not exist.
+
+    Opened once per process and reused; the mapping is shared through the
+    page cache with every other process using the same file. A missing
+    file is not cached, so an index built later in the process is picked
+    up by the next call.
+    """
+    path = os.path.abspath(path)
+    with _INDEXES_LOCK:
+        if path not in _INDEXES:
+            if not os.path.exists(path):
+                return None
+            _INDEXES[path] = PrimeIndex(path)
+        return _INDEXES[path]
+
+
+def nth_prime(n: int, path: str = DEFAULT_INDEX) -> int:
+    """
+    The n-th prime (nth_prime(1) = 2), from the index file when it covers
+    n, otherwise by prime counting (pwt_primecount).
+    """
+    index = open_prime_index(path)
+    if index is not None and n <= index.count:
+        return index.nth(n)
+    return pwt_primecount.nth_prime(n)
+
+
+def prime_pi(x: int, path: str = DEFAULT_INDEX) -> int:
+    """
+    π(x), the number of primes <= x, from the index file when it covers x,
+    otherwise by prime counting (pwt_primecount).
+    """
+    index = open_prime_index(path)
+    if index is not None and x <= index.limit:
+        return index.pi(x)
+    return pwt_primecount.prime_pi(x)
+
+
+def main():
+    """Build an index file or describe an existing one."""
+    parser = argparse.ArgumentParser(description='PWT prime index file')
+    parser.add_argument('--path', type=str, default=DEFAULT_INDEX,
+                        help=f'Index file (default: {DEFAULT_INDEX})')
+    parser.add_argument('--build', action='store_true',
+                        help='Sieve and write the index')
+    parser.add_argument('--limit', type=int, default=10 ** 8,
+                        help='Largest integer covered when building')
+    parser.add_argument('--interval', type=int, default=DEFAULT_INTERVAL,
+                        help='Primes per checkpoint when building')
+    parser.add_argument('--info', action='store_true',
+                        help='Print the index header')
+    args = parser.parse_args()
+
+    if args.build:
+        build_prime_index(args.path, args.limit, args.interval)
+        print(f"Saved: {args.path}")
+    if args.info or not args.build:
+        index = PrimeIndex(args.path)
+        print(f"{index.path}: {index.count} primes <= {index.limit}, "
+              f"largest {index.nth(index.count)}, "
+              f"checkpoint every {index.interval}, "
+              f"{os.path.getsize(index.path)} bytes")
+
+
+if __name__ == '__main__':
+    main()
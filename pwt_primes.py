@@ -0,0 +1,459 @@
+"""
+Prime Generation Engine for Prime Wave Theory (PWT)
+
+Segmented sieve of Eratosthenes used by PWT-V15.py and the companion
+scripts. Only odd candidates are stored, one byte each, and every segment
+is crossed off with NumPy strided assignment, so memory stays bounded by
+the segment size no matter how far the sieve runs.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Iterator
+
+import numpy as np
+
+from pwt_profile import PROFILER, profiled
+
+
+# Odd candidates held per segment (one byte each, ~256 KiB fits in L2)
+DEFAULT_SEGMENT_SIZE = 1 << 18
+
+
+# ============================================================================
+# Base Primes
+# ============================================================================
+
+def _prime_dtype(limit: int) -> np.dtype:
+    """Smallest unsigned dtype able to hold every prime <= limit."""
+    return np.dtype(np.uint32) if limit < 2 ** 32 else np.dtype(np.uint64)
+
+
+def _base_primes(limit: int) -> np.ndarray:
+    """
+    Odd primes <= limit from a single, unsegmented odd-only sieve.
+
+    Only used for the sieving primes up to sqrt(limit), so the array is tiny.
+    """
+    if limit < 3:
+        return np.empty(0, dtype=np.int64)
+
+    # is_odd_prime[i] <=> 2i + 1 is prime
+    size = (limit - 1) // 2 + 1
+    is_odd_prime = np.ones(size, dtype=np.bool_)
+    is_odd_prime[0] = False
+
+    for i in range(1, (int(limit ** 0.5) - 1) // 2 + 1):
+        if is_odd_prime[i]:
+            p = 2 * i + 1
+            is_odd_prime[(p * p) // 2::p] = False
+
+    return 2 * np.flatnonzero(is_odd_prime).astype(np.int64) + 1
+
+
+# ============================================================================
+# Segmented Sieve
+# ============================================================================
+
+def iter_prime_segments(limit: int,
+                        segment_size: int = DEFAULT_SEGMENT_SIZE,
+                        start: int = 2) -> Iterator[np.ndarray]:
+    """
+    Stream the primes in [start, limit], one sieve segment at a time.
+
+    Each segment covers `segment_size` consecutive odd numbers, so peak
+    memory is one byte per odd candidate in the segment plus the primes
+    it yields. Only primes up to sqrt(limit) are sieved first, so a window
+    [start, limit] far from 0 costs about as much as its own width.
+
+    Args:
+        limit: Upper bound for prime search
+        segment_size: Number of odd candidates per segment
+        start: Lower bound for prime search
+
+    Yields:
+        Sorted uint32 (or uint64 beyond 2^32) arrays of primes
+    """
+    if limit < max(start, 2):
+        return
+
+    PROFILER.gauge('sieve_limit', int(limit))
+    dtype = _prime_dtype(limit)
+    if start <= 2:
+        PROFILER.count('primes_generated')
+        yield np.array([2], dtype=dtype)
+
+    if limit < 3:
+        return
+
+    base = _base_primes(int(limit ** 0.5) + 1)
+    segment = np.empty(segment_size, dtype=np.bool_)
+
+    # Segment covers the odd numbers lo, lo + 2, ..., lo + 2*(size - 1)
+    lo = max(3, start | 1)
+    while lo <= limit:
+        size = min(segment_size, (limit - lo) // 2 + 1)
+        hi = lo + 2 * size
+        seg = segment[:size]
+        seg[:] = True
+
+        for p in base[base * base < hi].tolist():
+            # First odd multiple of p that is >= max(p^2, lo)
+            first = max(p * p, ((lo + p - 1) // p) * p)
+            if first % 2 == 0:
+                first += p
+            seg[(first - lo) // 2::p] = False
+
+        primes = (lo + 2 * np.flatnonzero(seg)).astype(dtype)
+        PROFILER.count('sieve_segments')
+        PROFILER.count('primes_generated', len(primes))
+        yield primes
+        lo = hi
+
+
+@profiled('sieve')
+def sieve_primes(limit: int,
+                 segment_size: int = DEFAULT_SEGMENT_SIZE) -> np.ndarray:
+    """
+    All primes <= limit as one compact array.
+
+    Args:
+        limit: Upper bound for prime search
+        segment_size: Number of odd candidates per segment
+
+    Returns:
+        uint32 (or uint64) array of primes <= limit
+    """
+    chunks = list(iter_prime_segments(limit, segment_size))
+    if not chunks:
+        return np.empty(0, dtype=_prime_dtype(limit))
+    return np.concatenate(chunks)
+
+
+@profiled('sieve')
+def sieve_range(start: int, stop: int,
+                segment_size: int = DEFAULT_SEGMENT_SIZE) -> np.ndarray:
+    """
+    Primes p with start <= p < stop, sieving only that window.
+
+    Args:
+        start, stop: Window bounds (stop exclusive)
+        segment_size: Number of odd candidates per segment
+
+    Returns:
+        uint32 (or uint64) array of primes in the window
+    """
+    chunks = list(iter_prime_segments(stop - 1, segment_size, start=start))
+    if not chunks:
+        return np.empty(0, dtype=_prime_dtype(max(stop - 1, 0)))
+    return np.concatenate(chunks)
+
+
+def nth_prime_upper_bound(k: int) -> int:
+    """
+    Upper bound on the k-th prime (Rosser's theorem).
+
+    p_k < k (log k + log log k) for k >= 6.
+    """
+    if k < 6:
+        return 13
+    return int(k * (np.log(k) + np.log(np.log(k)))) + 1
+
+
+@profiled('sieve')
+def first_k_primes(k: int,
+                   segment_size: int = DEFAULT_SEGMENT_SIZE) -> np.ndarray:
+    """
+    The first k primes, sieving segment by segment until k are found.
+
+    The sieve stops as soon as the k-th prime has been produced, so the
+    Rosser bound only caps the search and is never fully sieved.
+
+    Args:
+        k: Number of primes to return
+        segment_size: Number of odd candidates per segment
+
+    Returns:
+        uint32 (or uint64) array [2, 3, 5, 7, ...] of length k
+    """
+    limit = nth_prime_upper_bound(k)
+    if k <= 0:
+        return np.empty(0, dtype=_prime_dtype(limit))
+
+    out = np.empty(k, dtype=_prime_dtype(limit))
+    count = 0
+    for chunk in iter_prime_segments(limit, segment_size):
+        take = min(len(chunk), k - count)
+        out[count:count + take] = chunk[:take]
+        count += take
+        if count == k:
+            break
+
+    if count < k:
+        raise RuntimeError(f"Sieve bound {limit} too small for k={k}")
+    return out
+
+
+# ============================================================================
+# Exact Products
+# ============================================================================
+
+def product_tree(values) -> int:
+    """
+    Exact product of integers by balanced binary-tree multiplication.
+
+    Multiplying operands of similar size keeps Python's Karatsuba
+    multiplication efficient, unlike a left-to-right running product whose
+    accumulator grows while the other factor stays tiny.
+
+    Args:
+        values: Sequence of integers (list or integer NumPy array)
+
+    Returns:
+        Product as an arbitrary-precision Python int (1 if empty)
+    """
+    level = [int(v) for v in values]
+    if not level:
+        return 1
+    while len(level) > 1:
+        paired = [level[i] * level[i + 1] for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            paired.append(level[-1])
+        level = paired
+    return level[0]
+
+
+# ============================================================================
+# Process-Wide Prime Cache
+# ============================================================================
+
+def _nbytes(value: Any) -> int:
+    """
+    Bytes of data held by a memoized value: big-integer magnitudes and
+    NumPy arrays, alone, in a tuple or list, or as an object's attributes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, int):
+        return (abs(value).bit_length() + 7) // 8
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    if hasattr(value, '__dict__'):
+        return sum(_nbytes(v) for v in vars(value).values()
+                   if isinstance(v, (np.ndarray, int)))
+    return 0
+
+
+class PrimeCache:
+    """
+    Incrementally grown table of the first primes plus memoized derived values.
+
+    The prime table grows geometrically: a request for more primes than are
+    held re-sieves to at least twice the current size, so a sweep over
+    k = 1, 2, ..., K sieves O(log K) times in total. Derived quantities
+    (primorials, φ(N_k), ...) are memoized per (name, k) in an LRU table
+    bounded both in entries and in the bytes held by NumPy arrays and big
+    integers.
+
+    When a prime index file exists (pwt_prime_index), misses it covers are
+    decoded from the memory-mapped index instead of sieved.
+
+    Args:
+        max_primes: Largest prime table kept in memory; bigger requests are
+            served by a one-off sieve and not cached
+        max_entries: Maximum number of memoized derived values before the
+            least recently used one is evicted
+        max_bytes: Budget for the NumPy arrays and big integers held by
+            memoized values; least recently used values are evicted beyond
+            it, and a value larger than the whole budget is returned
+            without being cached
+        index_path: Prime index file (default: pwt_prime_index.DEFAULT_INDEX;
+            '' disables the index)
+    """
+
+    def __init__(self, max_primes: int = 50_000_000, max_entries: int = 256,
+                 max_bytes: int = 256 << 20, index_path: str = None):
+        self.max_primes = max_primes
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.index_path = index_path
+        self._primes = np.empty(0, dtype=np.uint32)
+        self._memo = OrderedDict()
+        self._memo_nbytes = {}
+        self._memo_bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.sieves = 0
+
+    def primes(self, k: int) -> np.ndarray:
+        """
+        Read-only view of the first k primes.
+
+        Args:
+            k: Number of primes
+
+        Returns:
+            Array [2, 3, 5, ...] of length k (shared, do not modify)
+        """
+        with self._lock:
+            if k <= len(self._primes):
+                self.hits += 1
+                PROFILER.count('prime_cache_hits')
+                return self._primes[:k]
+
+            self.misses += 1
+            PROFILER.count('prime_cache_misses')
+            index = self._index()
+            if index is not None and k <= index.count:
+                PROFILER.count('prime_index_reads')
+                if k > self.max_primes:
+                    return index.first(k)
+                target = min(max(k, 2 * len(self._primes), 64),
+                             self.max_primes, index.count)
+                table = index.first(target)
+                table.flags.writeable = False
+                self._primes = table
+                return table[:k]
+
+            self.sieves += 1
+            if k > self.max_primes:
+                return first_k_primes(k)
+
+            target = min(max(k, 2 * len(self._primes), 64), self.max_primes)
+            table = first_k_primes(target)
+            table.flags.writeable = False
+            self._primes = table
+            return table[:k]
+
+    def _index(self):
+        """The memory-mapped prime index, or None if there is none."""
+        if self.index_path == '':
+            return None
+        from pwt_prime_index import DEFAULT_INDEX, open_prime_index
+        return open_prime_index(self.index_path or DEFAULT_INDEX)
+
+    def memo(self, name: str, k: int, compute: Callable[[], Any]) -> Any:
+        """
+        Memoized value of a derived quantity for the first k primes.
+
+        Args:
+            name: Quantity name (e.g. 'primorial', 'phi_primorial')
+            k: Number of primes
+            compute: Zero-argument callable producing the value on a miss
+
+        Returns:
+            Cached or freshly computed value
+        """
+        key = (name, k)
+        with self._lock:
+            if key in self._memo:
+                self.hits += 1
+                PROFILER.count('prime_cache_hits')
+                self._memo.move_to_end(key)
+                return self._memo[key]
+            self.misses += 1
+            PROFILER.count('prime_cache_misses')
+
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def _store(self, key: tuple, value: Any):
+        """Insert a memoized value, then evict down to both limits."""
+        nbytes = _nbytes(value)
+        with self._lock:
+            if key in self._memo:
+                self._memo_bytes -= self._memo_nbytes.pop(key)
+                del self._memo[key]
+            if nbytes > self.max_bytes:
+                return
+            self._memo[key] = value
+            self._memo_nbytes[key] = nbytes
+            self._memo_bytes += nbytes
+            while len(self._memo) > self.max_entries or \
+                    self._memo_bytes > self.max_bytes:
+                old, _ = self._memo.popitem(last=False)
+                self._memo_bytes -= self._memo_nbytes.pop(old)
+
+    def _prefix_product(self, name: str, k: int,
+                        factors: Callable[[np.ndarray], Any]) -> int:
+        """
+        Memoized prefix product ∏_{i<=k} factors(p_i), extended from the
+        nearest memoized shorter prefix via a product tree.
+        """
+        key = (name, k)
+        with self._lock:
+            if key in self._memo:
+                self.hits += 1
+                PROFILER.count('prime_cache_hits')
+                self._memo.move_to_end(key)
+                return self._memo[key]
+            self.misses += 1
+            PROFILER.count('prime_cache_misses')
+            j, base = 0, 1
+            for (other, i), value in self._memo.items():
+                if other == name and j < i < k:
+                    j, base = i, value
+
+        primes = self.primes(k)
+        value = base * product_tree(factors(primes[j:k]))
+        self._store(key, value)
+        return value
+
+    def primorial(self, k: int) -> int:
+        """
+        Exact N_k = p_1 p_2 ... p_k as an arbitrary-precision int.
+
+        Args:
+            k: Number of primes
+
+        Returns:
+            Product of first k primes
+        """
+        return self._prefix_product('primorial', k, lambda p: p)
+
+    def phi_primorial(self, k: int) -> int:
+        """
+        Exact φ(N_k) = ∏ (p_i - 1), using that N_k is squarefree.
+
+        Args:
+            k: Number of primes
+
+        Returns:
+            Number of integers in [1, N_k] coprime to N_k
+        """
+        return self._prefix_product(
+            'phi_primorial', k, lambda p: p.astype(np.int64) - 1)
+
+    def clear(self):
+        """Drop the prime table and every memoized value."""
+        with self._lock:
+            self._primes = np.empty(0, dtype=np.uint32)
+            self._memo.clear()
+            self._memo_nbytes.clear()
+            self._memo_bytes = 0
+            self.hits = self.misses = self.sieves = 0
+
+    def stats(self) -> dict:
+        """Table size, memo occupancy and hit/miss counters."""
+        with self._lock:
+            return {
+                'primes_cached': len(self._primes),
+                'largest_prime': int(self._primes[-1]) if len(self._primes) else None,
+                'memo_entries': len(self._memo),
+                'memo_bytes': self._memo_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'sieves': self.sieves,
+            }
+
+
+# Shared by every entry point in the process
+PRIME_CACHE = PrimeCache()
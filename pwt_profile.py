@@ -0,0 +1,232 @@
+"""
+Hot-Path Instrumentation for Prime Wave Theory (PWT)
+
+A process-wide profiler shared by PWT-V15.py and the pwt_* modules. It
+collects
+
+    * nested stage timers (`with PROFILER.stage('sieve'): ...` or the
+      @profiled decorator), aggregated per call path;
+    * counters such as primes generated, wave points evaluated and Fourier
+      coefficients computed (PROFILER.count);
+    * gauges that keep the largest value seen, such as the sieve limit
+      (PROFILER.gauge).
+
+Profiling is off by default. While disabled, stage() hands back one shared
+no-op context manager and count()/gauge() return after a single attribute
+test, so instrumented hot paths cost essentially nothing.
+
+report() returns a JSON-serializable trace with per-stage timings and
+the stacks in collapsed ("folded") form, `outer;inner <microseconds>` per
+line, which flamegraph.pl, speedscope and inferno read directly.
+
+Work done in other processes (parallel_P_k, batch jobs) is not recorded;
+only the time the calling process spends waiting for it is.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    Python standard library only
+"""
+
+import functools
+import json
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List
+
+
+_DISABLED_STAGE = nullcontext()
+
+
+class _Stage:
+    """Context manager timing one entry of a stage on the current path."""
+
+    __slots__ = ('profiler', 'name', 'path', 't0')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        stack.append(self.name)
+        self.path = tuple(stack)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        self.profiler._stack().pop()
+        self.profiler._record(self.path, elapsed)
+        return False
+
+
+class Profiler:
+    """
+    Stage timers, counters and gauges, disabled until enable() is called.
+
+    Stage paths are tracked per thread; totals from all threads are merged.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Drop all recorded stages, counters and gauges."""
+        with self._lock:
+            self._stages = {}
+            self.counters = {}
+            self.gauges = {}
+            self._started = time.perf_counter()
+
+    def enable(self):
+        """Start recording from a clean state."""
+        self.reset()
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording; collected data is kept until reset()."""
+        self.enabled = False
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, path: tuple, elapsed: float):
+        with self._lock:
+            entry = self._stages.get(path)
+            if entry is None:
+                self._stages[path] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def stage(self, name: str):
+        """
+        Context manager timing a named stage nested in the current one.
+
+        Args:
+            name: Stage name (';' is reserved as the path separator)
+
+        Returns:
+            A timer while enabled, otherwise a shared no-op context
+        """
+        if not self.enabled:
+            return _DISABLED_STAGE
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1):
+        """Add n to counter name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(n)
+
+    def gauge(self, name: str, value):
+        """Keep the largest value reported for gauge name."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if name not in self.gauges or value > self.gauges[name]:
+                self.gauges[name] = value
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def stages(self) -> List[dict]:
+        """
+        Per-path timings, parents before children.
+
+        Self time is the total minus the time spent in direct child stages.
+        """
+        with self._lock:
+            stages = {path: tuple(v) for path, v in self._stages.items()}
+        child_time = {}
+        for path, (_, total) in stages.items():
+            if len(path) > 1:
+                child_time[path[:-1]] = child_time.get(path[:-1], 0.0) + total
+        return [{
+            'path': ';'.join(path),
+            'name': path[-1],
+            'depth': len(path) - 1,
+            'calls': calls,
+            'total_seconds': total,
+            'self_seconds': max(total - child_time.get(path, 0.0), 0.0),
+        } for path, (calls, total) in sorted(stages.items())]
+
+    def folded_stacks(self) -> List[str]:
+        """Collapsed stacks, 'a;b;c <self microseconds>' per line."""
+        return [f"{s['path']} {int(round(s['self_seconds'] * 1e6))}"
+                for s in self.stages() if s['self_seconds'] > 0]
+
+    def report(self, extra: Dict = None) -> dict:
+        """
+        Structured trace of everything recorded since enable().
+
+        Args:
+            extra: Additional JSON-serializable sections (e.g. cache stats)
+
+        Returns:
+            Dictionary with wall time, stages, counters, gauges and the
+            folded stacks
+        """
+        trace = {
+            'wall_seconds': time.perf_counter() - self._started,
+            'stages': self.stages(),
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'folded_stacks': self.folded_stacks(),
+        }
+        if extra:
+            trace.update(extra)
+        return trace
+
+    def write(self, filename: str, extra: Dict = None) -> dict:
+        """
+        Write report() as JSON to filename, and the folded stacks to
+        filename with a .folded suffix for flame-graph tools.
+
+        Returns:
+            The trace that was written
+        """
+        trace = self.report(extra)
+        with open(filename, 'w') as f:
+            json.dump(trace, f, indent=2, default=str)
+        stem = filename[:-5] if filename.endswith('.json') else filename
+        with open(stem + '.folded', 'w') as f:
+            f.write('\n'.join(trace['folded_stacks']) + '\n')
+        return trace
+
+
+# Shared by every module in the process
+PROFILER = Profiler()
+
+
+def profiled(name: str) -> Callable:
+    """
+    Decorator timing every call of a function as stage name.
+
+    While profiling is disabled the wrapper only tests PROFILER.enabled.
+    Not meant for generator functions, whose body runs after the call.
+    """
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            with _Stage(PROFILER, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
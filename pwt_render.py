@@ -0,0 +1,318 @@
+"""
+Rendering Layer for Prime Wave Theory (PWT) Figures
+
+Reduces the wave, the integer markers and the Fourier spectrum to pixel
+resolution before anything reaches matplotlib, so figure cost depends on
+the output width rather than on N_k:
+
+    * the continuous wave is sampled a fixed number of times per pixel
+      column, or, when that would undersample it, streamed at 4x its
+      Nyquist rate; either way it is decimated to the min and max of each
+      column (or by LTTB, Largest-Triangle-Three-Buckets);
+    * integer markers come from the streamed coprimality mask (pwt_coprime),
+      reduced to "any coprime / any composite" per column;
+    * spectrum stems are reduced to the largest |c_m| per column and drawn
+      as a single LineCollection instead of one artist per mode.
+
+When N_k is below the pixel budget every integer and mode is drawn exactly.
+The wave envelope is exact up to the interpolation error at the sampling
+rate; peaks narrower than a sample spacing can still be clipped by a few
+percent.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+    matplotlib >= 3.4.0 (only for draw_stems)
+"""
+
+import numpy as np
+from typing import Sequence, Tuple
+
+from pwt_besov import max_frequency
+from pwt_coprime import coprime_mask, iter_coprime_blocks
+from pwt_profile import profiled
+from pwt_spectrum import SpectrumView
+from pwt_wave import P_k_values, stream_P_k
+
+
+# Pixel columns: a 12 in figure at 300 dpi
+DEFAULT_PIXELS = 3600
+
+# Wave samples taken inside each pixel column
+DEFAULT_SAMPLES_PER_PIXEL = 32
+
+# Minimum wave samples per unit x, as a multiple of the bandwidth of P_k
+# (8 = 4x Nyquist, the rate pwt_besov uses for its default grid)
+NYQUIST_FACTOR = 8
+
+
+# ============================================================================
+# Decimation
+# ============================================================================
+
+def minmax_decimate(x: np.ndarray, y: np.ndarray,
+                    n_bins: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the minimum and maximum of y in each of n_bins equal-count bins.
+
+    The two points of a bin are emitted in x order, so the result traces
+    the same envelope as the full line.
+
+    Args:
+        x, y: Samples, x increasing
+        n_bins: Number of bins (output has at most 2 * n_bins points)
+
+    Returns:
+        Decimated (x, y)
+    """
+    n = len(x)
+    if n <= 2 * n_bins:
+        return x, y
+    starts = (np.arange(n_bins) * n) // n_bins
+    bins = np.repeat(np.arange(n_bins), np.diff(np.append(starts, n)))
+
+    # Sorted by (bin, y), bin b occupies positions starts[b]..; its first
+    # and last entries are the bin's minimum and maximum
+    order = np.lexsort((y, bins))
+    lo = order[starts]
+    hi = order[np.append(starts[1:], n) - 1]
+    keep = np.sort(np.concatenate([lo, hi]))
+    return x[keep], y[keep]
+
+
+def lttb(x: np.ndarray, y: np.ndarray,
+         n_out: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Largest-Triangle-Three-Buckets downsampling to n_out points.
+
+    The first and last points are kept; from every bucket in between the
+    point forming the largest triangle with the previously kept point and
+    the mean of the next bucket is chosen.
+
+    Args:
+        x, y: Samples, x increasing
+        n_out: Number of points to keep (>= 3)
+
+    Returns:
+        Decimated (x, y)
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_lo, nxt_hi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        cx = x[nxt_lo:nxt_hi].mean()
+        cy = y[nxt_lo:nxt_hi].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return x[keep], y[keep]
+
+
+def _binned_reduce(values: np.ndarray, bins: np.ndarray, acc: np.ndarray,
+                   ufunc: np.ufunc):
+    """Fold values into acc[bins] with ufunc; bins must be non-decreasing."""
+    if not len(values):
+        return
+    starts = np.flatnonzero(np.diff(bins, prepend=-1))
+    ids = bins[starts]
+    acc[ids] = ufunc(acc[ids], ufunc.reduceat(values, starts))
+
+
+# ============================================================================
+# Wave and Integer Markers
+# ============================================================================
+
+def _streamed_envelope(primes: Sequence[int], period: float, num: int,
+                       n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-column min and max of P_k on np.linspace(0, period, num)."""
+    col_min = np.full(n_cols, np.inf)
+    col_max = np.full(n_cols, -np.inf)
+    scale = n_cols / (num - 1)
+    for offset, values in stream_P_k((0.0, float(period), num), primes):
+        index = np.arange(offset, offset + len(values), dtype=np.float64)
+        bins = np.minimum((index * scale).astype(np.int64), n_cols - 1)
+        _binned_reduce(values, bins, col_min, np.minimum)
+        _binned_reduce(values, bins, col_max, np.maximum)
+
+    centers = (np.arange(n_cols) + 0.5) * (float(period) / n_cols)
+    x = np.repeat(centers, 2)
+    y = np.column_stack([col_min, col_max]).ravel()
+    return x, y
+
+
+@profiled('wave_trace')
+def wave_trace(primes: Sequence[int], period: float,
+               n_pixels: int = DEFAULT_PIXELS,
+               samples_per_pixel: int = DEFAULT_SAMPLES_PER_PIXEL,
+               method: str = 'minmax') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    P_k over [0, period], decimated to pixel resolution.
+
+    A fixed n_pixels * samples_per_pixel grid aliases once P_k oscillates
+    faster than that (k >= 6 at the defaults), and the column extremes
+    then miss most peaks. In that case P_k is streamed at NYQUIST_FACTOR
+    samples per unit of bandwidth, reduced to per-column min and max as it
+    goes (memory O(n_pixels)); 'lttb' then runs on a finer min/max
+    envelope of n_pixels * samples_per_pixel / 2 columns.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        period: Right end of the x range (N_k)
+        n_pixels: Pixel columns of the target axes
+        samples_per_pixel: Samples taken in each column before decimation
+        method: 'minmax' or 'lttb'
+
+    Returns:
+        (x, y) with at most 2 * n_pixels points
+    """
+    if method not in ('minmax', 'lttb'):
+        raise ValueError(f"Unknown decimation method '{method}'")
+    rate = int(np.ceil(NYQUIST_FACTOR * max_frequency(primes)))
+    needed = int(np.ceil(rate * float(period))) + 1
+    if needed > n_pixels * samples_per_pixel:
+        n_cols = n_pixels if method == 'minmax' \
+            else max(n_pixels * samples_per_pixel // 2, n_pixels)
+        x, y = _streamed_envelope(primes, period, needed, n_cols)
+        return (x, y) if method == 'minmax' else lttb(x, y, 2 * n_pixels)
+
+    x = np.linspace(0, float(period), n_pixels * samples_per_pixel)
+    y = P_k_values(x, primes)
+    if method == 'minmax':
+        return minmax_decimate(x, y, n_pixels)
+    return lttb(x, y, 2 * n_pixels)
+
+
+@profiled('integer_markers')
+def integer_markers(primes: Sequence[int], N_k: int,
+                    n_pixels: int = DEFAULT_PIXELS
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    x positions of coprime and composite markers over [0, N_k).
+
+    Exact when N_k <= n_pixels. Otherwise [0, N_k) is split into n_pixels
+    columns and each column gets one marker per kind of integer it holds,
+    placed at its centre; the mask is streamed, so memory stays O(n_pixels).
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        N_k: Period
+        n_pixels: Pixel columns of the target axes
+
+    Returns:
+        (coprime_x, composite_x)
+    """
+    if N_k <= n_pixels:
+        n = np.arange(N_k)
+        mask = coprime_mask(0, N_k, primes)
+        return n[mask], n[~mask]
+
+    coprime = np.zeros(n_pixels, dtype=np.int64)
+    total = np.zeros(n_pixels, dtype=np.int64)
+    scale = n_pixels / N_k
+    for lo, mask in iter_coprime_blocks(0, N_k, primes):
+        n = np.arange(lo, lo + len(mask), dtype=np.float64)
+        bins = np.minimum((n * scale).astype(np.int64), n_pixels - 1)
+        _binned_reduce(mask.astype(np.int64), bins, coprime, np.add)
+        _binned_reduce(np.ones(len(mask), dtype=np.int64), bins, total,
+                       np.add)
+
+    centers = (np.arange(n_pixels) + 0.5) / scale
+    return centers[coprime > 0], centers[coprime < total]
+
+
+# ============================================================================
+# Spectrum
+# ============================================================================
+
+@profiled('spectrum_envelope')
+def spectrum_envelope(view: SpectrumView, n_pixels: int = DEFAULT_PIXELS,
+                      log_scale: bool = False, start: int = 0
+                      ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-column extremes of |c_m| over modes start <= m < N_k.
+
+    Exact (one entry per mode) when the range fits in n_pixels. Otherwise
+    modes are grouped into n_pixels linear or logarithmic columns, streamed
+    from the divisor-class table.
+
+    Args:
+        view: SpectrumView of P_k
+        n_pixels: Pixel columns of the target axes
+        log_scale: Space the columns logarithmically in m (start >= 1)
+        start: First mode
+
+    Returns:
+        (modes, min_abs, max_abs); modes is each column's representative
+        mode (its centre, or the mode itself when exact)
+    """
+    N_k = view.N_k
+    if N_k - start <= n_pixels:
+        modes = np.arange(start, N_k)
+        values = np.abs(view[start:N_k])
+        return modes, values, values
+
+    col_max = np.zeros(n_pixels)
+    col_min = np.full(n_pixels, np.inf)
+    if log_scale:
+        log_lo, log_span = np.log(start), np.log(N_k) - np.log(start)
+        edges = np.exp(log_lo + log_span * np.arange(n_pixels + 1) / n_pixels)
+    else:
+        edges = start + (N_k - start) * np.arange(n_pixels + 1) / n_pixels
+
+    for modes, coeffs in view.iter_blocks(start):
+        m = modes.astype(np.float64)
+        if log_scale:
+            bins = ((np.log(m) - log_lo) * (n_pixels / log_span))
+        else:
+            bins = (m - start) * (n_pixels / (N_k - start))
+        bins = np.minimum(bins.astype(np.int64), n_pixels - 1)
+        values = np.abs(coeffs)
+        _binned_reduce(values, bins, col_max, np.maximum)
+        _binned_reduce(values, bins, col_min, np.minimum)
+
+    filled = np.isfinite(col_min)
+    centers = np.sqrt(edges[:-1] * edges[1:]) if log_scale \
+        else (edges[:-1] + edges[1:]) / 2
+    return centers[filled], col_min[filled], col_max[filled]
+
+
+def draw_stems(ax, x: np.ndarray, heights: np.ndarray, color: str = 'b',
+               marker: str = 'o', markersize: float = 4, label: str = None):
+    """
+    Stem plot as one LineCollection plus one marker line and a baseline.
+
+    Args:
+        ax: Matplotlib axes
+        x, heights: Stem positions and heights
+        color: Stem and marker colour
+        marker: Marker style ('' for none)
+        markersize: Marker size in points
+        label: Legend label
+
+    Returns:
+        The LineCollection of stems
+    """
+    from matplotlib.collections import LineCollection
+
+    segments = np.zeros((len(x), 2, 2))
+    segments[:, :, 0] = np.asarray(x, dtype=np.float64)[:, None]
+    segments[:, 1, 1] = heights
+    stems = LineCollection(segments, colors=color, linewidths=0.8,
+                           label=label)
+    ax.add_collection(stems)
+    if marker:
+        ax.plot(x, heights, linestyle='none', marker=marker, color=color,
+                markersize=markersize)
+    ax.axhline(0, color='k', linewidth=0.8)
+    ax.autoscale_view()
+    return stems
@@ -0,0 +1,309 @@
+"""
+Fourier Spectrum Engine for Prime Wave Theory (PWT)
+
+By Theorem 4.3 the Fourier coefficient
+
+    c_m^{(k)} = φ(N_k/d) μ(N_k/d) / N_k,    d = gcd(m, N_k),
+
+depends on m only through the set S of primes p_i that divide m. Writing
+the divisor class of m as the bitmask Σ_{p_i | m} 2^i, there are at most
+2^k distinct coefficients
+
+    c_S = ∏_{p ∈ S} (1/p) · ∏_{p ∉ S} (-(p - 1)/p),
+
+which are tabulated once. Modes are assigned to classes by residue
+marking (bits[(-start) % p::p] |= 2^i), so no gcd, φ or μ is evaluated per
+mode.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import numpy as np
+from typing import Iterator, Sequence, Tuple
+
+from pwt_profile import PROFILER, profiled
+
+
+# ============================================================================
+# Divisor-Class Table
+# ============================================================================
+
+def _class_dtype(k: int) -> np.dtype:
+    """Smallest unsigned dtype holding a k-bit class mask."""
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if k <= 8 * np.dtype(dtype).itemsize:
+            return np.dtype(dtype)
+    raise ValueError(f"k={k} exceeds 64 divisor-class bits")
+
+
+def class_coefficients(primes: Sequence[int]) -> np.ndarray:
+    """
+    Fourier coefficient of every divisor class.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+
+    Returns:
+        float64 array of length 2^k; entry S is c_m for any m whose set of
+        prime divisors among p_1..p_k has bitmask S
+    """
+    k = len(primes)
+    classes = np.arange(1 << k, dtype=np.int64)
+    table = np.ones(1 << k, dtype=np.float64)
+    for i, p in enumerate(primes):
+        p = int(p)
+        divides = (classes >> i) & 1 == 1
+        table *= np.where(divides, 1.0 / p, -(p - 1) / p)
+    return table
+
+
+def divisor_classes(start: int, stop: int,
+                    primes: Sequence[int]) -> np.ndarray:
+    """
+    Divisor-class bitmask of every mode m in [start, stop).
+
+    Args:
+        start, stop: Mode range (stop exclusive)
+        primes: The primes p_1, ..., p_k
+
+    Returns:
+        Unsigned integer array; bit i is set iff p_i divides m
+    """
+    dtype = _class_dtype(len(primes))
+    bits = np.zeros(max(stop - start, 0), dtype=dtype)
+    PROFILER.count('fourier_coefficients', len(bits))
+    for i, p in enumerate(primes):
+        p = int(p)
+        bits[(-start) % p::p] |= dtype.type(1 << i)
+    return bits
+
+
+# ============================================================================
+# Spectrum
+# ============================================================================
+
+@profiled('spectrum')
+def spectrum(primes: Sequence[int], start: int = 0,
+             stop: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fourier coefficients c_m for modes start <= m < stop.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        start: First mode
+        stop: End mode, exclusive (default N_k, the full period)
+
+    Returns:
+        Tuple (modes, coefficients)
+    """
+    if stop is None:
+        stop = 1
+        for p in primes:
+            stop *= int(p)
+    table = class_coefficients(primes)
+    modes = np.arange(start, stop, dtype=np.int64)
+    return modes, table[divisor_classes(start, stop, primes)]
+
+
+# ============================================================================
+# Lazy Spectrum View
+# ============================================================================
+
+_INT64_MAX = int(np.iinfo(np.int64).max)
+
+
+def _mode_range(lo: int, hi: int) -> np.ndarray:
+    """Modes lo..hi-1 as int64, or as exact Python ints past int64."""
+    if hi - 1 <= _INT64_MAX:
+        return np.arange(lo, hi, dtype=np.int64)
+    return np.arange(hi - lo, dtype=np.int64).astype(object) + lo
+
+
+class SpectrumView:
+    """
+    Compressed, read-only view of the full spectrum c_0, ..., c_{N_k - 1}.
+
+    Only the 2^k divisor-class table is stored: the coefficient of class S
+    is num_S / N_k with the exact integer numerator
+    num_S = φ(N_k/d) μ(N_k/d) = ∏_{p ∉ S} (-(p - 1)). Memory therefore
+    depends on k alone, never on N_k, and modes are resolved on demand.
+
+    Supports view[m] (O(k)), view[a:b:c] and integer-array indexing, which
+    return float64 values, plus class-level aggregates that are computed
+    exactly without visiting any mode.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+    """
+
+    def __init__(self, primes: Sequence[int]):
+        self.primes = [int(p) for p in primes]
+        self.k = len(self.primes)
+        self.N_k = 1
+        for p in self.primes:
+            self.N_k *= p
+
+        # Built by doubling: classes with bit i clear take -(p_i - 1)
+        numerators = np.array([1], dtype=object)
+        for p in self.primes:
+            numerators = np.concatenate([numerators * -(p - 1), numerators])
+        self.numerators = numerators
+        self.table = class_coefficients(self.primes)
+
+    def __repr__(self) -> str:
+        return f"SpectrumView(k={self.k}, N_k={self.N_k})"
+
+    def __len__(self) -> int:
+        # len() is limited to sys.maxsize; use .size for larger N_k
+        return self.N_k
+
+    @property
+    def size(self) -> int:
+        """Number of modes N_k (also valid beyond sys.maxsize)."""
+        return self.N_k
+
+    # ------------------------------------------------------------------
+    # Mode access
+    # ------------------------------------------------------------------
+
+    def class_of(self, m):
+        """
+        Divisor-class bitmask of mode m (int, or int64 / object array).
+
+        Every p_i divides N_k, so m and m ± N_k share a class.
+        """
+        if isinstance(m, np.ndarray):
+            bits = np.zeros(m.shape, dtype=_class_dtype(self.k))
+            for i, p in enumerate(self.primes):
+                residues = np.asarray(m % p, dtype=np.int64)
+                bits[residues == 0] |= bits.dtype.type(1 << i)
+            return bits
+        m = int(m)
+        return sum(1 << i for i, p in enumerate(self.primes) if m % p == 0)
+
+    def numerator(self, m: int) -> int:
+        """Exact integer N_k · c_m = φ(N_k/d) μ(N_k/d)."""
+        return int(self.numerators[self.class_of(self._check(m))])
+
+    def _progression_classes(self, start: int, step: int,
+                             count: int) -> np.ndarray:
+        """
+        Classes of modes start + j·step, 0 <= j < count.
+
+        Residues are taken from the Python ints start and step, so only the
+        int64 offsets j are materialized and modes beyond 2^63 are exact.
+        """
+        j = np.arange(count, dtype=np.int64)
+        bits = np.zeros(count, dtype=_class_dtype(self.k))
+        for i, p in enumerate(self.primes):
+            residues = (start % p + j * (step % p)) % p
+            bits[residues == 0] |= bits.dtype.type(1 << i)
+        return bits
+
+    def _check(self, m: int) -> int:
+        m = int(m)
+        if m < 0:
+            m += self.N_k
+        if not 0 <= m < self.N_k:
+            raise IndexError(f"mode {m} outside [0, {self.N_k})")
+        return m
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.N_k)
+            if step == 1:
+                return self.table[divisor_classes(start, max(start, stop),
+                                                  self.primes)]
+            return self.table[self._progression_classes(
+                start, step, len(range(start, stop, step)))]
+        if isinstance(key, np.ndarray):
+            if key.dtype != object:
+                key = key.astype(np.int64)
+            # Negative keys wrap by N_k, which leaves the class unchanged
+            if key.size and (int(key.min()) < -self.N_k
+                             or int(key.max()) >= self.N_k):
+                raise IndexError("mode index out of range")
+            return self.table[self.class_of(key)]
+        return float(self.table[self.class_of(self._check(key))])
+
+    def iter_blocks(self, start: int = 0, stop: int = None,
+                    block_size: int = 1 << 20
+                    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream (modes, coefficients) over [start, stop) block by block.
+
+        Args:
+            start: First mode
+            stop: End mode, exclusive (default N_k)
+            block_size: Modes per block
+
+        Yields:
+            (modes, coefficients) arrays of at most block_size entries;
+            modes are int64, or exact Python ints (object dtype) for
+            blocks reaching past 2^63 - 1
+        """
+        stop = self.N_k if stop is None else min(stop, self.N_k)
+        for lo in range(start, stop, block_size):
+            hi = min(lo + block_size, stop)
+            yield (_mode_range(lo, hi),
+                   self.table[divisor_classes(lo, hi, self.primes)])
+
+    def iter_nonzero(self, start: int = 0, stop: int = None,
+                     block_size: int = 1 << 20
+                     ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream only modes with c_m != 0, block by block.
+
+        Every class numerator ∏(p - 1) is nonzero, so for the prime wave
+        this visits every mode; the filter is kept so the contract holds
+        for any coefficient table.
+        """
+        dense = bool(np.all(self.table != 0))
+        for modes, coeffs in self.iter_blocks(start, stop, block_size):
+            if not dense:
+                keep = coeffs != 0
+                modes, coeffs = modes[keep], coeffs[keep]
+            yield modes, coeffs
+
+    # ------------------------------------------------------------------
+    # Class aggregates (exact, no mode is visited)
+    # ------------------------------------------------------------------
+
+    def class_counts(self) -> np.ndarray:
+        """
+        Number of modes in each class over one period.
+
+        By CRT, m lies in class S iff p | m for p ∈ S and p ∤ m otherwise,
+        so the count is ∏_{p ∉ S} (p - 1) = |num_S|.
+
+        Returns:
+            Object array of exact ints, length 2^k
+        """
+        return np.abs(self.numerators)
+
+    def class_l1(self) -> np.ndarray:
+        """Σ |c_m| over each class, as float64 (length 2^k)."""
+        counts = self.class_counts().astype(np.float64)
+        return counts * np.abs(self.table)
+
+    def class_l2(self) -> np.ndarray:
+        """Σ c_m^2 over each class, as float64 (length 2^k)."""
+        counts = self.class_counts().astype(np.float64)
+        return counts * self.table ** 2
+
+    def summary(self) -> dict:
+        """Mode count, nonzero count and total L1/L2 mass of the spectrum."""
+        counts = self.class_counts()
+        nonzero = self.numerators != 0
+        return {
+            'k': self.k,
+            'N_k': self.N_k,
+            'classes': len(self.table),
+            'nonzero_modes': int(counts[nonzero].sum()),
+            'l1_mass': float(self.class_l1().sum()),
+            'l2_mass': float(self.class_l2().sum()),
+        }
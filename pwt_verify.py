@@ -0,0 +1,419 @@
+"""
+Verification Engine for Prime Wave Theory (PWT)
+
+Vectorized checks of Theorem 4.7 (No Anomalous Zeros) away from the
+integers. Test points n + δ are generated as whole arrays, one block of
+base integers at a time, evaluated with the closed-form P_k and folded
+into running statistics (count, positives, min/max and where the minimum
+occurs). Raw values are never kept, so dense grids such as every integer
+in [0, N_k) times 1000 offsets run in bounded memory.
+
+The Dirichlet-kernel ratio |sin(πθ)| / |sin(πθ/p)| < p, which bounds every
+pulse away from zero at non-integers, depends only on the offset θ and p.
+It is computed once for the whole offset × prime grid.
+
+Long runs are split into work units over the residues of N_k and recorded
+in a SQLite VerificationStore, so they can be interrupted and resumed and
+their tables rebuilt without recomputation.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import sqlite3
+import time
+
+import numpy as np
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+from pwt_coprime import coprime_mask
+from pwt_profile import profiled
+from pwt_wave import P_k_values
+
+
+# Test points evaluated per block
+DEFAULT_CHUNK_POINTS = 1 << 20
+
+
+# ============================================================================
+# Test-Point Generation
+# ============================================================================
+
+def offset_grid_chunks(bases: Union[np.ndarray, range],
+                       offsets: np.ndarray,
+                       chunk_points: int = DEFAULT_CHUNK_POINTS
+                       ) -> Iterator[np.ndarray]:
+    """
+    Stream the points b + δ for every base b and offset δ.
+
+    Args:
+        bases: Base integers (an array, or a range that is never
+            materialized as a whole)
+        offsets: Fractional offsets δ
+        chunk_points: Approximate number of points per chunk
+
+    Yields:
+        float64 arrays ordered base-major (all offsets of a base together)
+    """
+    offsets = np.asarray(offsets, dtype=np.float64)
+    per_chunk = max(1, chunk_points // max(len(offsets), 1))
+    for i in range(0, len(bases), per_chunk):
+        block = np.asarray(bases[i:i + per_chunk], dtype=np.float64)
+        yield (block[:, None] + offsets[None, :]).reshape(-1)
+
+
+# ============================================================================
+# Reductions
+# ============================================================================
+
+def reduce_P_k(x_chunks: Iterable[np.ndarray], primes: Sequence[int],
+               positive_tol: float = 1e-10) -> dict:
+    """
+    Evaluate P_k over a stream of point blocks, keeping only statistics.
+
+    Args:
+        x_chunks: Iterable of x arrays
+        primes: The primes p_1, ..., p_k
+        positive_tol: Values above this count as strictly positive
+
+    Returns:
+        Dictionary with points, positive count, min/max value and the x
+        at which the minimum occurs
+    """
+    stats = {
+        'points': 0,
+        'positive': 0,
+        'min_value': np.inf,
+        'min_x': None,
+        'max_value': -np.inf,
+    }
+    buf = None
+    for x in x_chunks:
+        if buf is None or len(buf) < len(x):
+            buf = np.empty(len(x))
+        values = P_k_values(x, primes, out=buf[:len(x)])
+        if not len(values):
+            continue
+
+        stats['points'] += len(values)
+        stats['positive'] += int(np.count_nonzero(values > positive_tol))
+        i = int(np.argmin(values))
+        if values[i] < stats['min_value']:
+            stats['min_value'] = float(values[i])
+            stats['min_x'] = float(x[i])
+        stats['max_value'] = max(stats['max_value'], float(values.max()))
+    return stats
+
+
+def ratio_bound(offsets: np.ndarray, primes: Sequence[int],
+                tol: float = 1e-10) -> dict:
+    """
+    Dirichlet-kernel ratio |sin(πθ)| / |sin(πθ/p)| over offsets × primes.
+
+    Args:
+        offsets: Offsets θ
+        primes: Primes p to test
+        tol: Denominators at or below this are skipped
+
+    Returns:
+        Dictionary with the maximum ratio and whether ratio < p held for
+        every tested (θ, p)
+    """
+    theta = np.asarray(offsets, dtype=np.float64)[None, :]
+    p = np.asarray([int(q) for q in primes], dtype=np.float64)[:, None]
+    if not p.size or not theta.size:
+        return {'max_ratio': 0.0, 'bound_holds': True}
+
+    numerator = np.abs(np.sin(np.pi * theta))
+    denominator = np.abs(np.sin(np.pi * theta / p))
+    valid = denominator > tol
+    ratio = np.where(valid, numerator / np.where(valid, denominator, 1.0), 0.0)
+    return {
+        'max_ratio': float(ratio.max()),
+        'bound_holds': bool(np.all(ratio < p)),
+    }
+
+
+@profiled('verify_noninteger')
+def verify_noninteger(primes: Sequence[int], bases: Union[np.ndarray, range],
+                      offsets: np.ndarray, ratio_primes: Sequence[int] = None,
+                      chunk_points: int = DEFAULT_CHUNK_POINTS,
+                      positive_tol: float = 1e-10) -> dict:
+    """
+    Check P_k > 0 on every b + δ and the ratio bound, in one vectorized pass.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        bases: Base integers b
+        offsets: Non-integer offsets δ
+        ratio_primes: Primes for the ratio bound (default: all of primes)
+        chunk_points: Points evaluated per block
+        positive_tol: Values above this count as strictly positive
+
+    Returns:
+        Merged statistics of reduce_P_k and ratio_bound
+    """
+    stats = reduce_P_k(offset_grid_chunks(bases, offsets, chunk_points),
+                       primes, positive_tol)
+    stats.update(ratio_bound(offsets,
+                             primes if ratio_primes is None else ratio_primes))
+    return stats
+
+
+# ============================================================================
+# Checkpointed Verification Runs
+# ============================================================================
+
+# Bump whenever the per-unit computation changes; stored units from other
+# versions are ignored rather than mixed in
+CODE_VERSION = '15.1-vec1'
+
+# Default location of the on-disk result store
+DEFAULT_STORE = 'pwt_verification.sqlite'
+
+# Residues of N_k per work unit for new jobs
+DEFAULT_UNIT_SIZE = 1 << 16
+
+# N_k and the unit bounds exceed SQLite's 64-bit INTEGER from k = 16 on, so
+# they are stored as decimal TEXT (columns without numeric affinity)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    k INTEGER, n_test INTEGER, version TEXT,
+    unit_size INTEGER, n_units INTEGER, N_k TEXT,
+    PRIMARY KEY (k, n_test, version)
+);
+CREATE TABLE IF NOT EXISTS units (
+    k INTEGER, n_test INTEGER, version TEXT, unit INTEGER,
+    lo TEXT, hi TEXT,
+    integers INTEGER, coprime INTEGER, float_mismatches INTEGER,
+    points INTEGER, positive INTEGER,
+    min_value REAL, min_x REAL, max_value REAL, elapsed REAL,
+    PRIMARY KEY (k, n_test, version, unit)
+);
+"""
+
+
+class VerificationStore:
+    """
+    SQLite store of completed verification work units.
+
+    A job is identified by (k, n_test, CODE_VERSION) and split into units
+    of consecutive residues [lo, hi) of N_k. Each finished unit is
+    committed immediately, so an interrupted run loses at most the unit
+    in progress.
+
+    Args:
+        path: Database file (created if missing)
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        self.path = path
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def job(self, k: int, n_test: int, N_k: int,
+            unit_size: int = None) -> dict:
+        """
+        Register a job, or return the existing one with its unit size.
+
+        Args:
+            k, n_test: Job key (together with CODE_VERSION)
+            N_k: Period being verified
+            unit_size: Residues per unit; None keeps the stored size (or
+                DEFAULT_UNIT_SIZE for a new job)
+
+        Raises:
+            ValueError: If the job exists with a different unit size
+        """
+        row = self._conn.execute(
+            "SELECT unit_size, n_units FROM jobs "
+            "WHERE k = ? AND n_test = ? AND version = ?",
+            (k, n_test, CODE_VERSION)).fetchone()
+        if row is None:
+            unit_size = unit_size or DEFAULT_UNIT_SIZE
+            n_units = -(-N_k // unit_size)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)",
+                    (k, n_test, CODE_VERSION, unit_size, n_units,
+                     str(N_k)))
+            return {'unit_size': unit_size, 'n_units': n_units}
+        if unit_size is not None and row[0] != unit_size:
+            raise ValueError(f"Stored job for k={k}, n_test={n_test} uses "
+                             f"unit_size={row[0]}, not {unit_size}")
+        return {'unit_size': row[0], 'n_units': row[1]}
+
+    def done_units(self, k: int, n_test: int) -> set:
+        """Indices of units already stored for the job."""
+        rows = self._conn.execute(
+            "SELECT unit FROM units WHERE k = ? AND n_test = ? AND version = ?",
+            (k, n_test, CODE_VERSION))
+        return {r[0] for r in rows}
+
+    def pending_units(self, k: int, n_test: int,
+                      n_units: int) -> Iterator[int]:
+        """
+        Indices of units not yet stored for the job, in order.
+
+        SQLite returns only the gaps between stored units, so resuming a
+        mostly finished job costs O(outstanding units), not O(n_units).
+        """
+        key = (k, n_test, CODE_VERSION)
+        gaps = self._conn.execute(
+            "SELECT prev + 1, unit FROM ("
+            "SELECT unit, LAG(unit, 1, -1) OVER (ORDER BY unit) AS prev "
+            "FROM units WHERE k = ? AND n_test = ? AND version = ?) "
+            "WHERE unit > prev + 1 ORDER BY unit", key).fetchall()
+        last = self._conn.execute(
+            "SELECT MAX(unit) FROM units "
+            "WHERE k = ? AND n_test = ? AND version = ?", key).fetchone()[0]
+        for start, stop in gaps:
+            yield from range(start, stop)
+        yield from range(0 if last is None else last + 1, n_units)
+
+    def record(self, k: int, n_test: int, unit: int, result: dict):
+        """Commit one finished unit."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO units VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (k, n_test, CODE_VERSION, unit, str(result['lo']),
+                 str(result['hi']),
+                 result['integers'], result['coprime'],
+                 result['float_mismatches'], result['points'],
+                 result['positive'], result['min_value'], result['min_x'],
+                 result['max_value'], result['elapsed']))
+
+    def aggregate(self, k: int, n_test: int) -> Optional[dict]:
+        """
+        Combine the stored units of a job without recomputing anything.
+
+        Returns:
+            Aggregated counts and extrema plus completion status, or None
+            if the job is unknown
+        """
+        job = self._conn.execute(
+            "SELECT n_units, N_k FROM jobs "
+            "WHERE k = ? AND n_test = ? AND version = ?",
+            (k, n_test, CODE_VERSION)).fetchone()
+        if job is None:
+            return None
+        row = self._conn.execute(
+            "SELECT COUNT(*), SUM(integers), SUM(coprime), "
+            "SUM(float_mismatches), SUM(points), SUM(positive), "
+            "MIN(min_value), MAX(max_value), SUM(elapsed) FROM units "
+            "WHERE k = ? AND n_test = ? AND version = ?",
+            (k, n_test, CODE_VERSION)).fetchone()
+        argmin = self._conn.execute(
+            "SELECT min_x FROM units WHERE k = ? AND n_test = ? "
+            "AND version = ? ORDER BY min_value LIMIT 1",
+            (k, n_test, CODE_VERSION)).fetchone()
+        units_done = row[0]
+        integers = row[1] or 0
+        coprime = row[2] or 0
+        return {
+            'k': k,
+            'n_test': n_test,
+            'version': CODE_VERSION,
+            'N_k': int(job[1]),
+            'units_done': units_done,
+            'units_total': job[0],
+            'complete': units_done == job[0],
+            'integers_checked': integers,
+            'integer_zeros': integers - coprime,
+            'integer_coprime': coprime,
+            'integer_float_mismatches': row[3] or 0,
+            'noninteger_points': row[4] or 0,
+            'noninteger_positive': row[5] or 0,
+            'noninteger_min_value': row[6],
+            'noninteger_min_x': argmin[0] if argmin else None,
+            'noninteger_max_value': row[7],
+            'elapsed': row[8] or 0.0,
+        }
+
+
+@profiled('verify_unit')
+def verify_unit(primes: Sequence[int], lo: int, hi: int,
+                offsets: np.ndarray, positive_tol: float = 1e-10) -> dict:
+    """
+    Verify Theorem 4.7 on the residues lo <= n < hi.
+
+    Integers: exact coprimality count and float-path mismatches against
+    it. Non-integers: every n + δ, reduced to statistics.
+
+    Returns:
+        Dictionary of per-unit counts and extrema
+    """
+    t0 = time.perf_counter()
+    mask = coprime_mask(lo, hi, primes)
+    n = np.arange(lo, hi, dtype=np.float64)
+    P_n = P_k_values(n, primes)
+    mismatches = np.abs(P_n - mask) >= positive_tol
+
+    stats = reduce_P_k(offset_grid_chunks(range(lo, hi), offsets),
+                       primes, positive_tol)
+    return {
+        'lo': lo,
+        'hi': hi,
+        'integers': hi - lo,
+        'coprime': int(np.count_nonzero(mask)),
+        'float_mismatches': int(np.count_nonzero(mismatches)),
+        'points': stats['points'],
+        'positive': stats['positive'],
+        'min_value': stats['min_value'],
+        'min_x': stats['min_x'],
+        'max_value': stats['max_value'],
+        'elapsed': time.perf_counter() - t0,
+    }
+
+
+def run_verification(primes: Sequence[int], n_test: int,
+                     store: VerificationStore, unit_size: int = None,
+                     max_units: int = None) -> dict:
+    """
+    Run (or resume) the full verification of P_k over one period.
+
+    Units already in the store are skipped, so calling this again after an
+    interruption continues where the previous run stopped.
+
+    Args:
+        primes: The primes p_1, ..., p_k
+        n_test: Offsets per integer, np.linspace(0.1, 0.9, n_test)
+        store: Result store
+        unit_size: Residues per work unit (fixed for the life of a job;
+            None reuses the stored size)
+        max_units: Stop after this many new units (None = run to the end)
+
+    Returns:
+        store.aggregate(k, n_test) after the run
+    """
+    k = len(primes)
+    N_k = 1
+    for p in primes:
+        N_k *= int(p)
+    job = store.job(k, n_test, N_k, unit_size)
+    unit_size = job['unit_size']
+    offsets = np.linspace(0.1, 0.9, n_test)
+
+    ran = 0
+    for unit in store.pending_units(k, n_test, job['n_units']):
+        if max_units is not None and ran >= max_units:
+            break
+        lo = unit * unit_size
+        hi = min(lo + unit_size, N_k)
+        store.record(k, n_test, unit, verify_unit(primes, lo, hi, offsets))
+        ran += 1
+    return store.aggregate(k, n_test)
@@ -0,0 +1,414 @@
+"""
+Prime Wave Evaluation Engine for Prime Wave Theory (PWT)
+
+Closed-form evaluation of the Prime Pulse Ψ_p and the Combined Prime Wave
+P_k used by PWT-V15.py. The cosine sum in Definition 3.1 is a Dirichlet
+kernel,
+
+    Σ_{j=0}^{p-1} cos(2πjx/p) = sin(2πx)/2 · cot(πx/p) + sin²(πx),
+
+so each Ψ_p costs a single tan() per point instead of p cosines. The
+sin(2πx) and sin²(πx) factors do not depend on p and are computed once per
+point for all primes. Arguments are reduced exactly to [-p/2, p/2] before
+any trigonometry, so integer inputs hit the removable singularities
+exactly: Ψ_p(n) = 0 when p | n and 1 otherwise.
+
+Evaluation runs over fixed-size blocks with preallocated work space, and
+stream_P_k extends that to sample sets far larger than memory by yielding
+results chunk by chunk into reusable output buffers.
+
+Author: Tusk
+License: MIT (for research use)
+
+Dependencies:
+    numpy >= 1.21.0
+"""
+
+import os
+import time
+from concurrent.futures import Executor
+
+import numpy as np
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+from pwt_profile import PROFILER, profiled
+
+
+# Pulses multiplied together before each log (2^16 cannot overflow)
+LOG_GROUP = 16
+
+# Points evaluated per block; keeps the work space resident in cache
+BLOCK_SIZE = 1 << 16
+
+# Points per chunk handed out by the streaming evaluator
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+# ============================================================================
+# Closed-Form Prime Pulse
+# ============================================================================
+
+def _point_terms(x: np.ndarray, ax: np.ndarray, half_sin2: np.ndarray,
+                 sin_sq: np.ndarray):
+    """
+    Per-point quantities shared by every prime, written into the buffers.
+
+    Ψ_p is even in x, so |x| is used throughout. The fractional part is
+    reduced to [-1/2, 1/2] with rint, which is exact and far cheaper than
+    np.fmod.
+    """
+    np.abs(x, out=ax)
+    np.rint(ax, out=sin_sq)
+    np.subtract(ax, sin_sq, out=sin_sq)
+    np.multiply(sin_sq, 2 * np.pi, out=half_sin2)
+    np.sin(half_sin2, out=half_sin2)
+    half_sin2 *= 0.5
+    sin_sq *= np.pi
+    np.sin(sin_sq, out=sin_sq)
+    sin_sq *= sin_sq
+
+
+def _psi_from_terms(ax: np.ndarray, half_sin2: np.ndarray,
+                    sin_sq: np.ndarray, p: int, out: np.ndarray) -> np.ndarray:
+    """Ψ_p written into `out` from the shared per-point terms."""
+    # r = x - p*rint(x/p) ∈ [-p/2, p/2] is exact (q*p < 2^53 and the
+    # subtraction cancels), and tan(πr/p) = 0 only when p | x
+    np.multiply(ax, 1.0 / p, out=out)
+    np.rint(out, out=out)
+    out *= -p
+    out += ax
+    out *= np.pi / p
+    np.tan(out, out=out)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(half_sin2, out, out=out)
+    out += sin_sq
+    out *= -1.0 / p
+    out += 1.0
+
+    # 0/0 at multiples of p is the removable singularity Ψ_p = 0;
+    # fmax maps that NaN to 0 and clips rounding below 0
+    np.fmax(out, 0.0, out=out)
+    return out
+
+
+def psi_p(x: np.ndarray, p: int, out: np.ndarray = None) -> np.ndarray:
+    """
+    Continuous Prime Pulse Ψ_p(x) in O(1) work per point.
+
+    Args:
+        x: Array of real numbers
+        p: Prime number
+        out: Optional float64 output array of the same shape as x
+
+    Returns:
+        Array of Ψ_p(x) values
+    """
+    x = np.asarray(x, dtype=np.float64)
+    if out is None:
+        out = np.empty(x.shape)
+    ax, half_sin2, sin_sq = (np.empty_like(x) for _ in range(3))
+    _point_terms(x, ax, half_sin2, sin_sq)
+    return _psi_from_terms(ax, half_sin2, sin_sq, int(p), out)
+
+
+# ============================================================================
+# Log-Domain Combined Prime Wave
+# ============================================================================
+
+def _log_P_k_block(x: np.ndarray, primes: List[int], out: np.ndarray,
+                   scratch: np.ndarray) -> np.ndarray:
+    """log P_k over one block, using five rows of `scratch` as work space."""
+    n = len(x)
+    ax, half_sin2, sin_sq, psi, group = (row[:n] for row in scratch[:5])
+    _point_terms(x, ax, half_sin2, sin_sq)
+    out.fill(0.0)
+
+    with np.errstate(divide='ignore'):
+        for start in range(0, len(primes), LOG_GROUP):
+            group.fill(1.0)
+            for p in primes[start:start + LOG_GROUP]:
+                group *= _psi_from_terms(ax, half_sin2, sin_sq, p, psi)
+            np.log(group, out=group)
+            out += group
+    return out
+
+
+def _evaluate(x: np.ndarray, primes: Sequence[int], out: np.ndarray,
+              dtype, exponentiate: bool) -> np.ndarray:
+    """Blocked driver shared by log_P_k and P_k_values."""
+    x = np.asarray(x)
+    if out is None:
+        out = np.empty(x.shape, dtype=dtype)
+    if out.dtype not in (np.float32, np.float64) or not out.flags.c_contiguous:
+        raise ValueError("out must be a C-contiguous float32/float64 array")
+    if out.shape != x.shape:
+        raise ValueError(f"out has shape {out.shape}, expected {x.shape}")
+    flat_x = x.reshape(-1)
+    flat_out = out.reshape(-1)
+    PROFILER.count('wave_points', flat_x.size)
+
+    # float32 output is computed in a float64 block and cast on store
+    direct = out.dtype == np.float64
+    primes = [int(p) for p in primes]
+    scratch = np.empty((5 if direct else 6,
+                        min(BLOCK_SIZE, max(flat_x.size, 1))))
+    for start in range(0, flat_x.size, BLOCK_SIZE):
+        stop = min(start + BLOCK_SIZE, flat_x.size)
+        target = flat_out[start:stop] if direct else scratch[5, :stop - start]
+        _log_P_k_block(flat_x[start:stop], primes, target, scratch)
+        if exponentiate:
+            np.exp(target, out=target)
+        if not direct:
+            flat_out[start:stop] = target
+    return out
+
+
+@profiled('P_k')
+def log_P_k(x: np.ndarray, primes: Sequence[int], out: np.ndarray = None,
+            dtype=np.float64) -> np.ndarray:
+    """
+    log P_k(x) = Σ_p log Ψ_p(x), accumulated in place.
+
+    Ψ_p ≤ 2, so up to LOG_GROUP pulses are multiplied in the linear domain
+    before one log is taken per group; only values already below the
+    float64 range underflow to a zero. Zeros of P_k come out as -inf.
+    Points are processed in cache-sized blocks of BLOCK_SIZE, so the work
+    space is a few blocks regardless of len(x).
+
+    Args:
+        x: Array of real numbers
+        primes: The primes p_1, ..., p_k
+        out: Optional C-contiguous float32/float64 array shaped like x
+        dtype: Output dtype when out is not given
+
+    Returns:
+        Array of log P_k(x) values
+    """
+    return _evaluate(x, primes, out, dtype, exponentiate=False)
+
+
+@profiled('P_k')
+def P_k_values(x: np.ndarray, primes: Sequence[int], out: np.ndarray = None,
+               dtype=np.float64) -> np.ndarray:
+    """
+    Combined Prime Wave P_k(x) = exp(Σ_p log Ψ_p(x)).
+
+    Args:
+        x: Array of real numbers
+        primes: The primes p_1, ..., p_k
+        out: Optional C-contiguous float32/float64 array shaped like x
+        dtype: Output dtype when out is not given
+
+    Returns:
+        Array of P_k(x) values
+    """
+    return _evaluate(x, primes, out, dtype, exponentiate=True)
+
+
+# ============================================================================
+# Streaming Evaluation
+# ============================================================================
+
+def _grid_points(start: float, stop: float, num: int, first: int, last: int,
+                 endpoint: bool = True) -> np.ndarray:
+    """Points first..last-1 of np.linspace(start, stop, num, endpoint)."""
+    div = (num - 1) if endpoint else num
+    step = (stop - start) / div if div > 0 else 0.0
+    x = np.arange(first, last, dtype=np.float64)
+    x *= step
+    x += start
+    if endpoint and num > 1 and last == num:
+        x[-1] = stop
+    return x
+
+
+def linspace_blocks(start: float, stop: float, num: int,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    endpoint: bool = True) -> Iterator[np.ndarray]:
+    """
+    The points of np.linspace(start, stop, num), chunk by chunk.
+
+    Only one chunk is alive at a time, so num may far exceed memory.
+
+    Args:
+        start, stop: Interval end points
+        num: Total number of points
+        chunk_size: Points per yielded chunk
+        endpoint: Whether stop is the last point (as in np.linspace)
+
+    Yields:
+        float64 arrays of at most chunk_size points
+    """
+    for i in range(0, num, chunk_size):
+        yield _grid_points(start, stop, num, i, min(i + chunk_size, num),
+                           endpoint)
+
+
+def stream_P_k(x_source: Union[Tuple[float, float, int], Iterable[np.ndarray]],
+               primes: Sequence[int], out=None, dtype=np.float64,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, log: bool = False
+               ) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Evaluate P_k chunk by chunk with a fixed memory ceiling.
+
+    Output buffers are reused: each yielded array is a view into `out` (or
+    an internal buffer) and is overwritten on a later iteration, so consume
+    or copy it before advancing. Passing several buffers cycles through
+    them, which allows one chunk to be handed off while the next is filled.
+
+    Args:
+        x_source: (start, stop, num) for an implicit np.linspace grid, or any
+            iterable of 1-D x arrays
+        primes: The primes p_1, ..., p_k
+        out: Output buffer, or a list of buffers used round-robin; each must
+            hold at least one chunk. Allocated once if None.
+        dtype: float64 or float32, used when out is None
+        chunk_size: Points per chunk for (start, stop, num) sources
+        log: Yield log P_k instead of P_k
+
+    Yields:
+        (offset, values) where offset is the index of values[0] in the
+        overall sample sequence
+    """
+    if isinstance(x_source, tuple):
+        x_source = linspace_blocks(*x_source, chunk_size=chunk_size)
+    if out is None:
+        out = np.empty(chunk_size, dtype=dtype)
+    buffers = out if isinstance(out, (list, tuple)) else [out]
+
+    offset = 0
+    for i, x in enumerate(x_source):
+        x = np.asarray(x).reshape(-1)
+        buf = buffers[i % len(buffers)]
+        if len(x) > len(buf):
+            raise ValueError(f"Chunk of {len(x)} points exceeds buffer of "
+                             f"{len(buf)}")
+        values = _evaluate(x, primes, buf[:len(x)], buf.dtype,
+                           exponentiate=not log)
+        yield offset, values
+        offset += len(x)
+
+
+# ============================================================================
+# Parallel Evaluation
+# ============================================================================
+
+def _parallel_worker(x_spec, out_spec, primes: List[int], first: int,
+                     last: int, log: bool) -> float:
+    """
+    Evaluate samples first..last-1 straight into shared memory.
+
+    x_spec is either ('grid', start, stop, num) or ('shm', name, dtype, n);
+    out_spec is (name, dtype, n). Only these descriptors are pickled.
+
+    Returns:
+        Seconds spent in this task
+    """
+    from multiprocessing import shared_memory
+
+    t0 = time.perf_counter()
+    handles = []
+    try:
+        out_shm = shared_memory.SharedMemory(name=out_spec[0])
+        handles.append(out_shm)
+        out = np.ndarray(out_spec[2], dtype=out_spec[1], buffer=out_shm.buf)
+
+        if x_spec[0] == 'grid':
+            x = _grid_points(*x_spec[1:], first, last)
+        else:
+            x_shm = shared_memory.SharedMemory(name=x_spec[1])
+            handles.append(x_shm)
+            x = np.ndarray(x_spec[3], dtype=x_spec[2], buffer=x_shm.buf)
+            x = x[first:last]
+
+        _evaluate(x, primes, out[first:last], out.dtype,
+                  exponentiate=not log)
+        del x, out
+    finally:
+        for shm in handles:
+            shm.close()
+    return time.perf_counter() - t0
+
+
+@profiled('parallel_P_k')
+def parallel_P_k(x_source: Union[np.ndarray, Tuple[float, float, int]],
+                 primes: Sequence[int], workers: int = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, dtype=np.float64,
+                 log: bool = False, executor: Executor = None
+                 ) -> Tuple[np.ndarray, dict]:
+    """
+    Evaluate P_k across a process pool, with x and the result held in
+    multiprocessing.shared_memory so no sample data is pickled.
+
+    The sample range is split into tasks of chunk_size points that workers
+    pull as they finish, which keeps the load balanced. A (start, stop, num)
+    source is generated inside the workers and needs no input buffer.
+
+    Args:
+        x_source: Array of x values, or (start, stop, num) for a linspace grid
+        primes: The primes p_1, ..., p_k
+        workers: Number of processes (default: os.cpu_count())
+        chunk_size: Points per task
+        dtype: np.float64 or np.float32 output
+        log: Return log P_k instead of P_k
+        executor: Optional existing process pool to reuse across calls
+
+    Returns:
+        Tuple (values, stats) where stats holds wall time, summed task time,
+        throughput and scaling efficiency (task time / (wall * workers))
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+
+    workers = workers or os.cpu_count() or 1
+    primes = [int(p) for p in primes]
+    shms = []
+    try:
+        if isinstance(x_source, tuple):
+            n = int(x_source[2])
+            x_spec = ('grid',) + tuple(x_source)
+        else:
+            x = np.ascontiguousarray(x_source, dtype=np.float64).reshape(-1)
+            n = len(x)
+            x_shm = shared_memory.SharedMemory(create=True,
+                                               size=max(x.nbytes, 1))
+            shms.append(x_shm)
+            np.ndarray(n, dtype=x.dtype, buffer=x_shm.buf)[:] = x
+            x_spec = ('shm', x_shm.name, x.dtype.str, n)
+
+        dtype = np.dtype(dtype)
+        out_shm = shared_memory.SharedMemory(create=True,
+                                             size=max(n * dtype.itemsize, 1))
+        shms.append(out_shm)
+        out_spec = (out_shm.name, dtype.str, n)
+
+        pool = executor or ProcessPoolExecutor(max_workers=workers)
+        t0 = time.perf_counter()
+        try:
+            tasks = [pool.submit(_parallel_worker, x_spec, out_spec, primes,
+                                 first, min(first + chunk_size, n), log)
+                     for first in range(0, n, chunk_size)]
+            task_time = sum(task.result() for task in tasks)
+        finally:
+            if executor is None:
+                pool.shutdown()
+        wall = time.perf_counter() - t0
+        PROFILER.count('wave_points', n)
+
+        values = np.ndarray(n, dtype=dtype, buffer=out_shm.buf).copy()
+    finally:
+        for shm in shms:
+            shm.close()
+            shm.unlink()
+
+    stats = {
+        'workers': workers,
+        'tasks': len(tasks),
+        'points': n,
+        'wall_time': wall,
+        'task_time': task_time,
+        'points_per_second': n / wall if wall > 0 else float('inf'),
+        'efficiency': task_time / (wall * workers) if wall > 0 else 1.0,
+    }
+    return values, stats
@@ -0,0 +1,22 @@
+"""Make the repository's top-level modules importable from the tests."""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+
+@pytest.fixture(scope='session')
+def pwt_v15():
+    """PWT-V15.py as a module, registered so process pools can pickle it."""
+    if 'pwt_v15' not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            'pwt_v15', os.path.join(REPO, 'PWT-V15.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules['pwt_v15'] = module
+        spec.loader.exec_module(module)
+    return sys.modules['pwt_v15']
@@ -0,0 +1,41 @@
+"""pwt_arith tables against sympy."""
+
+import numpy as np
+import pytest
+import sympy
+
+from pwt_arith import (ArithmeticTables, arithmetic_tables, factor_over,
+                       mobius_squarefree, phi_squarefree)
+
+
+def test_tables_match_sympy():
+    tables = ArithmeticTables(5000)
+    n = np.arange(2, 5001)
+    assert tables.smallest_prime_factor(n).tolist() == \
+        [min(sympy.primefactors(int(v))) for v in n]
+    assert tables.phi(n).tolist() == [sympy.totient(int(v)) for v in n]
+    assert tables.mobius(n).tolist() == [sympy.mobius(int(v)) for v in n]
+    assert tables.omega(n).tolist() == \
+        [len(sympy.primefactors(int(v))) for v in n]
+    for v in (1, 2, 360, 4096, 4999, 5000):
+        assert tables.factorize(v) == sympy.factorint(v)
+    assert (tables.phi(1), tables.mobius(1), tables.omega(1)) == (1, 1, 0)
+    with pytest.raises(ValueError):
+        tables.phi(5001)
+
+
+def test_shared_tables_grow():
+    small = arithmetic_tables(100)
+    assert arithmetic_tables(50) is small
+    assert arithmetic_tables(small.bound + 1).bound >= 2 * small.bound
+
+
+def test_squarefree_products():
+    primes = [2, 3, 5, 7, 11, 13]
+    N = 30030
+    assert phi_squarefree(primes) == sympy.totient(N)
+    assert mobius_squarefree(primes) == sympy.mobius(N)
+    assert mobius_squarefree(primes[:3]) == sympy.mobius(30)
+    assert factor_over(2 ** 5 * 7 * 13 ** 2, primes) == {2: 5, 7: 1, 13: 2}
+    assert factor_over(1, primes) == {}
+    assert factor_over(2 * 17, primes) is None
@@ -0,0 +1,32 @@
+"""Headless batch figure generation of PWT-V15."""
+
+import json
+import os
+
+import pytest
+
+
+def test_parse_k_values(pwt_v15):
+    assert pwt_v15.parse_k_values('3,5,7') == [3, 5, 7]
+    assert pwt_v15.parse_k_values('3-5,8, 4') == [3, 4, 5, 8]
+    with pytest.raises(ValueError):
+        pwt_v15.parse_k_values('0-2')
+
+
+def test_run_batch_writes_every_figure(pwt_v15, tmp_path):
+    pytest.importorskip('matplotlib')
+    results = pwt_v15.run_batch([4, 3], formats=('pdf', 'svg'),
+                                out_dir=str(tmp_path), workers=2, n_test=10)
+    assert [r['k'] for r in results] == [3, 4]
+    for r in results:
+        k = r['k']
+        expected = {f'P{k}_wave_plot.pdf', f'P{k}_wave_plot.svg',
+                    f'P{k}_fourier_spectrum.pdf',
+                    f'P{k}_fourier_spectrum.svg', f'P{k}_verification.json'}
+        assert {os.path.basename(f) for f in r['files']} == expected
+        assert all(os.path.getsize(f) > 0 for f in r['files'])
+        assert set(r['timings']) == {'wave', 'spectrum', 'verify', 'total'}
+        with open(tmp_path / f'P{k}_verification.json') as f:
+            stored = json.load(f)
+        reference = pwt_v15.verify_zero_set(k, n_test=10)
+        assert {key: stored[key] for key in reference} == reference
@@ -0,0 +1,50 @@
+"""Hot-path benchmark grid, a tiny end-to-end run and regression checks."""
+
+import os
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'benchmarks')
+sys.path.insert(0, BENCHMARKS)
+
+import bench_hot_paths as bench  # noqa: E402
+
+
+def test_build_cases():
+    cases = bench.build_cases([3, 9], [10, 20], max_period=1000)
+    labels = [bench._label(c) for c in cases]
+    assert 'sieve_of_eratosthenes n=200' in labels
+    assert 'P_k_vectorized k=9 n=20' in labels
+    # Whole-period cases only where N_k <= max_period
+    assert 'verify_zero_set k=3' in labels
+    assert 'verify_zero_set k=9' not in labels
+    assert {c['function'] for c in bench.build_cases(
+        [3], [10], functions=['sieve_of_eratosthenes'])} == \
+        {'sieve_of_eratosthenes'}
+
+
+def test_run_suite_and_compare():
+    cases = bench.build_cases([3], [1000], functions=['P_k_vectorized',
+                                                       'verify_zero_set'])
+    report = bench.run_suite(cases, repeat=1, verbose=False)
+    assert [bench._label(r) for r in report['results']] == \
+        ['P_k_vectorized k=3 n=1000', 'verify_zero_set k=3']
+    for r in report['results']:
+        assert r['time_min'] > 0 and r['alloc_peak_bytes'] > 0
+    assert bench.compare(report, report) == []
+
+
+def test_compare_flags_regressions_above_noise():
+    def report(time_min, rss):
+        return {'results': [{'function': 'f', 'k': 3, 'size': 10,
+                             'time_min': time_min, 'peak_rss_bytes': rss}]}
+
+    baseline = report(0.010, 10 << 20)
+    assert bench.compare(report(0.012, 11 << 20), baseline) == []
+    # Relative growth above threshold but below the absolute noise floor
+    assert bench.compare(report(0.0001, 10 << 20), report(0.00005, 10 << 20)) \
+        == []
+    regressions = bench.compare(report(0.020, 20 << 20), baseline)
+    assert {r['metric'] for r in regressions} == {'time_min',
+                                                  'peak_rss_bytes'}
+    assert regressions[0]['ratio'] == 2.0
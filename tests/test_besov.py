@@ -0,0 +1,33 @@
+"""Default Besov grid size stays bounded as k grows."""
+
+import numpy as np
+
+from pwt_besov import (DEFAULT_MAX_SAMPLES, default_n_samples,
+                       modulus_of_continuity)
+from pwt_primes import PRIME_CACHE
+
+
+def test_default_grid_is_capped():
+    assert default_n_samples(PRIME_CACHE.primes(3)) < DEFAULT_MAX_SAMPLES
+    for k in (6, 8, 12):
+        assert default_n_samples(PRIME_CACHE.primes(k)) == DEFAULT_MAX_SAMPLES
+
+
+def test_capped_grid_matches_full_grid():
+    primes = PRIME_CACHE.primes(5)
+    h = [0.01, 0.1]
+    full = modulus_of_continuity(primes, 80000, h, p_values=[2.0])
+    capped = modulus_of_continuity(primes, 10000, h, p_values=[2.0])
+    assert full['method'] == 'spectral' and capped['method'] == 'crt'
+    np.testing.assert_allclose(capped['norms'], full['norms'], rtol=1e-9)
+    odd = modulus_of_continuity(primes, 10000, h, p_values=[1.5])
+    assert odd['method'] == 'direct'
+
+
+def test_crt_matches_spectral():
+    primes = PRIME_CACHE.primes(4)
+    h = [0.001, 0.01, 0.3]
+    kwargs = {'orders': (1, 2, 3), 'p_values': [2.0, 4.0]}
+    exact = modulus_of_continuity(primes, 20000, h, method='spectral', **kwargs)
+    crt = modulus_of_continuity(primes, 20000, h, method='crt', **kwargs)
+    np.testing.assert_allclose(crt['norms'], exact['norms'], rtol=1e-7)
@@ -0,0 +1,106 @@
+"""pwt_codons against a plain string-slicing reference."""
+
+import gzip
+import random
+from collections import Counter
+from itertools import product
+
+import pytest
+
+import pwt_codons
+
+
+STANDARD_CODE = dict(zip((''.join(c) for c in product('TCAG', repeat=3)),
+                         'FFLLSSSSYY**CC*WLLLLPPPPHHQQRRRR'
+                         'IIIMTTTTNNKKSSRRVVVVAAAADDEEGGGG'))
+
+
+def reference_counts(seq):
+    """Per-frame Counter of codons, ambiguous ones under 'AMB'."""
+    frames = [Counter() for _ in range(3)]
+    for f in range(3):
+        for i in range(f, len(seq) - 2, 3):
+            codon = seq[i:i + 3].upper().replace('U', 'T')
+            frames[f]['AMB' if set(codon) - set('ACGT') else codon] += 1
+    return frames
+
+
+def assert_matches(counts, frames):
+    for f in range(3):
+        expected = {k: v for k, v in frames[f].items() if k != 'AMB'}
+        assert counts.codons(f) == expected
+        assert counts.counts[f, pwt_codons.AMBIGUOUS] == frames[f]['AMB']
+
+
+@pytest.fixture
+def records():
+    rng = random.Random(1)
+    return [(f'chr{r}', ''.join(rng.choice('ACGTacgtN')
+                                for _ in range(rng.randint(0, 3000))))
+            for r in range(4)]
+
+
+@pytest.fixture
+def fasta(tmp_path, records):
+    path = tmp_path / 't.fa'
+    with open(path, 'w') as f:
+        for name, seq in records:
+            f.write(f'>{name} description\n')
+            for i in range(0, len(seq), 61):
+                f.write(seq[i:i + 61] + '\n')
+    return str(path)
+
+
+# Odd and non-page-multiple chunk sizes split codons and pages anywhere
+@pytest.mark.parametrize('chunk_size', [7, 1000, 4097, 1 << 22])
+def test_fasta_counts(fasta, records, chunk_size):
+    results = pwt_codons.count_codons(fasta, chunk_size=chunk_size)
+    assert [c.name for c in results] == [name for name, _ in records]
+    for counts, (_, seq) in zip(results, records):
+        assert counts.length == len(seq)
+        assert_matches(counts, reference_counts(seq))
+
+
+def test_gzip_and_pooled(fasta, records, tmp_path):
+    gz = str(tmp_path / 't.fa.gz')
+    with open(fasta, 'rb') as src, gzip.open(gz, 'wb') as dst:
+        dst.write(src.read())
+    results = pwt_codons.count_codons(gz, chunk_size=100)
+    for counts, (_, seq) in zip(results, records):
+        assert_matches(counts, reference_counts(seq))
+
+    pooled, = pwt_codons.count_codons(fasta, chunk_size=50, per_record=False)
+    assert (pooled.counts == sum(c.counts for c in results)).all()
+    assert pooled.records == len(records)
+
+
+@pytest.mark.parametrize('chunk_size', [5, 1000, 1 << 22])
+def test_fastq_counts(tmp_path, chunk_size):
+    rng = random.Random(2)
+    reads = [''.join(rng.choice('ACGTN') for _ in range(rng.randint(0, 40)))
+             for _ in range(300)]
+    path = tmp_path / 't.fq'
+    with open(path, 'w', newline='') as f:
+        for i, read in enumerate(reads):
+            end = '\r\n' if i % 2 else '\n'
+            f.write(f'@r{i}{end}{read}{end}+{end}{"I" * len(read)}{end}')
+
+    counts, = pwt_codons.count_codons(str(path), chunk_size=chunk_size)
+    frames = [Counter() for _ in range(3)]
+    for read in reads:
+        for f, c in enumerate(reference_counts(read)):
+            frames[f] += c
+    assert counts.records == len(reads)
+    assert counts.length == sum(map(len, reads))
+    assert_matches(counts, frames)
+
+
+def test_lazy_translation(fasta, records):
+    protein = ''.join(p for _, p in pwt_codons.iter_protein(fasta, frame=1,
+                                                            chunk_size=33))
+    expected = ''.join(
+        ''.join(STANDARD_CODE.get(seq[i:i + 3].upper(), 'X')
+                for i in range(1, len(seq) - 2, 3))
+        for _, seq in records)
+    assert protein == expected
+    assert pwt_codons.translate_head('ATGGCCTAA', 2) == 'MA'
@@ -0,0 +1,39 @@
+"""pwt_coprime indicators against np.gcd and φ(N_k)."""
+
+import numpy as np
+import sympy
+
+from pwt_coprime import (coprime_bitmap, coprime_mask, count_coprime,
+                         iter_coprime_blocks, P_k_integers)
+from pwt_primes import PRIME_CACHE
+
+
+def test_count_coprime_is_phi():
+    for k in (1, 3, 6, 8):
+        primes = PRIME_CACHE.primes(k)
+        N_k = PRIME_CACHE.primorial(k)
+        assert count_coprime(0, N_k, primes) == sympy.totient(N_k)
+        # Any window of one full period has the same count
+        assert count_coprime(12345, 12345 + N_k, primes) == sympy.totient(N_k)
+
+
+def test_mask_and_bitmap_match_gcd():
+    # Nine primes: the wheel takes seven, the rest are crossed off
+    primes = PRIME_CACHE.primes(9)
+    N_k = PRIME_CACHE.primorial(9)
+    for start, stop in [(0, 1000), (N_k - 500, N_k + 700),
+                        (10 ** 12, 10 ** 12 + 4099)]:
+        n = np.arange(start, stop, dtype=np.int64)
+        expected = np.gcd(n, N_k) == 1
+        np.testing.assert_array_equal(coprime_mask(start, stop, primes),
+                                      expected)
+        bits = coprime_bitmap(start, stop, primes, block_size=104)
+        np.testing.assert_array_equal(
+            np.unpackbits(bits, bitorder='little')[:len(n)], expected)
+        blocks = [(lo, mask.copy()) for lo, mask in
+                  iter_coprime_blocks(start, stop, primes, block_size=333)]
+        assert [lo for lo, _ in blocks] == list(range(start, stop, 333))
+        np.testing.assert_array_equal(
+            np.concatenate([mask for _, mask in blocks]), expected)
+        np.testing.assert_array_equal(P_k_integers(n, primes),
+                                      expected.astype(np.float64))
@@ -0,0 +1,109 @@
+"""Export round-trips for samples, spectra and verification records."""
+
+import numpy as np
+import pytest
+
+from pwt_export import (FORMATS, export_spectrum, export_wave, open_table,
+                        open_writer, wave_chunks, write_records,
+                        write_tables)
+from pwt_primes import PRIME_CACHE
+from pwt_spectrum import SpectrumView, spectrum
+from pwt_wave import P_k_values
+
+
+def columns(table, fmt):
+    """Reopened table as {column: ndarray}."""
+    if fmt == 'npy':
+        names = table.dtype.names or ('c_m',)
+        return {n: np.asarray(table[n] if table.dtype.names else table)
+                for n in names}
+    if fmt == 'npz':
+        return {n: table[n] for n in table.files}
+    if fmt == 'jsonl':
+        return {n: np.array([row[n] for row in table]) for n in table[0]}
+    return {n: table.column(n).to_numpy() for n in table.column_names}
+
+
+@pytest.mark.parametrize('fmt', FORMATS)
+def test_wave_and_spectrum_round_trip(fmt, tmp_path):
+    if fmt in ('parquet', 'arrow'):
+        pytest.importorskip('pyarrow')
+    primes = PRIME_CACHE.primes(4)
+    x = np.linspace(0.0, 210.0, 1001)
+    export_wave(str(tmp_path / f'w.{fmt}'), primes, 0.0, 210.0, 1001,
+                chunk_size=300)
+    wave = columns(open_table(str(tmp_path / f'w.{fmt}')), fmt)
+    np.testing.assert_array_equal(wave['x'], x)
+    np.testing.assert_array_equal(wave['P_k'], P_k_values(x, primes))
+
+    modes, coeffs = spectrum(primes)
+    export_spectrum(str(tmp_path / f's.{fmt}'), SpectrumView(primes),
+                    block_size=64)
+    spec = columns(open_table(str(tmp_path / f's.{fmt}')), fmt)
+    np.testing.assert_array_equal(spec['c_m'], coeffs)
+    if fmt != 'npy':
+        np.testing.assert_array_equal(spec['m'], modes)
+
+
+def test_npy_spectrum_is_memory_mapped(tmp_path):
+    view = SpectrumView(PRIME_CACHE.primes(5))
+    filename = str(tmp_path / 's.npy')
+    assert export_spectrum(filename, view, dtype=np.float32) == view.N_k
+    table = open_table(filename)
+    assert isinstance(table, np.memmap) and table.dtype == np.float32
+    assert table[1234] == np.float32(view[1234])
+
+    # A window away from mode 0 keeps its modes
+    export_spectrum(filename, view, start=100, stop=200)
+    window = open_table(filename)
+    assert window['m'].tolist() == list(range(100, 200))
+
+
+def test_records_keep_large_integers(tmp_path):
+    N_16 = PRIME_CACHE.primorial(16)
+    records = [{'k': 3, 'N_k': 30, 'ok': True},
+               {'k': 16, 'N_k': N_16, 'ok': False}]
+    write_records(str(tmp_path / 'r.jsonl'), records)
+    assert open_table(str(tmp_path / 'r.jsonl')) == records
+    write_records(str(tmp_path / 'r.npz'), records)
+    table = open_table(str(tmp_path / 'r.npz'))
+    assert [int(v) for v in table['N_k']] == [30, N_16]
+    assert table['k'].tolist() == [3, 16]
+    with pytest.raises(ValueError):
+        write_records(str(tmp_path / 'r.npy'), records)
+
+
+def test_export_results_writes_each_file_once(pwt_v15, tmp_path):
+    files = pwt_v15.export_results(4, str(tmp_path), ['npy', 'npz'],
+                                   num=500, n_test=5)
+    assert len(files) == len(set(files)) == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f'P4_{stem}' for stem in ('wave_samples.npy', 'wave_samples.npz',
+                                  'spectrum.npy', 'spectrum.npz',
+                                  'verification.npz'))
+    np.testing.assert_array_equal(
+        np.load(tmp_path / 'P4_spectrum.npy'),
+        np.load(tmp_path / 'P4_spectrum.npz')['c_m'])
+
+
+def test_write_tables_tees_one_pass(tmp_path):
+    primes = PRIME_CACHE.primes(4)
+    produced = []
+
+    def source():
+        # wave_chunks reuses one buffer, so each chunk must be fully
+        # written everywhere before the next one is produced
+        for chunk in wave_chunks(primes, 0.0, 210.0, 1001, chunk_size=100):
+            produced.append(len(chunk['x']))
+            yield chunk
+
+    files = [str(tmp_path / f'w.{fmt}') for fmt in ('npy', 'npz', 'jsonl')]
+    rows = write_tables(source(), [(open_writer(files[0], 1001), ['P_k']),
+                                   (open_writer(files[1]), None),
+                                   (open_writer(files[2]), ['x'])])
+    assert rows == [1001] * 3 and sum(produced) == 1001
+    x = np.linspace(0.0, 210.0, 1001)
+    np.testing.assert_array_equal(open_table(files[0]), P_k_values(x, primes))
+    np.testing.assert_array_equal(open_table(files[1])['P_k'],
+                                  P_k_values(x, primes))
+    assert [row['x'] for row in open_table(files[2])] == x.tolist()
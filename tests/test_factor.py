@@ -0,0 +1,41 @@
+"""pwt_factor against sympy."""
+
+import random
+
+import pytest
+import sympy
+
+from pwt_factor import FACTOR_CACHE, factor_batch, factorint, isprime
+
+
+@pytest.mark.parametrize('value', [12.7, 12.0, '12'])
+def test_factorint_rejects_non_integers(value):
+    with pytest.raises(ValueError):
+        factorint(value)
+
+
+def test_cache_hit_and_miss_return_sorted_keys():
+    n = 1009 * 1000003  # Pollard-rho finds the larger prime first
+    FACTOR_CACHE.clear()
+    miss = factorint(n)
+    hit = factorint(n)
+    assert FACTOR_CACHE.hits == 1
+    assert list(miss) == list(hit) == sorted(miss)
+
+
+def test_factorint_matches_sympy():
+    rng = random.Random(3)
+    values = (list(range(-30, 200)) +
+              [rng.randrange(2, 1 << 20) for _ in range(300)] +
+              [rng.randrange(1 << 20, 1 << 62) for _ in range(200)] +
+              [sympy.prime(i) * sympy.prime(i + 7) for i in range(2000, 2010)] +
+              [2 ** 61 - 1, (2 ** 31 - 1) ** 2, 3 ** 40, 600851475143])
+    for n in values:
+        assert factorint(n) == sympy.factorint(n), n
+
+
+def test_factor_batch_and_isprime_match_sympy():
+    values = list(range(0, 2000)) + [10 ** 12 + 39, 10 ** 18 + 9,
+                                     2 ** 64 + 1]
+    assert factor_batch(values) == [sympy.factorint(v) for v in values]
+    assert [isprime(v) for v in values] == [sympy.isprime(v) for v in values]
@@ -0,0 +1,92 @@
+"""pwt_model kernel and batch_fit against sympy and np.linalg.lstsq."""
+
+import warnings
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from pwt_model import (batch_fit, damped_jacobian, damped_model,
+                       design_matrix, model_tables)
+
+
+def test_damped_model_matches_sympy():
+    for n in (1, 2, 7, 30):
+        p_n = sp.prime(n)
+        log_prim = sp.log(sp.primorial(n + 1))
+        exact = (2 / sp.Integer(p_n) + 3 * log_prim / 137
+                 - 5 * log_prim / (p_n * 137))
+        assert abs(damped_model(n, 2, 3, -5) - float(exact)) < 1e-9
+
+
+def test_model_tables_match_sympy():
+    primes, log_primorials = model_tables(100)
+    assert len(primes) >= 100 and not primes.flags.writeable
+    assert model_tables(90)[0] is primes
+    assert primes[:100].tolist() == list(sp.primerange(2, sp.prime(100) + 1))
+    for m in (0, 1, 10, 100):
+        assert np.isclose(log_primorials[m],
+                          float(sp.log(sp.primorial(m, nth=True)
+                                       if m else 1)), rtol=1e-13)
+
+
+def test_damped_model_vectorizes():
+    n = np.arange(1, 41).reshape(5, 8)
+    for shift, use_137 in [(0, True), (3, False)]:
+        values = damped_model(n, 1.5, -2.0, 0.25, shift, use_137)
+        assert values.shape == n.shape
+        np.testing.assert_allclose(
+            values.reshape(-1),
+            [damped_model(v, 1.5, -2.0, 0.25, shift, use_137)
+             for v in n.reshape(-1)], rtol=1e-13)
+    with pytest.raises(ValueError):
+        design_matrix([0, 1])
+    with pytest.raises(ValueError):
+        design_matrix([1, 2], m_shift=-2)
+
+
+def test_batch_fit_matches_lstsq():
+    data = [[1276, 3242, 6425], [10053, 456, 8], [52990, 138850],
+            [2.12e-6, 7e-5, 1.015e-4, 2.68e-4, 6.67e-4]]
+    fit = batch_fit(data)
+    for v, (shift, use_137) in enumerate(fit['variants']):
+        for d, y in enumerate(data):
+            X = design_matrix(np.arange(1, len(y) + 1), shift, bool(use_137))
+            w = np.linalg.lstsq(X, np.asarray(y, float), rcond=None)[0]
+            np.testing.assert_allclose(fit['params'][v, d], w, rtol=1e-6,
+                                       atol=1e-9 * np.abs(w).max())
+
+
+def test_batch_fit_empty_dataset():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        fit = batch_fit([[1.0, 2.0, 4.0, 8.0], [], [np.nan, np.nan]])
+    assert fit['n_obs'].tolist() == [4, 0, 0]
+    assert np.isnan(fit['rss'][:, 1:]).all()
+    assert np.isnan(fit['r_squared'][:, 1:]).all()
+    assert fit['best_variant'][0] >= 0
+    assert fit['best_variant'][1:].tolist() == [-1, -1]
+
+
+def test_damped_jacobian_matches_finite_differences():
+    n = np.arange(1, 12)
+    params = np.array([2.0, 3.0, -5.0])
+    jac = damped_jacobian(n, *params, m_shift=2, use_137=False)
+    for j in range(3):
+        step = np.zeros(3)
+        step[j] = 1e-3
+        fd = (damped_model(n, *(params + step), m_shift=2, use_137=False)
+              - damped_model(n, *(params - step), m_shift=2,
+                             use_137=False)) / 2e-3
+        np.testing.assert_allclose(jac[:, j], fd, rtol=1e-8)
+
+
+def test_curve_fit_with_jacobian_matches_batch_fit():
+    optimize = pytest.importorskip('scipy.optimize')
+    n = np.arange(1, 9)
+    y = damped_model(n, 4.0, -2.0, 7.0) + np.sin(n) * 1e-3
+    popt, _ = optimize.curve_fit(
+        lambda x, a, b, c: damped_model(x, a, b, c), n, y, p0=[1, 1, 1],
+        jac=lambda x, a, b, c: damped_jacobian(x, a, b, c))
+    np.testing.assert_allclose(popt, batch_fit([y])['params'][2, 0],
+                               rtol=1e-6)
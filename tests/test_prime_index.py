@@ -0,0 +1,77 @@
+"""pwt_prime_index against a plain sieve."""
+
+import os
+
+import numpy as np
+import pytest
+
+import pwt_prime_index
+from pwt_prime_index import PrimeIndex, build_prime_index, open_prime_index
+from pwt_primes import sieve_primes
+
+
+LIMIT = 2_000_003
+
+
+@pytest.fixture(scope='module')
+def index(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('idx') / 'primes.idx')
+    # A small interval puts many checkpoints and block edges in range
+    build_prime_index(path, LIMIT, interval=64)
+    idx = PrimeIndex(path)
+    yield idx
+    idx.close()
+
+
+@pytest.fixture(scope='module')
+def primes():
+    return sieve_primes(LIMIT).astype(np.int64)
+
+
+def test_first_and_nth(index, primes):
+    assert index.count == len(primes)
+    np.testing.assert_array_equal(index.first(len(primes)), primes)
+    for n in (1, 2, 3, 63, 64, 65, 128, 1000, len(primes)):
+        assert index.nth(n) == primes[n - 1]
+    n = np.array([1, 64, 65, 5000, 129, len(primes)])
+    np.testing.assert_array_equal(index.nth(n), primes[n - 1])
+    with pytest.raises(IndexError):
+        index.nth(len(primes) + 1)
+
+
+def test_pi_and_between(index, primes):
+    xs = [0, 1, 2, 3, 4, 310, 311, 312, 10 ** 6, LIMIT - 1, LIMIT]
+    xs += [int(p) for p in primes[[63, 64, 127, 128]]]
+    for x in xs:
+        assert index.pi(x) == np.searchsorted(primes, x, side='right'), x
+    for lo, hi in [(0, 10), (2, 3), (100, 100), (311, 1000), (999_000, LIMIT + 1)]:
+        expected = primes[(primes >= lo) & (primes < hi)]
+        np.testing.assert_array_equal(index.primes_between(lo, hi), expected)
+    with pytest.raises(ValueError):
+        index.pi(LIMIT + 1)
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / 'empty.idx')
+    build_prime_index(path, 1)
+    idx = PrimeIndex(path)
+    assert idx.count == 0 and idx.pi(1) == 0
+    assert len(idx.first(0)) == 0
+    idx.close()
+
+
+def test_open_caches_only_existing_files(tmp_path):
+    path = str(tmp_path / 'late.idx')
+    assert open_prime_index(path) is None
+    build_prime_index(path, 1000)
+    idx = open_prime_index(path)
+    assert idx is not None and idx.nth(1) == 2
+    assert open_prime_index(path) is idx
+    idx.close()
+    del pwt_prime_index._INDEXES[os.path.abspath(path)]
+
+
+def test_default_index_is_cwd_independent():
+    if 'PWT_PRIME_INDEX' not in os.environ:
+        assert os.path.dirname(pwt_prime_index.DEFAULT_INDEX) == \
+            os.path.dirname(os.path.abspath(pwt_prime_index.__file__))
@@ -0,0 +1,50 @@
+"""pwt_primecount against sympy and a plain sieve."""
+
+import math
+
+import numpy as np
+import pytest
+import sympy
+
+import pwt_primecount
+from pwt_primecount import li, li_inverse, nth_prime, prime_pi
+from pwt_primes import sieve_primes
+
+
+def test_prime_pi_matches_sieve():
+    primes = sieve_primes(5_000_000)
+    for x in (0, 1, 2, 3, 4, 100, 2 ** 20 - 1, 2 ** 20, 2 ** 20 + 1,
+              3_000_017, 4_999_999, 5_000_000):
+        assert prime_pi(x) == np.searchsorted(primes, x, side='right'), x
+
+
+def test_prime_pi_counting_path(monkeypatch):
+    # Force the Lucy recursion on small x, where the sieve gives the answer
+    monkeypatch.setattr(pwt_primecount, 'SIEVE_PI_LIMIT', 2)
+    primes = sieve_primes(200_000)
+    for x in [2, 3, 4, 8, 9, 24, 25, 26, 120, 121, 9973, 199_999, 200_000]:
+        assert prime_pi(x) == np.searchsorted(primes, x, side='right'), x
+
+
+def test_prime_pi_known_values():
+    assert prime_pi(10 ** 9) == 50_847_534
+    assert prime_pi(10 ** 10) == 455_052_511
+
+
+@pytest.mark.parametrize('n', [1, 2, 3, 10, 2 ** 16 - 1, 2 ** 16, 2 ** 16 + 1,
+                               100_000, 1_234_567, 10 ** 7])
+def test_nth_prime_matches_sympy(n):
+    assert nth_prime(n) == sympy.prime(n)
+
+
+def test_nth_prime_known_value():
+    assert nth_prime(10 ** 9) == 22_801_763_489
+
+
+def test_li():
+    # li(10^6) = 78627.549159...
+    assert math.isclose(li(1e6), 78627.5491594622, rel_tol=1e-12)
+    # li_inverse stops once its Newton step in x is below 0.5
+    for n in (10.0, 1e5, 1e9):
+        x = li_inverse(n)
+        assert abs(li(x) - n) <= 0.5 / math.log(x)
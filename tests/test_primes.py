@@ -0,0 +1,83 @@
+"""pwt_primes sieve and PrimeCache against sympy."""
+
+import math
+
+import numpy as np
+import sympy
+
+from pwt_primes import (PrimeCache, first_k_primes, iter_prime_segments,
+                        product_tree, sieve_primes, sieve_range)
+
+
+def test_segmented_sieve_matches_sympy():
+    expected = list(sympy.primerange(2, 100_001))
+    # Small segments cross many boundaries
+    for segment_size in (7, 1000, 1 << 18):
+        np.testing.assert_array_equal(sieve_primes(100_000, segment_size),
+                                      expected)
+    np.testing.assert_array_equal(sieve_primes(1000, 1), expected[:168])
+    for limit in (0, 1, 2, 3, 4, 9, 25, 121):
+        np.testing.assert_array_equal(sieve_primes(limit),
+                                      list(sympy.primerange(2, limit + 1)))
+    np.testing.assert_array_equal(
+        sieve_range(10 ** 9, 10 ** 9 + 10_000, segment_size=1000),
+        list(sympy.primerange(10 ** 9, 10 ** 9 + 10_000)))
+    chunks = list(iter_prime_segments(1000, segment_size=50))
+    assert len(chunks) > 1
+    np.testing.assert_array_equal(np.concatenate(chunks), expected[:168])
+
+
+def test_first_k_primes_matches_sympy():
+    expected = list(sympy.primerange(2, sympy.prime(1000) + 1))
+    for k in (0, 1, 5, 6, 1000):
+        np.testing.assert_array_equal(first_k_primes(k, segment_size=100),
+                                      expected[:k])
+
+
+def test_cache_primorials_match_sympy():
+    cache = PrimeCache(index_path='')
+    for k in (1, 5, 3, 20, 12, 40):
+        assert cache.primorial(k) == sympy.primorial(k)
+        assert cache.phi_primorial(k) == sympy.totient(sympy.primorial(k))
+    np.testing.assert_array_equal(cache.primes(30),
+                                  list(sympy.primerange(2, sympy.prime(30) + 1)))
+
+
+def test_memo_byte_budget():
+    cache = PrimeCache(max_bytes=1000, index_path='')
+    cache.memo('a', 1, lambda: np.zeros(50))
+    cache.memo('b', 1, lambda: (np.zeros(50), np.zeros(20)))
+    assert cache.stats()['memo_bytes'] == 960
+    # Over budget: the least recently used array goes
+    cache.memo('c', 1, lambda: np.zeros(10))
+    assert cache.stats()['memo_entries'] == 2
+    assert cache.stats()['memo_bytes'] == 640
+    # Larger than the whole budget: returned but never cached
+    assert len(cache.memo('big', 1, lambda: np.zeros(200))) == 200
+    assert cache.stats()['memo_bytes'] == 640
+    calls = []
+    cache.memo('big', 1, lambda: calls.append(1) or np.zeros(200))
+    assert calls == [1]
+
+
+def test_memo_byte_budget_counts_primorials():
+    cache = PrimeCache(max_bytes=20_000, index_path='')
+    for k in range(500, 5001, 500):
+        assert cache.primorial(k) == math.prod(
+            int(p) for p in cache.primes(k))
+    stats = cache.stats()
+    # The ten prefixes take about 45 kB together, so the oldest are evicted
+    assert stats['memo_bytes'] <= 20_000
+    assert stats['memo_entries'] < 10
+    assert ('primorial', 5000) in cache._memo
+    sizes = [(cache._memo[key].bit_length() + 7) // 8 for key in cache._memo]
+    assert stats['memo_bytes'] == sum(sizes)
+
+
+def test_product_tree_is_exact():
+    assert product_tree([]) == 1
+    assert product_tree([7]) == 7
+    primes = first_k_primes(2000)
+    assert product_tree(primes) == math.prod(int(p) for p in primes)
+    assert product_tree(primes[:100]) == sympy.primorial(100)
+    assert product_tree(np.array([-3, 5, -7])) == 105
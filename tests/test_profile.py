@@ -0,0 +1,58 @@
+"""Profiler stages, counters and trace output."""
+
+import json
+import time
+
+import numpy as np
+
+from pwt_primes import sieve_primes
+from pwt_profile import PROFILER, Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.stage('a'):
+        profiler.count('n', 5)
+        profiler.gauge('g', 3)
+    assert profiler.stages() == [] and profiler.counters == {}
+    assert profiler.gauges == {}
+
+
+def test_nested_stages_and_trace(tmp_path):
+    profiler = Profiler()
+    profiler.enable()
+    for _ in range(2):
+        with profiler.stage('outer'):
+            with profiler.stage('inner'):
+                time.sleep(0.01)
+            profiler.count('n', 3)
+    profiler.gauge('g', 4)
+    profiler.gauge('g', 2)
+    profiler.disable()
+
+    stages = {s['path']: s for s in profiler.stages()}
+    assert list(stages) == ['outer', 'outer;inner']
+    outer, inner = stages['outer'], stages['outer;inner']
+    assert outer['calls'] == inner['calls'] == 2
+    assert inner['total_seconds'] >= 0.02
+    assert np.isclose(outer['self_seconds'],
+                      outer['total_seconds'] - inner['total_seconds'])
+    assert profiler.counters == {'n': 6} and profiler.gauges == {'g': 4}
+
+    trace = profiler.write(str(tmp_path / 'trace.json'), extra={'x': 1})
+    with open(tmp_path / 'trace.json') as f:
+        assert json.load(f)['x'] == 1
+    folded = (tmp_path / 'trace.folded').read_text().split()
+    assert folded[:2] == ['outer', str(round(outer['self_seconds'] * 1e6))]
+    assert trace['folded_stacks'][1].startswith('outer;inner ')
+
+
+def test_hot_paths_report_counters():
+    PROFILER.enable()
+    try:
+        primes = sieve_primes(1000)
+    finally:
+        PROFILER.disable()
+    assert PROFILER.counters['primes_generated'] == len(primes)
+    assert PROFILER.gauges['sieve_limit'] == 1000
+    assert [s['path'] for s in PROFILER.stages()] == ['sieve']
@@ -0,0 +1,95 @@
+"""pwt_render decimation and pixel reductions against plain loops."""
+
+import numpy as np
+
+from pwt_primes import PRIME_CACHE
+from pwt_render import (integer_markers, lttb, minmax_decimate,
+                        spectrum_envelope, wave_trace)
+from pwt_spectrum import SpectrumView, spectrum
+from pwt_wave import P_k_values
+
+
+def lttb_reference(x, y, n_out):
+    """Textbook LTTB over the same buckets as pwt_render.lttb."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = [0]
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[hi:nxt_hi].mean(), y[hi:nxt_hi].mean()
+        a = keep[-1]
+        best = max(range(lo, hi), key=lambda j: abs(
+            (x[a] - cx) * (y[j] - y[a]) - (x[a] - x[j]) * (cy - y[a])))
+        keep.append(best)
+    keep.append(n - 1)
+    return x[keep], y[keep]
+
+
+def test_minmax_keeps_each_bin_extremes():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_007, dtype=np.float64)
+    y = rng.normal(size=len(x))
+    dx, dy = minmax_decimate(x, y, 100)
+    assert len(dx) == 200 and np.all(np.diff(dx) > 0)
+    starts = (np.arange(100) * len(x)) // 100
+    for b, (lo, hi) in enumerate(zip(starts, np.append(starts[1:], len(x)))):
+        pair = dy[2 * b:2 * b + 2]
+        assert sorted(pair) == [y[lo:hi].min(), y[lo:hi].max()]
+    short = x[:150]
+    assert minmax_decimate(short, y[:150], 100)[0] is short
+
+
+def test_lttb_matches_reference():
+    rng = np.random.default_rng(1)
+    x = np.sort(rng.uniform(0, 100, 5000))
+    y = np.sin(x) + rng.normal(scale=0.1, size=len(x))
+    for n_out in (3, 10, 257):
+        dx, dy = lttb(x, y, n_out)
+        rx, ry = lttb_reference(x, y, n_out)
+        np.testing.assert_array_equal(dx, rx)
+        np.testing.assert_array_equal(dy, ry)
+
+
+def test_integer_markers_match_gcd():
+    primes = PRIME_CACHE.primes(5)
+    N_k = PRIME_CACHE.primorial(5)
+    n = np.arange(N_k)
+    coprime = np.gcd(n, N_k) == 1
+    exact = integer_markers(primes, N_k, n_pixels=N_k)
+    np.testing.assert_array_equal(exact[0], n[coprime])
+    np.testing.assert_array_equal(exact[1], n[~coprime])
+
+    cop_x, comp_x = integer_markers(primes, N_k, n_pixels=100)
+    columns = np.minimum(n * 100 // N_k, 99)
+    centers = (np.arange(100) + 0.5) * N_k / 100
+    np.testing.assert_allclose(cop_x, centers[np.unique(columns[coprime])])
+    np.testing.assert_allclose(comp_x, centers[np.unique(columns[~coprime])])
+
+
+def test_spectrum_envelope_matches_modes():
+    view = SpectrumView(PRIME_CACHE.primes(5))
+    _, coeffs = spectrum(view.primes)
+    values = np.abs(coeffs)
+    modes, lo, hi = spectrum_envelope(view, n_pixels=64)
+    assert len(modes) == 64
+    columns = np.minimum(np.arange(view.N_k) * 64 // view.N_k, 63)
+    np.testing.assert_allclose(hi, [values[columns == c].max()
+                                    for c in range(64)])
+    np.testing.assert_allclose(lo, [values[columns == c].min()
+                                    for c in range(64)])
+    _, exact_lo, exact_hi = spectrum_envelope(view, n_pixels=view.N_k)
+    np.testing.assert_array_equal(exact_hi, values)
+
+
+def test_wave_trace_streams_above_pixel_budget():
+    primes = PRIME_CACHE.primes(5)
+    x, y = wave_trace(primes, 2310, n_pixels=100, samples_per_pixel=8)
+    assert len(x) == 200
+    fine = np.linspace(0, 2310, 2310 * 500 + 1)
+    cols = np.minimum((fine * 100 / 2310).astype(np.int64), 99)
+    true_max = np.full(100, -np.inf)
+    np.maximum.at(true_max, cols, P_k_values(fine, primes))
+    np.testing.assert_allclose(y[1::2], true_max, atol=1e-2)
+    assert np.all(y[0::2] <= y[1::2])
+    assert len(wave_trace(primes, 2310, 100, 8, method='lttb')[0]) == 200
@@ -0,0 +1,71 @@
+"""Divisor-class spectrum against Theorem 4.3 evaluated with sympy."""
+
+import numpy as np
+import sympy
+
+from pwt_primes import PRIME_CACHE
+from pwt_spectrum import SpectrumView, class_coefficients, spectrum
+
+
+def coefficient(m, N_k):
+    q = N_k // sympy.gcd(m, N_k)
+    return float(sympy.totient(q) * sympy.mobius(q)) / N_k
+
+
+def test_spectrum_matches_theorem_4_3():
+    primes = PRIME_CACHE.primes(5)
+    N_k = PRIME_CACHE.primorial(5)
+    modes, coeffs = spectrum(primes)
+    np.testing.assert_array_equal(modes, np.arange(N_k))
+    np.testing.assert_allclose(coeffs, [coefficient(m, N_k)
+                                        for m in range(N_k)], rtol=1e-12)
+    # A window away from 0 resolves the same classes
+    _, window = spectrum(primes, 3 * N_k + 17, 3 * N_k + 400)
+    np.testing.assert_allclose(window, coeffs[17:400], rtol=1e-12)
+
+
+def test_class_magnitudes():
+    primes = [2, 3, 5, 7]
+    table = class_coefficients(primes)
+    for S in range(16):
+        magnitude = 1.0
+        for i, p in enumerate(primes):
+            magnitude *= 1 / p if S >> i & 1 else (p - 1) / p
+        sign = (-1) ** (4 - bin(S).count('1'))
+        assert np.isclose(table[S], sign * magnitude, rtol=1e-14)
+
+
+def test_view_beyond_int64():
+    view = SpectrumView(PRIME_CACHE.primes(17))
+    N_k = view.N_k
+    assert N_k >= 2 ** 63
+    expected = [coefficient(m, N_k) for m in range(N_k - 7, N_k)]
+
+    (modes, coeffs), = list(view.iter_blocks(N_k - 7))
+    assert [int(m) for m in modes] == list(range(N_k - 7, N_k))
+    np.testing.assert_allclose(coeffs, expected, rtol=1e-12)
+    np.testing.assert_allclose(view[N_k - 7:N_k:2], expected[::2],
+                               rtol=1e-12)
+    np.testing.assert_allclose(view[np.arange(-7, 0)], expected, rtol=1e-12)
+    np.testing.assert_allclose(view[0:N_k:N_k // 5],
+                               [coefficient(m, N_k)
+                                for m in range(0, N_k, N_k // 5)],
+                               rtol=1e-12)
+
+
+def test_view_aggregates_match_modes():
+    view = SpectrumView(PRIME_CACHE.primes(5))
+    modes, coeffs = spectrum(view.primes)
+    np.testing.assert_array_equal(view[0:view.N_k], coeffs)
+    np.testing.assert_array_equal(view[modes[::7]], coeffs[::7])
+    assert view[-1] == coeffs[-1] and view[17] == coeffs[17]
+    assert view.numerator(17) == round(coeffs[17] * view.N_k)
+
+    classes = view.class_of(modes)
+    counts = np.bincount(classes, minlength=32)
+    assert counts.tolist() == view.class_counts().tolist()
+    np.testing.assert_allclose(view.class_l1(),
+                               np.bincount(classes, np.abs(coeffs), 32))
+    summary = view.summary()
+    assert summary['nonzero_modes'] == view.N_k
+    assert np.isclose(summary['l2_mass'], (coeffs ** 2).sum())
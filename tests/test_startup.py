@@ -0,0 +1,32 @@
+"""The compute core imports without matplotlib."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'benchmarks')
+sys.path.insert(0, BENCHMARKS)
+
+from bench_startup import ENTRY_POINTS, REPO  # noqa: E402
+
+# Scripts run their examples on import, and the plotting entry loads
+# matplotlib on purpose
+CORE = [name for name in ENTRY_POINTS
+        if name == 'PWT-V15' or name.startswith('pwt_')]
+
+
+@pytest.mark.parametrize('name', CORE)
+def test_core_does_not_load_matplotlib(name):
+    code = (ENTRY_POINTS[name] + "; import sys; "
+            "sys.exit('matplotlib' in sys.modules)")
+    assert subprocess.run([sys.executable, '-c', code], cwd=REPO).returncode \
+        == 0, f"{name} imports matplotlib"
+
+
+def test_plotting_loads_matplotlib(pwt_v15):
+    pytest.importorskip('matplotlib')
+    pyplot = pwt_v15._pyplot('Agg')
+    assert pyplot.get_backend().lower() == 'agg'
@@ -0,0 +1,77 @@
+"""Vectorized non-integer checks and the checkpointed VerificationStore."""
+
+import numpy as np
+from sympy import primorial
+
+from pwt_primes import PRIME_CACHE
+from pwt_verify import (VerificationStore, offset_grid_chunks, ratio_bound,
+                        run_verification, verify_noninteger)
+from pwt_wave import P_k_values
+
+
+def test_verify_noninteger_matches_pointwise_loop():
+    primes = PRIME_CACHE.primes(5)
+    offsets = np.linspace(0.1, 0.9, 17)
+    bases = range(0, 2310, 7)
+    x = np.array([b + d for b in bases for d in offsets])
+    chunks = list(offset_grid_chunks(bases, offsets, chunk_points=100))
+    assert len(chunks) > 1
+    np.testing.assert_array_equal(np.concatenate(chunks), x)
+
+    values = P_k_values(x, primes)
+    stats = verify_noninteger(primes, bases, offsets, chunk_points=100)
+    assert stats['points'] == len(x)
+    assert stats['positive'] == np.count_nonzero(values > 1e-10) == len(x)
+    assert stats['min_value'] == values.min()
+    assert stats['min_x'] == x[np.argmin(values)]
+    assert stats['max_value'] == values.max()
+
+    ratios = [abs(np.sin(np.pi * d)) / abs(np.sin(np.pi * d / p))
+              for p in primes for d in offsets]
+    assert np.isclose(stats['max_ratio'], max(ratios))
+    assert stats['bound_holds']
+    assert ratio_bound(offsets, [])['bound_holds']
+
+
+def test_store_k16(tmp_path):
+    primes = PRIME_CACHE.primes(16)
+    N_k = int(primorial(16))
+    assert N_k >= 2 ** 63
+    with VerificationStore(str(tmp_path / 'v.db')) as store:
+        stats = run_verification(primes, 2, store, unit_size=1 << 10,
+                                 max_units=1)
+        assert stats['N_k'] == N_k
+        assert stats['units_done'] == 1
+        assert stats['units_total'] == -(-N_k // (1 << 10))
+        assert not stats['complete']
+
+        # A unit at the very end of the period keeps exact bounds
+        last = dict(lo=N_k - 5, hi=N_k, integers=5, coprime=1,
+                    float_mismatches=0, points=10, positive=10,
+                    min_value=0.5, min_x=0.5, max_value=1.0, elapsed=0.0)
+        store.record(16, 2, stats['units_total'] - 1, last)
+        row = store._conn.execute("SELECT lo, hi FROM units WHERE unit = ?",
+                                  (stats['units_total'] - 1,)).fetchone()
+        assert tuple(map(int, row)) == (N_k - 5, N_k)
+        assert store.aggregate(16, 2)['units_done'] == 2
+
+
+
+def test_resume_runs_only_pending_units(tmp_path):
+    primes = PRIME_CACHE.primes(4)
+    with VerificationStore(str(tmp_path / 'v.sqlite')) as store:
+        job = store.job(4, 3, 210, unit_size=16)
+        assert list(store.pending_units(4, 3, job['n_units'])) == list(range(14))
+        for unit in (0, 1, 4, 9):
+            lo = unit * 16
+            store.record(4, 3, unit, {
+                'lo': lo, 'hi': lo + 16, 'integers': 16, 'coprime': 0,
+                'float_mismatches': 0, 'points': 0, 'positive': 0,
+                'min_value': 1.0, 'min_x': 0.0, 'max_value': 1.0,
+                'elapsed': 0.0})
+        pending = list(store.pending_units(4, 3, job['n_units']))
+        assert pending == [2, 3, 5, 6, 7, 8, 10, 11, 12, 13]
+        assert set(pending) | store.done_units(4, 3) == set(range(14))
+        result = run_verification(primes, 3, store, max_units=2)
+        assert result['units_done'] == 6
+        assert list(store.pending_units(4, 3, 14))[0] == 5
@@ -0,0 +1,100 @@
+"""pwt_wave closed forms and streaming against the explicit cosine sums."""
+
+import numpy as np
+import pytest
+
+from pwt_primes import PRIME_CACHE
+from pwt_wave import (linspace_blocks, log_P_k, parallel_P_k, psi_p,
+                      P_k_values, stream_P_k)
+
+
+def psi_reference(x, p):
+    """Ψ_p(x) = 1 - (1/p) Σ_j cos(2πjx/p), Definition 3.1."""
+    j = np.arange(p)[:, None]
+    return 1 - np.cos(2 * np.pi * j * x[None, :] / p).sum(axis=0) / p
+
+
+def test_psi_p_matches_cosine_sum():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.uniform(-50, 50, 2000),
+                        np.arange(-30, 31) + 1e-9, [0.5, 2.5, 1e6 + 0.25]])
+    for p in (2, 3, 5, 7, 31, 101):
+        np.testing.assert_allclose(psi_p(x, p), psi_reference(x, p),
+                                   atol=1e-9)
+
+
+def test_psi_p_exact_at_integers():
+    n = np.arange(-60, 61, dtype=np.float64)
+    for p in (2, 3, 7, 13):
+        np.testing.assert_array_equal(psi_p(n, p), np.where(n % p == 0, 0, 1))
+
+
+def test_P_k_matches_product_of_pulses():
+    primes = PRIME_CACHE.primes(8)
+    x = np.linspace(0.01, 40, 5001)
+    expected = np.prod([psi_reference(x, int(p)) for p in primes], axis=0)
+    np.testing.assert_allclose(P_k_values(x, primes), expected, rtol=1e-9,
+                               atol=1e-12)
+    with np.errstate(divide='ignore'):
+        np.testing.assert_allclose(log_P_k(x, primes), np.log(expected),
+                                   rtol=1e-9, atol=1e-9)
+    # At integers P_k is exactly 0 or 1; zeros come out as -inf in log domain
+    n = np.arange(0, 60)
+    coprime = np.gcd(n, PRIME_CACHE.primorial(8)) == 1
+    with np.errstate(divide='ignore'):
+        np.testing.assert_array_equal(log_P_k(n.astype(np.float64), primes),
+                                      np.where(coprime, 0.0, -np.inf))
+
+
+def test_stream_P_k_matches_full_evaluation():
+    primes = PRIME_CACHE.primes(6)
+    x = np.linspace(0.0, 30030.0, 10_001)
+    full = P_k_values(x, primes)
+    np.testing.assert_array_equal(np.concatenate(list(
+        linspace_blocks(0.0, 30030.0, 10_001, chunk_size=999))), x)
+
+    # Two reused buffers; each chunk must be consumed before advancing
+    buffers = [np.empty(1000), np.empty(1000)]
+    out = np.empty_like(full)
+    for offset, values in stream_P_k((0.0, 30030.0, 10_001), primes,
+                                     out=buffers, chunk_size=1000):
+        assert any(np.shares_memory(values, b) for b in buffers)
+        out[offset:offset + len(values)] = values
+    np.testing.assert_array_equal(out, full)
+
+    chunks = [(o, v.copy()) for o, v in
+              stream_P_k(np.array_split(x, 7), primes, dtype=np.float32,
+                         chunk_size=2000)]
+    assert all(v.dtype == np.float32 for _, v in chunks)
+    np.testing.assert_allclose(np.concatenate([v for _, v in chunks]), full,
+                               rtol=1e-6, atol=1e-7)
+    with pytest.raises(ValueError):
+        list(stream_P_k((0.0, 1.0, 100), primes, out=np.empty(10),
+                        chunk_size=50))
+
+
+def test_out_buffer_float32():
+    primes = PRIME_CACHE.primes(5)
+    x = np.linspace(0.1, 100, 3000).reshape(30, 100)
+    out = np.empty(x.shape, dtype=np.float32)
+    assert P_k_values(x, primes, out=out) is out
+    np.testing.assert_allclose(out, P_k_values(x, primes), rtol=1e-6,
+                               atol=1e-7)
+    with pytest.raises(ValueError):
+        P_k_values(x, primes, out=np.empty(x.shape, dtype=np.int64))
+
+
+def test_parallel_P_k_matches_serial():
+    primes = PRIME_CACHE.primes(6)
+    x = np.random.default_rng(1).uniform(0, 30030, 10_000)
+    values, stats = parallel_P_k(x, primes, workers=2, chunk_size=3000)
+    np.testing.assert_array_equal(values, P_k_values(x, primes))
+    assert stats['tasks'] == 4 and stats['points'] == len(x)
+
+    grid, _ = parallel_P_k((0.0, 30030.0, 5001), primes, workers=2,
+                           chunk_size=1000, dtype=np.float32, log=True)
+    assert grid.dtype == np.float32
+    with np.errstate(divide='ignore'):
+        np.testing.assert_allclose(
+            grid, log_P_k(np.linspace(0.0, 30030.0, 5001), primes),
+            rtol=1e-6, atol=1e-6)